@@ -0,0 +1,103 @@
+"""Compares the default task-per-job mode of AsyncScheduler with the dispatcher mode.
+
+For every amount of jobs it reports memory allocated by the scheduler after
+start (job objects themselves are excluded), event loop wake-ups per second
+and CPU time per second.
+
+Usage: python benchmarks/async_dispatcher.py --jobs 10000 100000 --seconds 10
+"""
+
+import argparse
+from datetime import timedelta
+import logging
+import random
+import selectors
+import time
+import tracemalloc
+
+from regta import AsyncJob
+from regta.schedulers import AsyncScheduler
+
+MIN_INTERVAL = 1
+MAX_INTERVAL = 60
+
+
+class CountingSelector(selectors.DefaultSelector):  # type: ignore  # pylint: disable=too-many-ancestors
+    """Counts how many times the event loop woke up."""
+
+    wakeups = 0
+
+    def select(self, timeout=None):
+        self.wakeups += 1
+        return super().select(timeout)
+
+
+class BenchmarkJob(AsyncJob):
+    async def func(self):  # pylint: disable=arguments-differ
+        pass
+
+
+def make_jobs(amount: int):
+    logger = logging.getLogger('regta.benchmarks')
+    logger.setLevel(logging.WARNING)
+    jobs = []
+    for _ in range(amount):
+        job = BenchmarkJob(logger=logger, use_ansi=False)
+        job.interval = timedelta(seconds=random.uniform(MIN_INTERVAL, MAX_INTERVAL))
+        jobs.append(job)
+    return jobs
+
+
+def measure(amount: int, use_dispatcher: bool, seconds: float) -> dict:
+    jobs = make_jobs(amount)
+
+    selector = CountingSelector()
+    scheduler = AsyncScheduler(use_dispatcher=use_dispatcher)
+    scheduler.loop.close()
+    scheduler.loop = scheduler.loop.__class__(selector)  # type: ignore
+    for job in jobs:
+        scheduler.add_job(job)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    scheduler.daemon = True
+    scheduler.start()
+
+    cpu_started_at = time.process_time()
+    time.sleep(seconds)
+    cpu_time = time.process_time() - cpu_started_at
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    wakeups = selector.wakeups
+
+    scheduler.stop()
+    scheduler.join()
+    tracemalloc.stop()
+
+    return {
+        "mode": "dispatcher" if use_dispatcher else "tasks",
+        "jobs": amount,
+        "memory_mb": round(memory / 2 ** 20, 2),
+        "memory_per_job_b": round(memory / amount),
+        "wakeups_per_second": round(wakeups / seconds, 1),
+        "cpu_seconds_per_second": round(cpu_time / seconds, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} {'jobs':>8} {'memory, MB':>11} {'B/job':>7} {'wake-ups/s':>11} {'CPU s/s':>8}")
+    for amount in args.jobs:
+        for use_dispatcher in (False, True):
+            res = measure(amount, use_dispatcher, args.seconds)
+            print(
+                f"{res['mode']:>10} {res['jobs']:>8} {res['memory_mb']:>11} {res['memory_per_job_b']:>7} "
+                f"{res['wakeups_per_second']:>11} {res['cpu_seconds_per_second']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Measures the import time of the regta CLI with ``python -X importtime``.
+
+It reports the median total import time of ``regta.console`` and the slowest
+imported modules. It fails if any of the modules which are needed only by some
+commands (e.g. jinja2 for ``regta new``) is imported on startup or if the time
+exceeds ``--max-ms`` (250 ms by default, pass 0 to disable the budget).
+
+Usage: python benchmarks/cli_startup.py --runs 10 --max-ms 300
+"""
+
+from typing import Dict, List, Tuple
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULE = 'regta.console'
+MAX_MS = 250.0
+LAZY_MODULES = ('jinja2', 'regta.templates', 'regta.control', 'regta.metrics', 'regta.state')
+
+
+def measure_once() -> Dict[str, int]:
+    """Import the module in a fresh interpreter.
+
+    Return:
+        dict: Cumulative import time in microseconds of every imported module.
+    """
+    res = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {MODULE}'],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    times = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, _, cumulative, name = (part.strip() for part in line.replace('import time:', '|').split('|'))
+        times[name] = int(cumulative)
+    return times
+
+
+def measure(runs: int) -> Tuple[float, List[Tuple[str, float]], List[str]]:
+    results = [measure_once() for _ in range(runs)]
+    total_ms = statistics.median(times[MODULE] for times in results) / 1000
+    slowest = sorted(
+        ((name, statistics.median(times.get(name, 0) for times in results) / 1000) for name in results[0]),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    eager = sorted({name for times in results for name in times if name in LAZY_MODULES})
+    return total_ms, slowest, eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=MAX_MS)
+    args = parser.parse_args()
+
+    total_ms, slowest, eager = measure(args.runs)
+    print(f"{MODULE} import time: {total_ms:.1f} ms (median of {args.runs} runs)")
+    for name, ms in slowest[1:args.top + 1]:
+        print(f"{ms:>8.1f} ms  {name}")
+
+    failed = False
+    if eager:
+        print(f"Modules which must be loaded lazily are imported on startup: {', '.join(eager)}")
+        failed = True
+    if args.max_ms and total_ms > args.max_ms:
+        print(f"Import time exceeds {args.max_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
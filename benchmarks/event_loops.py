@@ -0,0 +1,94 @@
+"""Compares the asyncio event loop with uvloop under many short async jobs.
+
+For every amount of jobs and scheduler mode it runs AsyncScheduler on both
+loops and reports throughput (executions per second), CPU time per execution,
+which is the overhead of timers and tasks since jobs do nothing, and mean
+dispatch jitter. uvloop is installed with ``pip install regta[uvloop]``.
+
+Usage: python benchmarks/event_loops.py --jobs 1000 10000 --interval 0.1 --seconds 10
+"""
+
+import argparse
+from datetime import timedelta
+import logging
+import random
+import sys
+import time
+
+from regta import AsyncJob
+from regta.enums import EventLoops
+from regta.metrics import COUNTERS, MetricsRegistry
+from regta.schedulers import AsyncScheduler, make_loop_factory
+
+WARM_UP_SECONDS = 1.0
+
+
+class BenchmarkJob(AsyncJob):
+    async def func(self):  # pylint: disable=arguments-differ
+        pass
+
+
+def measure(event_loop: EventLoops, amount: int, use_dispatcher: bool, interval: float, seconds: float) -> dict:
+    logger = logging.getLogger('regta.benchmarks')
+    logger.setLevel(logging.ERROR)  # Skipped executions of an overloaded loop are expected
+    registry = MetricsRegistry()
+    scheduler = AsyncScheduler(use_dispatcher=use_dispatcher, loop_factory=make_loop_factory(event_loop))
+    for _ in range(amount):
+        job = BenchmarkJob(logger=logger, use_ansi=False)
+        # Slightly different intervals spread executions like in real projects
+        job.interval = timedelta(seconds=interval * random.uniform(0.9, 1.1))
+        job._metrics = registry.get_job_metrics(job.get_plain_job_name())  # pylint: disable=protected-access
+        scheduler.add_job(job)
+
+    scheduler.daemon = True
+    scheduler.start()
+    time.sleep(WARM_UP_SECONDS)
+
+    metrics = registry.get_job_metrics(BenchmarkJob.get_plain_job_name())
+    started_counters = metrics.get_values()[0]
+    cpu_started_at = time.process_time()
+    time.sleep(seconds)
+    cpu_time = time.process_time() - cpu_started_at
+    counters = dict(zip(COUNTERS, (a - b for a, b in zip(metrics.get_values()[0], started_counters))))
+
+    scheduler.stop()
+    scheduler.join()
+
+    executions = counters['executions']
+    return {
+        "loop": event_loop.value,
+        "mode": "dispatcher" if use_dispatcher else "tasks",
+        "jobs": amount,
+        "executions_per_second": round(executions / seconds, 1),
+        "cpu_us_per_execution": round(cpu_time / executions * 1e6, 1) if executions else 0.0,
+        "jitter_mean_ms": round(counters['lateness_sum'] / executions * 1e3, 3) if executions else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1000, 10_000])
+    parser.add_argument('--interval', type=float, default=0.1, help="Interval of jobs in seconds.")
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    loops = list(EventLoops)
+    try:
+        import uvloop  # noqa: F401  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        print("uvloop isn't installed, only the asyncio loop is measured", file=sys.stderr)
+        loops.remove(EventLoops.UVLOOP)
+
+    print(f"{'loop':>8} {'mode':>10} {'jobs':>8} {'exec/s':>10} {'CPU us/exec':>12} {'jitter, ms':>11}")
+    for amount in args.jobs:
+        for use_dispatcher in (False, True):
+            for event_loop in loops:
+                res = measure(event_loop, amount, use_dispatcher, args.interval, args.seconds)
+                print(
+                    f"{res['loop']:>8} {res['mode']:>10} {res['jobs']:>8} {res['executions_per_second']:>10} "
+                    f"{res['cpu_us_per_execution']:>12} {res['jitter_mean_ms']:>11}"
+                )
+
+
+if __name__ == "__main__":
+    main()
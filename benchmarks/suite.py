@@ -0,0 +1,288 @@
+"""Benchmark suite which runs locally without Docker.
+
+For every job type, scheduler mode and amount of jobs it runs two scenarios,
+each in a fresh interpreter:
+
+* idle - jobs which never fire during the measurement. It reports memory per
+  job and CPU time which the scheduler spends per idle job.
+* load - jobs which fire every ``--interval`` seconds. It reports throughput
+  (executions per second) and dispatch jitter (delay between the scheduled
+  and the actual start of executions).
+
+The "default" mode starts a thread, a process or a task per job, the "pooled"
+mode uses the thread pool, the process pool and the async dispatcher. Process
+jobs in the default mode are limited by ``--max-processes``.
+
+Results are printed (or written into ``--output``) as JSON, so results of
+different releases can be compared.
+
+Usage: python benchmarks/suite.py --jobs 10 1000 100000 --output results.json
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import argparse
+from datetime import timedelta
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+
+import regta
+from regta import AsyncJob, ProcessJob, Scheduler, ThreadJob
+from regta.enums import JobTypes
+from regta.metrics import COUNTERS, JobMetrics, MetricsRegistry
+
+JITTER_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+IDLE_INTERVAL = timedelta(days=1)
+MODES = ('default', 'pooled')
+WARM_UP_SECONDS = 1.0
+
+
+def noop():
+    pass
+
+
+async def async_noop():
+    pass
+
+
+class BenchmarkAsyncJob(AsyncJob):
+    func = staticmethod(async_noop)
+
+
+class BenchmarkThreadJob(ThreadJob):
+    func = staticmethod(noop)
+
+
+class BenchmarkProcessJob(ProcessJob):
+    func = staticmethod(noop)
+
+
+jobs_classes = {
+    JobTypes.ASYNC: BenchmarkAsyncJob,
+    JobTypes.THREAD: BenchmarkThreadJob,
+    JobTypes.PROCESS: BenchmarkProcessJob,
+}
+
+
+def get_cpu_seconds(pids: Iterable[int]) -> float:
+    """CPU time of the current process and the passed child processes."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    seconds = usage.ru_utime + usage.ru_stime
+    ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/stat', encoding='utf-8') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        seconds += (int(fields[11]) + int(fields[12])) / ticks  # utime and stime
+    return seconds
+
+
+def get_memory_bytes(pids: Iterable[int]) -> int:
+    """Proportional set size (or RSS if it's unavailable) of the processes."""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/smaps_rollup', encoding='utf-8') as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith('Pss:')) * 1024
+            continue
+        except (OSError, StopIteration):
+            pass
+        try:
+            with open(f'/proc/{pid}/statm', encoding='utf-8') as f:
+                total += int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except OSError:
+            if pid == os.getpid():
+                total += resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return total
+
+
+def get_pids() -> List[int]:
+    return [os.getpid()] + [process.pid for process in multiprocessing.active_children() if process.pid]
+
+
+def get_percentile(buckets: Sequence[float], counts: Sequence[float], percentile: float) -> float:
+    """Upper bound of the bucket which contains the percentile."""
+    total = sum(counts)
+    if not total:
+        return 0.0
+    cumulative = 0.0
+    for bound, count in zip(tuple(buckets) + (float('inf'),), counts):
+        cumulative += count
+        if cumulative >= total * percentile:
+            return bound
+    return float('inf')
+
+
+def make_scheduler(
+        job_type: JobTypes,
+        mode: str,
+        amount: int,
+        interval: timedelta,
+        registry: MetricsRegistry,
+        spread: bool = False,
+):
+    logger = logging.getLogger('regta.benchmarks')
+    logger.setLevel(logging.WARNING)
+    pooled = mode == 'pooled'
+    scheduler = Scheduler(
+        use_thread_pool=pooled,
+        use_process_pool=pooled,
+        use_async_dispatcher=pooled,
+        metrics=registry,
+        logger=logger,
+    )
+    for _ in range(amount):
+        job = jobs_classes[job_type](logger=logger, use_ansi=False)
+        # Slightly different intervals spread executions like in real projects
+        job.interval = interval * random.uniform(0.9, 1.1) if spread else interval
+        scheduler.add_job(job)
+    return scheduler
+
+
+def run_idle(job_type: JobTypes, mode: str, amount: int, seconds: float) -> dict:
+    baseline_memory = get_memory_bytes(get_pids())
+    scheduler = make_scheduler(job_type, mode, amount, IDLE_INTERVAL, MetricsRegistry())
+    scheduler.run(block=False)
+    time.sleep(WARM_UP_SECONDS)
+
+    pids = get_pids()
+    memory = get_memory_bytes(pids) - baseline_memory
+    cpu_started_at = get_cpu_seconds(pids)
+    time.sleep(seconds)
+    cpu = get_cpu_seconds(pids) - cpu_started_at
+    scheduler.stop()
+
+    return {
+        "memory_per_job_bytes": round(memory / amount),
+        "idle_cpu_seconds_per_job_per_second": cpu / seconds / amount,
+    }
+
+
+def measure_window(metrics: JobMetrics, seconds: float) -> Tuple[Dict[str, float], List[float], float]:
+    """Measure how counters and lateness buckets of the metrics and CPU time
+    are changed during the window.
+    """
+    pids = get_pids()
+    started_counters, _, started_lateness = metrics.get_values()
+    cpu_started_at = get_cpu_seconds(pids)
+    time.sleep(seconds)
+    cpu = get_cpu_seconds(pids) - cpu_started_at
+    counters, _, lateness = metrics.get_values()
+    return (
+        dict(zip(COUNTERS, (a - b for a, b in zip(counters, started_counters)))),
+        [a - b for a, b in zip(lateness, started_lateness)],
+        cpu,
+    )
+
+
+def run_load(job_type: JobTypes, mode: str, amount: int, seconds: float, interval: timedelta) -> dict:
+    registry = MetricsRegistry(buckets=JITTER_BUCKETS)
+    scheduler = make_scheduler(job_type, mode, amount, interval, registry, spread=True)
+    scheduler.run(block=False)
+    time.sleep(WARM_UP_SECONDS + interval.total_seconds())
+
+    # All jobs have the same name, so they share metrics
+    metrics = registry.get_job_metrics(jobs_classes[job_type].get_plain_job_name())
+    counters, lateness, cpu = measure_window(metrics, seconds)
+    scheduler.stop()
+
+    executions, lateness_sum = counters['executions'], counters['lateness_sum']
+    started = sum(lateness)
+    return {
+        "throughput_per_second": executions / seconds,
+        "expected_throughput_per_second": amount / interval.total_seconds(),
+        "jitter_mean_seconds": lateness_sum / started if started else 0.0,
+        "jitter_p50_seconds": get_percentile(JITTER_BUCKETS, lateness, 0.5),
+        "jitter_p99_seconds": get_percentile(JITTER_BUCKETS, lateness, 0.99),
+        "cpu_seconds_per_second": cpu / seconds,
+    }
+
+
+def run_scenario(scenario: Dict) -> dict:
+    job_type = JobTypes(scenario['job_type'])
+    if scenario['name'] == 'idle':
+        return run_idle(job_type, scenario['mode'], scenario['jobs'], scenario['seconds'])
+    return run_load(
+        job_type,
+        scenario['mode'],
+        scenario['jobs'],
+        scenario['seconds'],
+        timedelta(seconds=scenario['interval']),
+    )
+
+
+def run_in_subprocess(scenario: Dict) -> dict:
+    res = subprocess.run(
+        [sys.executable, __file__, '--scenario', json.dumps(scenario)],
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    return {**scenario, **json.loads(res.stdout.splitlines()[-1])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--types', nargs='+', default=[job_type.value for job_type in JobTypes])
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES)
+    parser.add_argument('--seconds', type=float, default=5, help="Duration of every measurement.")
+    parser.add_argument('--interval', type=float, default=1, help="Interval of jobs in the load scenario.")
+    parser.add_argument('--max-processes', type=int, default=1000)
+    parser.add_argument('--output', help="File to write results into instead of stdout.")
+    parser.add_argument('--scenario', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(json.loads(args.scenario))))
+        return
+
+    results = []
+    for job_type in args.types:
+        for mode in args.modes:
+            for amount in args.jobs:
+                if job_type == JobTypes.PROCESS.value and mode == 'default' and amount > args.max_processes:
+                    continue
+                for name in ('idle', 'load'):
+                    scenario = {
+                        "name": name,
+                        "job_type": job_type,
+                        "mode": mode,
+                        "jobs": amount,
+                        "seconds": args.seconds,
+                        "interval": args.interval,
+                    }
+                    print(f"Running {json.dumps(scenario)}", file=sys.stderr)
+                    results.append(run_in_subprocess(scenario))
+
+    report = json.dumps(
+        {
+            "regta": regta.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "results": results,
+        },
+        indent=2,
+    )
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
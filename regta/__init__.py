@@ -1,6 +1,8 @@
 from regta_period import AbstractPeriod, Period, PeriodAggregation, Weekdays
 
+from .enums import MisfirePolicies, OverlapPolicies
 from .jobs import async_job, AsyncJob, process_job, ProcessJob, thread_job, ThreadJob
+from .retries import RetryPolicy
 from .schedulers import Scheduler
 from .utils import run_jobs as run
 
@@ -9,9 +11,12 @@ __version__ = '0.3.0'
 __all__ = [
     'AbstractPeriod',
     'AsyncJob',
+    'MisfirePolicies',
+    'OverlapPolicies',
     'Period',
     'PeriodAggregation',
     'ProcessJob',
+    'RetryPolicy',
     'Scheduler',
     'ThreadJob',
     'Weekdays',
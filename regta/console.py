@@ -2,9 +2,10 @@
 See details at the repository on \n https://github.com/SKY-ALIN/regta/
 """
 
-from typing import Callable, Tuple, Type, Union
+from typing import Any, Callable, Dict, Tuple, Type, Union
 
 import asyncio
+from datetime import datetime
 import logging
 from logging import Logger
 from pathlib import Path
@@ -12,10 +13,10 @@ from pathlib import Path
 import click
 
 from . import __version__
-from .enums import CodeStyles, JobTypes
+from .enums import CodeStyles, ControlCommands, EventLoops, JobTypes
+from .exceptions import RegtaException
 from .jobs import AsyncJob, JobHint
-from .logging import empty_log_format, JobLoggerAdapter, make_default_logger, prod_log_format
-from .templates import generate_decorator_styled_job, generate_oop_styled_job
+from .logging import empty_log_format, JobLoggerAdapter, make_default_logger, make_scheduler_logger, prod_log_format
 from .utils import load_jobs, load_object, run_jobs, show_jobs_info
 
 logger_param_help = (
@@ -27,14 +28,59 @@ no_ansi_param_help = "Disable ANSI colors."
 path_param_help = "Path to directory with jobs."
 job_type_param_help = "Job type. Defines how the job will use system resources."
 code_style_param_help = "Job code style."
+queue_logging_param_help = (
+    "Format and write log records of the default logger from a separate thread in batches. "
+    "Can't be used with a custom logger."
+)
+no_index_param_help = "Import every module instead of only ones which define jobs according to the discovery index."
+thread_pool_param_help = "Run thread jobs in a shared thread pool instead of a thread per job."
+thread_pool_size_param_help = "Max amount of worker threads in the thread pool mode."
+process_pool_param_help = "Run process jobs in a pool of warm worker processes instead of a process per job."
+process_pool_size_param_help = "Amount of worker processes in the process pool mode.  [default: CPU cores amount]"
+async_dispatcher_param_help = "Dispatch async jobs from a single timer instead of a task per job."
+async_workers_param_help = (
+    "Spread async jobs across the amount of processes, each with its own event loop. "
+    "Every job is assigned to a process by a hash of its name."
+)
+loop_param_help = "Event loop of async jobs. uvloop is installed with `pip install regta[uvloop]`."
+metrics_port_param_help = "Serve metrics in the Prometheus text format at http://<host>:<port>/metrics."
+metrics_host_param_help = "Host of the metrics endpoint."
+max_concurrency_param_help = "Max amount of simultaneously running executions of all jobs."
+tag_limit_param_help = (
+    "Max amount of simultaneously running executions of jobs with the tag in the <tag>=<limit> format. "
+    "Can be passed several times."
+)
+max_waiting_param_help = "Max amount of executions waiting for a concurrency slot. Executions over it are skipped."
+spread_param_help = (
+    "Shift execution times of every job within the window of seconds by a hash of its name, "
+    "so jobs with equal intervals don't fire at once."
+)
+state_param_help = (
+    "Keep the last successful fire time of every job in the file to catch up missed executions after restarts. "
+    "*.db, *.sqlite and *.sqlite3 files are SQLite databases, others are append-only files."
+)
+no_log_aggregation_param_help = "Let process jobs write their logs by themselves instead of the main process."
+control_socket_param_help = (
+    "Serve commands of `regta ctl` at the Unix domain socket to inspect, trigger, pause and resume jobs."
+)
+socket_param_help = "Path to the control socket of the running `regta run`."
+shutdown_timeout_param_help = (
+    "Max seconds to wait for running executions on stop. "
+    "After that, processes are terminated and cut off jobs are reported."
+)
 
 
-def _get_loggers(logger_uri: str, use_ansi: bool, verbose: bool) -> Tuple[Logger, JobLoggerAdapter]:
+def _get_loggers(
+        logger_uri: str,
+        use_ansi: bool,
+        verbose: bool,
+        use_queue: bool = False,
+) -> Tuple[Logger, JobLoggerAdapter]:
     logger_factory: Union[Callable[[], Logger], None] = load_object(logger_uri) if logger_uri else None
     logger: Logger = (
         logger_factory()
         if logger_factory
-        else make_default_logger(use_ansi=use_ansi, fmt=prod_log_format)
+        else make_default_logger(use_ansi=use_ansi, fmt=prod_log_format, use_queue=use_queue)
     )
 
     if verbose:
@@ -42,13 +88,34 @@ def _get_loggers(logger_uri: str, use_ansi: bool, verbose: bool) -> Tuple[Logger
         for handler in logger.handlers:
             handler.setLevel(logging.DEBUG)
 
-    wrapped_logger = JobLoggerAdapter(
-        logger,
-        plain_job_name='regta',
-        styled_job_name=click.style('regta', fg='magenta'),
-        use_ansi=use_ansi,
+    return logger, make_scheduler_logger(logger, use_ansi=use_ansi)
+
+
+def _parse_tag_limits(ctx, param, values: Tuple[str, ...]) -> Dict[str, int]:  # pylint: disable=unused-argument
+    tag_limits = {}
+    for value in values:
+        tag, _, limit = value.rpartition('=')
+        if not tag or not limit.isdigit() or int(limit) < 1:
+            raise click.BadParameter(f"'{value}' doesn't match the <tag>=<limit> format.")
+        tag_limits[tag] = int(limit)
+    return tag_limits
+
+
+def _format_job_state(state: Dict[str, Any], use_ansi: bool) -> str:
+    name = state['name']
+    if use_ansi:
+        module, _, class_name = name.partition(':')
+        name = f"{module}:{click.style(class_name, fg='blue')}"
+    next_fire_time = (
+        f"next at {datetime.fromtimestamp(state['next_fire_time']):%Y-%m-%d %H:%M:%S}"
+        if state['next_fire_time'] is not None
+        else "not scheduled"
     )
-    return logger, wrapped_logger
+    last_duration = (
+        f"last took {state['last_duration']:.3f}s" if state['last_duration'] is not None else "not executed yet"
+    )
+    paused = (click.style(", paused", fg='yellow') if use_ansi else ", paused") if state['paused'] else ""
+    return f"* {name} ({state['type']}): {next_fire_time}, {last_duration}{paused}"
 
 
 @click.group(help=__doc__)
@@ -78,23 +145,147 @@ def main(): pass
     is_flag=True,
     help=no_ansi_param_help,
 )
-def run(path: Path, logger_uri: str, disable_ansi: bool, verbose: bool):
+@click.option(
+    '--no-index', 'disable_index',
+    is_flag=True,
+    help=no_index_param_help,
+)
+@click.option(
+    '--queue-logging', 'use_queue_logging',
+    is_flag=True,
+    help=queue_logging_param_help,
+)
+@click.option(
+    '--metrics-port', 'metrics_port',
+    type=click.IntRange(min=0, max=65535),
+    help=metrics_port_param_help,
+)
+@click.option(
+    '--metrics-host', 'metrics_host',
+    default='127.0.0.1',
+    show_default=True,
+    help=metrics_host_param_help,
+)
+@click.option(
+    '--state', 'state_path',
+    type=Path,
+    help=state_param_help,
+)
+@click.option(
+    '--max-concurrency', 'max_concurrency',
+    type=click.IntRange(min=1),
+    help=max_concurrency_param_help,
+)
+@click.option(
+    '--tag-limit', 'tag_limits',
+    multiple=True,
+    callback=_parse_tag_limits,
+    help=tag_limit_param_help,
+)
+@click.option(
+    '--max-waiting', 'max_waiting',
+    default=1000,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help=max_waiting_param_help,
+)
+@click.option(
+    '--spread', 'spread',
+    type=click.FloatRange(min=0),
+    help=spread_param_help,
+)
+@click.option(
+    '--thread-pool', 'use_thread_pool',
+    is_flag=True,
+    help=thread_pool_param_help,
+)
+@click.option(
+    '--thread-pool-size', 'thread_pool_size',
+    type=click.IntRange(min=1),
+    help=thread_pool_size_param_help,
+)
+@click.option(
+    '--process-pool', 'use_process_pool',
+    is_flag=True,
+    help=process_pool_param_help,
+)
+@click.option(
+    '--process-pool-size', 'process_pool_size',
+    type=click.IntRange(min=1),
+    help=process_pool_size_param_help,
+)
+@click.option(
+    '--async-dispatcher', 'use_async_dispatcher',
+    is_flag=True,
+    help=async_dispatcher_param_help,
+)
+@click.option(
+    '--loop', 'event_loop',
+    default=EventLoops.ASYNCIO.value,
+    show_default=True,
+    type=click.Choice([event_loop.value for event_loop in EventLoops]),
+    help=loop_param_help,
+)
+@click.option(
+    '--async-workers', 'async_workers',
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help=async_workers_param_help,
+)
+@click.option(
+    '--no-log-aggregation', 'aggregate_process_logs',
+    flag_value=False,
+    default=True,
+    help=no_log_aggregation_param_help,
+)
+@click.option(
+    '--shutdown-timeout', 'shutdown_timeout',
+    type=click.FloatRange(min=0),
+    help=shutdown_timeout_param_help,
+)
+@click.option(
+    '--control-socket', 'control_socket',
+    type=Path,
+    help=control_socket_param_help,
+)
+def run(  # pylint: disable=too-many-locals
+        path: Path,
+        logger_uri: str,
+        disable_ansi: bool,
+        verbose: bool,
+        disable_index: bool,
+        use_queue_logging: bool,
+        state_path: Union[Path, None],
+        **scheduler_options,
+):
     """Start all jobs."""
+    if logger_uri and use_queue_logging:
+        raise click.UsageError("--queue-logging can't be used with --logger.")
     use_ansi = not disable_ansi
 
-    logger, wrapped_logger = _get_loggers(logger_uri, use_ansi, verbose)
+    logger, wrapped_logger = _get_loggers(logger_uri, use_ansi, verbose, use_queue=use_queue_logging)
 
-    classes = load_jobs(path)
+    classes = load_jobs(path, use_index=not disable_index)
 
     show_jobs_info(classes=classes, verbose=verbose, logger=wrapped_logger, use_ansi=use_ansi)
 
+    if state_path is not None:
+        from .state import make_state_store  # pylint: disable=import-outside-toplevel
+
+        scheduler_options['state_store'] = make_state_store(state_path)
+
     try:
-        run_jobs(classes=classes, logger=logger, use_ansi=use_ansi)
-    except ValueError as e:
+        cut_off_jobs = run_jobs(classes=classes, logger=logger, use_ansi=use_ansi, **scheduler_options)
+    except (ValueError, RegtaException) as e:
         wrapped_logger.info(click.style(str(e), fg='red') if use_ansi else str(e))
     else:
-        end_str = "All jobs are closed correctly."
-        wrapped_logger.info(click.style(end_str, fg='green') if use_ansi else end_str)
+        if cut_off_jobs:
+            end_str = f"{len(cut_off_jobs)} job(s) were cut off."
+            wrapped_logger.info(click.style(end_str, fg='red') if use_ansi else end_str)
+        else:
+            end_str = "All jobs are closed correctly."
+            wrapped_logger.info(click.style(end_str, fg='green') if use_ansi else end_str)
 
 
 @main.command()
@@ -122,11 +313,14 @@ def run(path: Path, logger_uri: str, disable_ansi: bool, verbose: bool):
 )
 def new(name: str, job_type: str, code_style: str, path: Path):
     """Create a new job by template."""
+    # jinja2 is imported and templates are compiled only for this command to keep other commands startup fast
+    from . import templates  # pylint: disable=import-outside-toplevel
+
     style = CodeStyles(code_style)
     if style is CodeStyles.DECORATOR:
-        file_name, class_name = generate_decorator_styled_job(name, JobTypes(job_type), path)
+        file_name, class_name = templates.generate_decorator_styled_job(name, JobTypes(job_type), path)
     elif style is CodeStyles.OOP:
-        file_name, class_name = generate_oop_styled_job(name, JobTypes(job_type), path)
+        file_name, class_name = templates.generate_oop_styled_job(name, JobTypes(job_type), path)
     else:
         raise ValueError("Incorrect job code style")
 
@@ -149,10 +343,15 @@ def new(name: str, job_type: str, code_style: str, path: Path):
     is_flag=True,
     help=no_ansi_param_help,
 )
-def list_command(path: Path, disable_ansi: bool):
+@click.option(
+    '--no-index', 'disable_index',
+    is_flag=True,
+    help=no_index_param_help,
+)
+def list_command(path: Path, disable_ansi: bool, disable_index: bool):
     """Show the list of found jobs."""
     show_jobs_info(
-        classes=load_jobs(path),
+        classes=load_jobs(path, use_index=not disable_index),
         path=path,
         verbose=True,
         logger=make_default_logger(use_ansi=not disable_ansi, fmt=empty_log_format),
@@ -194,3 +393,43 @@ def execute(job_uri: str, logger_uri: str, verbose: bool, disable_ansi: bool):
         asyncio.run(job.execute())
     else:
         job.execute()
+
+
+@main.command()
+@click.argument('command', type=click.Choice([command.value for command in ControlCommands]))
+@click.argument('job_name', required=False)
+@click.option(
+    '--socket', 'socket_path',
+    default=Path('regta.sock'),
+    show_default=True,
+    type=Path,
+    help=socket_param_help,
+)
+@click.option(
+    '--no-ansi', 'disable_ansi',
+    is_flag=True,
+    help=no_ansi_param_help,
+)
+def ctl(command: str, job_name: Union[str, None], socket_path: Path, disable_ansi: bool):
+    """Control jobs of the running `regta run --control-socket`.
+
+    COMMAND - `list` shows all jobs, `trigger` executes the job once and immediately,
+    `pause` and `resume` skip and resume executions of the job.
+
+    JOB_NAME - full name of the job like `jobs.database_jobs:MakeBackup` or only its class name.
+    """
+    if command != 'list' and not job_name:
+        raise click.UsageError(f"JOB_NAME is required for `{command}`.")
+    from .control import send_command  # pylint: disable=import-outside-toplevel
+
+    try:
+        states = send_command(socket_path, command, job_name)
+    except RegtaException as e:
+        raise click.ClickException(str(e)) from e
+
+    use_ansi = not disable_ansi
+    verbs = {'list': "running", 'trigger': "triggered", 'pause': "paused", 'resume': "resumed"}
+    count = click.style(str(len(states)), fg='green' if states else 'red') if use_ansi else len(states)
+    click.echo(f"[{count}] jobs are {verbs[command]}{':' if states else '.'}")
+    for state in states:
+        click.echo(_format_job_state(state, use_ansi))
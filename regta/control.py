@@ -0,0 +1,190 @@
+"""Contains the control server which lets to inspect and manage jobs of a
+running scheduler via a local Unix domain socket, and its client used by
+``regta ctl``.
+
+Every connection carries a single request and a single response, both are
+JSON objects in one line. A request has a ``command`` (see :data:`COMMANDS`)
+and, except for ``list``, a ``job`` name. A response has either ``jobs`` with
+states of the affected jobs or an ``error``.
+"""
+
+from typing import Any, Dict, List, Union
+
+import json
+import os
+from pathlib import Path
+import socket
+from threading import Thread
+
+from .enums import ControlCommands
+from .exceptions import RegtaException
+from .jobs import JobHint, jobs_classes
+
+COMMANDS = tuple(command.value for command in ControlCommands)
+"""Commands accepted by the control server."""
+
+
+def _check_platform():
+    if not hasattr(socket, 'AF_UNIX'):
+        raise RegtaException("Unix domain sockets aren't supported on this platform")
+
+
+def get_job_state(job: JobHint) -> Dict[str, Any]:
+    """Get the job's state as it's passed to clients."""
+    return {
+        'name': job.get_plain_job_name(),
+        'type': next(job_type.value for job_type, _class in jobs_classes.items() if isinstance(job, _class)),
+        'paused': job.is_paused,
+        'next_fire_time': job.next_fire_time,
+        'last_duration': job.last_duration,
+    }
+
+
+class ControlServer:
+    """Server which executes commands of clients in the scheduler from a
+    daemon thread. The socket file is accessible only by its owner.
+
+    Args:
+        scheduler: The scheduler whose jobs are controlled, see :class:`regta.Scheduler`.
+        path: Path to the socket file. A stale file left by a killed process is replaced.
+
+    Raises:
+        RegtaException: If the socket is used by another running process.
+    """
+
+    def __init__(self, scheduler, path: Union[str, Path]):
+        # It's imported only when commands are served to keep the CLI startup fast
+        import socketserver  # pylint: disable=import-outside-toplevel
+
+        _check_platform()
+        self.scheduler = scheduler
+        self.path = Path(path)
+        execute = self.execute
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline())
+                    response = {'jobs': execute(request['command'], request.get('job'))}
+                except (ValueError, TypeError, KeyError) as e:
+                    response = {'error': f"Incorrect request: {e!r}"}
+                except RegtaException as e:
+                    response = {'error': str(e)}
+                self.wfile.write(json.dumps(response).encode() + b'\n')
+
+        self.__remove_stale_socket()
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.path), Handler, bind_and_activate=False)
+        try:
+            self.__bind()
+            self._server.server_activate()
+        except BaseException:
+            self._server.server_close()
+            raise
+        self._server.daemon_threads = True
+        self._thread: Union[Thread, None] = None
+
+    def __bind(self):
+        """Bind the socket in a private directory and move it to the path
+        with the final permissions, so it's never accessible by others.
+        The process-wide umask isn't changed since jobs may create files.
+        """
+        import tempfile  # pylint: disable=import-outside-toplevel
+
+        private_dir = tempfile.mkdtemp(prefix='.regta-', dir=self.path.parent)
+        try:
+            temp_path = os.path.join(private_dir, 'sock')
+            self._server.socket.bind(temp_path)
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.path)
+        finally:
+            os.rmdir(private_dir)
+        self._server.server_address = str(self.path)
+
+    def __remove_stale_socket(self):
+        if not self.path.is_socket():
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(str(self.path))
+            except ConnectionRefusedError:
+                self.path.unlink()
+                return
+        raise RegtaException(f"Control socket {self.path} is used by another process")
+
+    def execute(self, command: str, job_name: Union[str, None] = None) -> List[Dict[str, Any]]:
+        """Execute the command for all jobs with the name.
+
+        Args:
+            command: One of :data:`COMMANDS`.
+            job_name: Full name of jobs like ``jobs.backup:MakeBackup`` or only their class name.
+
+        Return:
+            States of the affected jobs, see :func:`get_job_state`.
+
+        Raises:
+            RegtaException: If the command is unknown or there are no jobs with the name.
+        """
+        if command not in COMMANDS:
+            raise RegtaException(f"Unknown command '{command}'")
+        jobs = self.scheduler.get_jobs()
+        if command != 'list':
+            jobs = [job for job in jobs if job_name in (job.get_plain_job_name(), job.__class__.__name__)]
+            if not jobs:
+                raise RegtaException(f"Job '{job_name}' isn't found")
+            for job in jobs:
+                getattr(self.scheduler, f'{command}_job')(job)
+        return [get_job_state(job) for job in jobs]
+
+    def start(self):
+        self._thread = Thread(target=self._server.serve_forever, name='regta-control', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and remove the socket file."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._server.shutdown()
+            thread.join()
+        self._server.server_close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def send_command(
+        path: Union[str, Path],
+        command: str,
+        job_name: Union[str, None] = None,
+        timeout: float = 10.0,
+) -> List[Dict[str, Any]]:
+    """Send the command to the control server, see :meth:`ControlServer.execute`.
+
+    Args:
+        path: Path to the socket file.
+        command: One of :data:`COMMANDS`.
+        job_name: Name of jobs the command is applied to.
+        timeout: Max seconds to wait for the server.
+
+    Return:
+        States of the affected jobs, see :func:`get_job_state`.
+
+    Raises:
+        RegtaException: If the server isn't available or the command is failed.
+    """
+    _check_platform()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(json.dumps({'command': command, 'job': job_name}).encode() + b'\n')
+            with sock.makefile('rb') as f:
+                line = f.readline()
+    except OSError as e:
+        raise RegtaException(f"Can't reach the control socket {path}: {e}") from e
+    if not line:
+        raise RegtaException("The control server closed the connection without a response")
+    response = json.loads(line)
+    if 'error' in response:
+        raise RegtaException(response['error'])
+    return response['jobs']
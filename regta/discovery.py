@@ -0,0 +1,172 @@
+"""Contains the index which helps to find modules with jobs without importing
+every module of the project.
+
+Every module is parsed (not executed) once and its summary is saved into the
+index together with the file's modification time and hash. A module is
+imported only if it defines a job class or refers to a job decorator, either
+as a decorator or called directly, and also under an alias of the import.
+Later runs parse only the changed files.
+"""
+
+from typing import Dict, Iterable, List, Set, Union
+
+import ast
+import hashlib
+import json
+from pathlib import Path
+
+from .enums import DecoratorNames
+from .jobs import jobs_classes
+
+INDEX_VERSION = 2
+INDEX_PATH = Path("__pycache__") / "regta-jobs-index.json"
+"""Path to the index file relative to the jobs directory."""
+
+BASE_CLASSES = frozenset(job_class.__name__ for job_class in jobs_classes.values())
+DECORATORS = frozenset(decorator.name for decorator in DecoratorNames)
+
+
+def _get_name(node: ast.AST, aliases: Dict[str, str]) -> Union[str, None]:
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return aliases.get(node.id, node.id)
+    return None
+
+
+def _get_aliases(tree: ast.AST) -> Dict[str, str]:
+    """Original names of everything imported like ``from regta import thread_job as tj``."""
+    return {
+        alias.asname: alias.name
+        for node in ast.walk(tree)
+        if isinstance(node, ast.ImportFrom)
+        for alias in node.names
+        if alias.asname is not None
+    }
+
+
+def scan_source(source: Union[str, bytes]) -> dict:
+    """Collect everything the index needs to know about a module.
+
+    Args:
+        source: Source code of the module.
+
+    Return:
+        dict: Names of base classes for every class defined in the module and
+        whether the module refers to job decorators, e.g. to decorate functions
+        or to call them like ``thread_job(seconds=1)(func)``.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        # Let the import raise a proper error
+        return {"classes": {}, "decorated": True}
+
+    aliases = _get_aliases(tree)
+    classes: Dict[str, List[str]] = {}
+    decorated = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            bases = (_get_name(base, aliases) for base in node.bases)
+            classes[node.name] = [name for name in bases if name is not None]
+        elif isinstance(node, (ast.Name, ast.Attribute)):
+            decorated = decorated or _get_name(node, aliases) in DECORATORS
+    return {"classes": classes, "decorated": decorated}
+
+
+def _get_job_classes_names(summaries: Iterable[dict]) -> Set[str]:
+    """Names of all classes which are derived from job classes, even through
+    other user-defined classes in other modules.
+    """
+    summaries = list(summaries)
+    names = set(BASE_CLASSES)
+    changed = True
+    while changed:
+        changed = False
+        for summary in summaries:
+            for class_name, bases in summary["classes"].items():
+                if class_name not in names and names.intersection(bases):
+                    names.add(class_name)
+                    changed = True
+    return names
+
+
+class JobsIndex:
+    """Persistent index of modules which may contain jobs.
+
+    Args:
+        path: Path to the jobs directory.
+        index_path: Path to the index file. :data:`INDEX_PATH` inside the jobs
+            directory is used by default.
+    """
+
+    def __init__(self, path: Path, index_path: Union[Path, None] = None):
+        self.path = path
+        self.index_path = index_path or path / INDEX_PATH
+        self._entries: Dict[str, dict] = {}
+        self._changed = False
+
+    def load(self):
+        """Read the index file. A missing or broken index is ignored."""
+        try:
+            with self.index_path.open() as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            self._entries = data.get("files", {})
+
+    def save(self):
+        """Write the index file if something was changed. It fails silently
+        if the directory is read-only.
+        """
+        if not self._changed:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with tmp_path.open("w") as f:
+                json.dump({"version": INDEX_VERSION, "files": self._entries}, f)
+            tmp_path.replace(self.index_path)
+        except OSError:
+            return
+        self._changed = False
+
+    def __get_summary(self, file: Path) -> dict:
+        key = str(file)
+        stat = file.stat()
+        entry = self._entries.get(key)
+        if entry is not None and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["summary"]
+
+        source = file.read_bytes()
+        digest = hashlib.sha1(source).hexdigest()
+        if entry is None or entry["hash"] != digest:
+            entry = {"hash": digest, "summary": scan_source(source)}
+        entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+        self._entries[key] = entry
+        self._changed = True
+        return entry["summary"]
+
+    def find_modules(self, files: Iterable[Path]) -> List[Path]:
+        """Filter out files which definitely don't contain jobs.
+
+        Args:
+            files: Python files of the jobs directory.
+
+        Return:
+            list: Files which define job classes or use job decorators.
+        """
+        summaries = {file: self.__get_summary(file) for file in files}
+        for key in set(self._entries) - {str(file) for file in summaries}:
+            del self._entries[key]
+            self._changed = True
+
+        job_classes_names = _get_job_classes_names(summaries.values()) - BASE_CLASSES
+        return [
+            file
+            for file, summary in summaries.items()
+            if summary["decorated"] or job_classes_names.intersection(summary["classes"])
+        ]
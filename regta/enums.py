@@ -16,3 +16,26 @@ class DecoratorNames(Enum):
 class CodeStyles(Enum):
     OOP = 'oop'
     DECORATOR = 'decorator'
+
+
+class OverlapPolicies(Enum):
+    SKIP = 'skip'
+    QUEUE = 'queue'
+
+
+class MisfirePolicies(Enum):
+    SKIP = 'skip'
+    COALESCE = 'coalesce'
+    ALL = 'all'
+
+
+class EventLoops(Enum):
+    ASYNCIO = 'asyncio'
+    UVLOOP = 'uvloop'
+
+
+class ControlCommands(Enum):
+    LIST = 'list'
+    TRIGGER = 'trigger'
+    PAUSE = 'pause'
+    RESUME = 'resume'
@@ -1,3 +1,6 @@
+from typing import List, Union
+
+
 class RegtaException(Exception):
     pass
 
@@ -10,3 +13,48 @@ class IncorrectJobType(RegtaException):
     def __init__(self, job, scheduler):
         message = f"{job.__class__.__name__} is incorrect job type for {scheduler.__class__.__name__}"
         super().__init__(message)
+
+
+class JobOptionCollision(RegtaException):
+    def __init__(self, option: str, func_name: str):
+        super().__init__(
+            f"'{option}' is an option of the job, so it can't be passed into the function "
+            f"'{func_name}' which has an argument with the same name. Rename the argument "
+            f"or make the job as a class with its 'kwargs' attribute."
+        )
+        self.option = option
+
+
+class JobNotRunning(RegtaException):
+    def __init__(self, job):
+        super().__init__(f"{job.get_plain_job_name()} isn't running in the scheduler")
+
+
+class RemoteTraceback(RegtaException):
+    """Keeps the traceback of an exception raised in a worker process.
+    It's attached as :attr:`__cause__` to the exception passed to the parent.
+    """
+
+    def __init__(self, lines: List[str]):
+        super().__init__(''.join(lines))
+        self.lines = lines
+
+
+class WorkerProcessDied(RegtaException):
+    def __init__(self, exitcode: Union[int, None]):
+        super().__init__(f"Worker process died with exit code {exitcode}")
+
+
+class ExecutionTimeout(RegtaException):
+    def __init__(self, timeout: float):
+        super().__init__(f"Execution timeout ({timeout}s) is exceeded")
+        self.timeout = timeout
+
+
+class TooManyAbandonedExecutions(RegtaException):
+    def __init__(self, amount: int):
+        super().__init__(
+            f"{amount} abandoned executions which exceeded the timeout are still running, "
+            f"so the execution is skipped until some of them finish"
+        )
+        self.amount = amount
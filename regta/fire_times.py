@@ -0,0 +1,179 @@
+"""Contains the engine which computes execution times of period-based jobs.
+
+Usually thousands of jobs share only a few period definitions, so the engine
+deduplicates equal periods and precomputes a window of their upcoming
+execution times. Jobs take the nearest of them instead of doing the time zone
+and calendar math on every cycle.
+"""
+
+from typing import Hashable, List, Union
+
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone, tzinfo
+import os
+from threading import Lock
+from weakref import WeakSet
+
+from regta_period import AbstractPeriod, Period, PeriodAggregation
+
+utc = timezone.utc
+
+
+def _get_zones(period: AbstractPeriod) -> List[tzinfo]:
+    periods = period.periods if isinstance(period, PeriodAggregation) else (period,)
+    return [p._timezone for p in periods if p._timezone is not None]  # pylint: disable=protected-access
+
+
+def _get_key(period: AbstractPeriod) -> Hashable:
+    """Key which is equal for periods with equal settings."""
+    if isinstance(period, PeriodAggregation):
+        return tuple(map(_get_key, period.periods))
+    return (  # pylint: disable=protected-access
+        period._regular_offset,  # type: ignore[attr-defined]
+        period._time_offset,  # type: ignore[attr-defined]
+        period._timezone,  # type: ignore[attr-defined]
+        period._timezone_offset,  # type: ignore[attr-defined]
+        frozenset(period._weekdays),  # type: ignore[attr-defined]
+    )
+
+
+def _get_offsets(zones: List[tzinfo], moment: float) -> List[Union[timedelta, None]]:
+    return [datetime.fromtimestamp(moment, tz=zone).utcoffset() for zone in zones]
+
+
+class _Schedule:
+    """Precomputed upcoming execution times of a single period."""
+
+    def __init__(self, period: AbstractPeriod, window: int):
+        self.period = period
+        self.window = window
+        self.zones = _get_zones(period)
+        self.times = array('d')
+        # The window is valid only for moments since this one
+        self.start = float('inf')
+
+    def __get_next(self, moment: float) -> float:
+        if self.period.is_timezone_in_use:
+            dt = datetime.fromtimestamp(moment, tz=utc)
+            return self.period.get_next(dt).timestamp()
+        dt = datetime.fromtimestamp(moment, tz=utc).replace(tzinfo=None)
+        return self.period.get_next(dt).replace(tzinfo=utc).timestamp()
+
+    def __refill(self, now: float):
+        """Precompute the window of execution times after ``now``.
+
+        The window never crosses a UTC offset change (e.g. DST) of the
+        period's time zones, so the first execution time after the change is
+        always computed from scratch.
+        """
+        self.times = array('d')
+        self.start = now
+        moment = self.__get_next(now)
+        self.times.append(moment)
+        offsets = _get_offsets(self.zones, now)
+        while len(self.times) < self.window:
+            moment = self.__get_next(moment)
+            if self.zones and _get_offsets(self.zones, moment) != offsets:
+                break
+            self.times.append(moment)
+
+    def get_next(self, now: float) -> float:
+        if now < self.start:
+            if self.times:
+                # Jobs with a spread ask for moments a bit earlier than others, don't drop the window for them
+                return self.__get_next(now)
+            self.__refill(now)
+        index = bisect_right(self.times, now)
+        if index >= len(self.times):
+            self.__refill(now)
+            index = 0
+        elif index > self.window // 2:
+            self.start = self.times[index - 1]
+            del self.times[:index]
+            index = 0
+        return self.times[index]
+
+
+_engines: WeakSet = WeakSet()
+
+
+def _reset_engines():
+    for _engine in list(_engines):
+        _engine._reset()  # pylint: disable=protected-access
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_engines)
+
+
+class FireTimeEngine:
+    """Computes the next execution times of periods with a shared cache.
+
+    Equal periods (by their settings) share a single window of precomputed
+    execution times. Only :class:`regta.Period` and
+    :class:`regta.PeriodAggregation` are cached, other period types are
+    computed on every call.
+
+    Args:
+        window: Amount of precomputed execution times per period.
+        max_periods: Max amount of cached periods. The least recently used
+            ones are dropped.
+    """
+
+    _schedules: 'OrderedDict[Hashable, _Schedule]'
+
+    def __init__(self, window: int = 64, max_periods: int = 1024):
+        self.window = window
+        self.max_periods = max_periods
+        self._reset()
+        _engines.add(self)
+
+    def _reset(self):
+        """Make a fresh lock and cache. It's called in forked processes since
+        the parent's lock may be held by another thread at the moment of the fork.
+        """
+        self._schedules = OrderedDict()
+        self._lock = Lock()
+
+    def get_next(self, period: AbstractPeriod, now: float) -> float:
+        """Get the next execution time after the passed moment.
+
+        Args:
+            period: Period of the job.
+            now: Current moment as a UNIX timestamp.
+
+        Return:
+            float: The next execution time as a UNIX timestamp.
+        """
+        if not isinstance(period, (Period, PeriodAggregation)):
+            return now + self.__get_interval(period, now)
+
+        key = _get_key(period)
+        with self._lock:
+            schedule = self._schedules.get(key)
+            if schedule is None:
+                schedule = self._schedules[key] = _Schedule(period, self.window)
+                if len(self._schedules) > self.max_periods:
+                    self._schedules.popitem(last=False)
+            else:
+                self._schedules.move_to_end(key)
+            return schedule.get_next(now)
+
+    @staticmethod
+    def __get_interval(period: AbstractPeriod, now: float) -> float:
+        if period.is_timezone_in_use:
+            current_moment = datetime.fromtimestamp(now, tz=utc)
+        else:
+            current_moment = datetime.fromtimestamp(now, tz=utc).replace(tzinfo=None)
+        return period.get_interval(current_moment).total_seconds()
+
+    def clear(self):
+        """Drop all precomputed execution times."""
+        with self._lock:
+            self._schedules.clear()
+
+
+engine = FireTimeEngine()
+"""Engine shared by all jobs."""
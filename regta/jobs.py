@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 """Contains bases of different job types.
 
 You can use the following entities to build your jobs:
@@ -6,21 +7,52 @@ You can use the following entities to build your jobs:
     * Class :class:`ProcessJob` or :class:`regta.process_job` decorator
 """
 
-from typing import Awaitable, Callable, Dict, Iterable, Type, Union
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, MutableSequence, Set, Tuple, Type, TYPE_CHECKING
+from typing import Union
 
 from abc import ABC, abstractmethod
 import asyncio
-from datetime import datetime, timedelta, timezone
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import timedelta
+import heapq
+import inspect
 from logging import Logger, LoggerAdapter
-from multiprocessing import Event as ProcessEventFabric, Process
+import math
+from multiprocessing import Event as ProcessEventFabric, Process, RawArray
 from multiprocessing.synchronize import Event as ProcessEventObject
-from threading import Event as ThreadEvent, Thread
+import signal
+from threading import current_thread, Event as ThreadEvent, Lock, main_thread, Thread
+import time
+import zlib
 
 import click
 from regta_period import AbstractPeriod
 
-from .enums import JobTypes
-from .logging import JobLoggerAdapter, make_default_logger
+from . import fire_times
+from .enums import JobTypes, MisfirePolicies, OverlapPolicies
+from .exceptions import ExecutionTimeout, JobOptionCollision, TooManyAbandonedExecutions
+from .limits import ConcurrencyLimiter
+from .logging import JobLoggerAdapter, make_default_logger, ProcessLogListener
+from .retries import RetryPolicy
+
+if TYPE_CHECKING:  # They're only needed when regta runs with metrics or a state store
+    from .metrics import JobMetrics
+    from .state import AbstractStateStore
+
+TERMINATE_TIMEOUT = 1.0
+"""Seconds between SIGTERM and SIGKILL for processes which weren't stopped in time."""
+MAX_ABANDONED_EXECUTIONS = 4
+"""Max amount of timed out executions of a thread job which may be left running at once."""
+
+_NEXT_FIRE_TIME, _LAST_DURATION = range(2)
+
+
+class _Interruption(BaseException):
+    """Raised by SIGALRM inside the function of a process job. It isn't an
+    :exc:`Exception`, so ``except Exception`` in the function doesn't swallow
+    the timeout.
+    """
 
 
 class AbstractJob(ABC):
@@ -55,7 +87,7 @@ class AbstractJob(ABC):
         raise NotImplementedError
 
 
-class BaseJob(AbstractJob):
+class BaseJob(AbstractJob):  # pylint: disable=too-many-instance-attributes
     """Base job class which implements common logic."""
 
     interval: Union[timedelta, AbstractPeriod]
@@ -72,6 +104,66 @@ class BaseJob(AbstractJob):
     """Args will be passed into :attr:`.func`."""
     kwargs: dict = {}
     """Key-word args will be passed into :attr:`.func`."""
+    anchored: bool = False
+    """Compute execution times of :class:`datetime.timedelta` intervals as
+    ``start + k * interval`` on the monotonic clock, so execution time and
+    wake-up latency don't accumulate.
+    """
+    misfire_policy: MisfirePolicies = MisfirePolicies.COALESCE
+    """What to do if several execution times have passed while the job was
+    running (in the anchored mode) or while regta was stopped (with a state
+    store): skip them, execute once for all of them or execute for each one.
+    """
+    tags: Iterable[str] = ()
+    """Tags of the job. The scheduler may limit the amount of simultaneously
+    running executions of jobs with a tag, see :class:`regta.limits.ConcurrencyLimiter`.
+    """
+    priority: int = 0
+    """When more executions are due than there are free slots (concurrency
+    limits or pools' workers), executions of jobs with higher priority are
+    started first.
+    """
+    max_lateness: Union[float, None] = None
+    """Max seconds an execution may be late. Later executions are skipped, so
+    best-effort jobs give way to others under overload. There is no limit by
+    default.
+    """
+    spread: Union[float, None] = None
+    """Window in seconds to shift execution times within, so jobs with equal
+    intervals don't fire at the same moment. The shift is derived from a hash
+    of the job's name, so it's the same on every start and the interval
+    itself isn't changed. The scheduler's ``spread`` is used by default.
+    """
+    misfire_grace_time: Union[float, None] = None
+    """Max age in seconds of execution times missed while regta was stopped
+    which are still executed on start. Older ones are skipped. There is no
+    limit by default.
+    """
+    timeout: Union[float, None] = None
+    """Max seconds of a single execution. An execution which exceeds it is
+    cancelled (async jobs), abandoned (thread jobs) or interrupted (process
+    jobs, their worker is killed and respawned in the process pool mode).
+    """
+    retry: Union[RetryPolicy, None] = None
+    """Policy of retries of failed executions. Failed executions aren't
+    retried by default. Retries are extra executions which don't shift the
+    regular ones. Like them, retries are skipped while the job is paused and
+    don't overlap running executions beyond what the job allows.
+    """
+    _metrics: Union['JobMetrics', None] = None
+    _next_fire_time: Union[float, None] = None
+    _anchor: Union[float, None] = None
+    _fire_index = 0
+    _state_store: Union['AbstractStateStore', None] = None
+    _limiter: Union[ConcurrencyLimiter, None] = None
+    # Executions missed while regta was stopped which are still to be caught up
+    _missed_runs = 0
+    _restored_delay: Union[float, None] = None
+    # Whether the upcoming execution catches up a missed one
+    _catching_up = False
+    _paused: Union[ThreadEvent, ProcessEventObject]
+    # The next fire time and the last duration, NaN if they're unknown
+    _status: MutableSequence[float]
 
     def __init__(
             self,
@@ -90,17 +182,216 @@ class BaseJob(AbstractJob):
             styled_job_name=self.get_styled_job_name(),
             use_ansi=use_ansi,
         )
+        self._paused = ThreadEvent()
+        self._status = [math.nan, math.nan]
+
+    @property
+    def is_paused(self) -> bool:
+        """Whether executions of the job are skipped, see :meth:`pause`."""
+        return self._paused.is_set()
+
+    def pause(self):
+        """Skip executions of the job until :meth:`resume` is called. Execution
+        times keep going on, so the job is resumed at its usual schedule. A
+        running execution isn't interrupted.
+        """
+        self._paused.set()
 
-    def _get_seconds_till_to_execute(self) -> float:
+    def resume(self):
+        """Resume executions of the job paused by :meth:`pause`."""
+        self._paused.clear()
+
+    @property
+    def next_fire_time(self) -> Union[float, None]:
+        """Moment of the next scheduled execution as a UNIX timestamp or
+        None if the job isn't scheduled yet.
+        """
+        value = self._status[_NEXT_FIRE_TIME]
+        return None if math.isnan(value) else value
+
+    @property
+    def last_duration(self) -> Union[float, None]:
+        """Seconds the last finished execution took or None if the job
+        wasn't executed yet.
+        """
+        value = self._status[_LAST_DURATION]
+        return None if math.isnan(value) else value
+
+    def _share_status(self):
+        """Keep :attr:`next_fire_time` and :attr:`last_duration` in shared
+        memory, so they're seen from the parent process when the job is run
+        in another one. Must be called before the process is started.
+        """
+        self._status = RawArray('d', self._status)
+
+    def _on_success(self, result):
+        self.logger.info(result)
+
+    def _on_failure(self, error):
+        self.logger.exception(error, exc_info=error)
+
+    def _on_timeout(self, action):
+        self.logger.error("Execution timeout (%ss) is exceeded, %s", self.timeout, action)
+
+    def _on_admitted(self, waited: float):
+        if waited:
+            self.logger.info("Execution waited %.3gs for a concurrency slot", waited)  # type: ignore[union-attr]
+            if self._metrics is not None:
+                self._metrics.execution_waited(waited)
+
+    def _should_shed(self, fire_time: Union[float, None] = None) -> bool:
+        """Check if the execution is later than :attr:`max_lateness`.
+
+        Args:
+            fire_time: Moment the execution was scheduled to. The current
+                scheduled moment is used by default.
+        """
+        fire_time = fire_time or self._next_fire_time
+        if self.max_lateness is None or fire_time is None:
+            return False
+        lateness = time.time() - fire_time
+        if lateness <= self.max_lateness:
+            return False
+        self.logger.warning("Execution is shed, it's %.3gs late", lateness)  # type: ignore[union-attr]
+        return True
+
+    def _on_rejected(self):
+        self.logger.warning(  # type: ignore[union-attr]
+            "Execution is skipped, the queue of executions waiting for concurrency slots is full",
+        )
+
+    def _get_retry_delay(self, error: BaseException, attempt: int) -> Union[float, None]:
+        """Get seconds before the next attempt of the failed execution or
+        None if it mustn't be retried.
+        """
+        if self.retry is None or not self.retry.should_retry(error, attempt):
+            return None
+        delay = self.retry.get_delay(attempt)
+        self.logger.warning(  # type: ignore[union-attr]
+            "Attempt %s of %s is failed, the next one in %.3gs", attempt, self.retry.attempts, delay,
+        )
+        return delay
+
+    def _get_spread_offset(self) -> float:
+        """Deterministic shift of execution times within :attr:`spread`."""
+        if not self.spread:
+            return 0.0
+        return zlib.crc32(self.get_plain_job_name().encode()) / 2 ** 32 * self.spread
+
+    def __get_next_period_fire_time(self, moment: float) -> float:
+        offset = self._get_spread_offset()
+        return fire_times.engine.get_next(self.interval, moment - offset) + offset  # type: ignore[arg-type]
+
+    def __count_missed(self, last_fire_time: float, oldest: float, now: float) -> int:
+        if isinstance(self.interval, timedelta):
+            interval = self.interval.total_seconds()
+            passed = math.floor((now - last_fire_time) / interval)
+            return max(0, passed - max(1, math.ceil((oldest - last_fire_time) / interval)) + 1)
+        missed = 0
+        moment = self.__get_next_period_fire_time(max(last_fire_time, oldest))
+        while moment <= now:
+            missed += 1
+            moment = self.__get_next_period_fire_time(moment)
+        return missed
+
+    def _restore_state(self, last_fire_time: float):
+        """Plan executions missed while regta was stopped according to
+        :attr:`misfire_policy` and :attr:`misfire_grace_time`, and continue
+        :class:`datetime.timedelta` intervals from the last fire time.
+
+        Args:
+            last_fire_time: Moment of the last successful execution as a UNIX timestamp.
+        """
+        now = time.time()
+        oldest = last_fire_time if self.misfire_grace_time is None else now - self.misfire_grace_time
+        missed = self.__count_missed(last_fire_time, oldest, now)
+        if self.misfire_policy is MisfirePolicies.ALL:
+            runs = missed
+        elif self.misfire_policy is MisfirePolicies.COALESCE:
+            runs = min(missed, 1)
+        else:
+            runs = 0
+        if missed:
+            self.logger.info(  # type: ignore[union-attr]
+                "%s execution(s) were missed while regta was stopped, %s will be executed now", missed, runs,
+            )
+
+        self._missed_runs = runs
         if isinstance(self.interval, timedelta):
-            return self.interval.total_seconds()
-        if isinstance(self.interval, AbstractPeriod):
-            if self.interval.is_timezone_in_use:
-                current_moment = datetime.now(timezone.utc)
+            interval = self.interval.total_seconds()
+            next_fire_time = last_fire_time + (math.floor((now - last_fire_time) / interval) + 1) * interval
+            if self.anchored:
+                self._anchor = time.monotonic() + next_fire_time - now - interval
+            elif not runs:
+                self._restored_delay = next_fire_time - now
+
+    def _save_state(self, fire_time: Union[float, None] = None):
+        """Save the last fire time. A failed store (e.g. a full disk) is only
+        logged, so it doesn't stop the job.
+        """
+        if self._state_store is None:
+            return
+        try:
+            self._state_store.save(self.get_plain_job_name(), fire_time or self._next_fire_time or time.time())
+        except Exception as e:  # pylint: disable=broad-except
+            self.logger.error("Can't save the last fire time: %r", e)  # type: ignore[union-attr]
+
+    def __get_seconds_till_anchored(self, interval: float) -> float:
+        now = time.monotonic()
+        if self._anchor is None:
+            self._anchor = now + self._get_spread_offset()
+        self._fire_index += 1
+        if self._anchor + self._fire_index * interval < now:
+            passed = math.floor((now - self._anchor) / interval)
+            if self.misfire_policy is MisfirePolicies.SKIP:
+                self._fire_index = passed + 1
+            elif self.misfire_policy is MisfirePolicies.COALESCE:
+                self._fire_index = passed
             else:
-                current_moment = datetime.utcnow()
-            return self.interval.get_interval(current_moment).total_seconds()
-        raise ValueError(f"Regta doesn't support '{self.interval.__class__.__name__}' type for interval.")
+                self._catching_up = True
+        return max(0.0, self._anchor + self._fire_index * interval - now)
+
+    def _get_seconds_till_to_execute(self) -> float:
+        now = time.time()
+        self._catching_up = False
+        if self._missed_runs:
+            self._missed_runs -= 1
+            self._catching_up = True
+            seconds = 0.0
+        elif self._restored_delay is not None:
+            seconds, self._restored_delay = self._restored_delay, None
+        elif isinstance(self.interval, timedelta) and self.anchored:
+            seconds = self.__get_seconds_till_anchored(self.interval.total_seconds())
+        elif isinstance(self.interval, timedelta):
+            seconds = self.interval.total_seconds()
+            if self._next_fire_time is None:
+                seconds += self._get_spread_offset()
+        elif isinstance(self.interval, AbstractPeriod):
+            seconds = self.__get_next_period_fire_time(now) - now
+        else:
+            raise ValueError(f"Regta doesn't support '{self.interval.__class__.__name__}' type for interval.")
+        self._next_fire_time = self._status[_NEXT_FIRE_TIME] = now + seconds
+        return seconds
+
+    def _execution_started(self, fire_time: Union[float, None] = None) -> float:
+        """Count the execution in metrics if they're enabled.
+
+        Args:
+            fire_time: Moment the execution was scheduled to. The current
+                scheduled moment is used by default.
+
+        Return:
+            Start moment which must be passed into :meth:`_execution_finished`.
+        """
+        if self._metrics is None:
+            return time.perf_counter()
+        fire_time = fire_time or self._next_fire_time
+        return self._metrics.execution_started(None if fire_time is None else time.time() - fire_time)
+
+    def _execution_finished(self, started_at: float, failed: bool = False):
+        self._status[_LAST_DURATION] = time.perf_counter() - started_at
+        if self._metrics is not None:
+            self._metrics.execution_finished(started_at, failed=failed)
 
     @abstractmethod
     def execute(self):
@@ -132,9 +423,23 @@ class BaseSyncJob(BaseJob):
     .. autoattribute:: logger
     .. autoattribute:: args
     .. autoattribute:: kwargs
+    .. autoattribute:: anchored
+    .. autoattribute:: misfire_policy
+    .. autoattribute:: misfire_grace_time
+    .. autoattribute:: spread
+    .. autoattribute:: tags
+    .. autoattribute:: priority
+    .. autoattribute:: max_lateness
+    .. autoattribute:: timeout
+    .. autoattribute:: retry
     """
 
     _blocker_class: Union[Type[ThreadEvent], Callable[..., ProcessEventObject]]
+    _timeout_action: str
+    # Number of the attempt of the upcoming execution
+    _attempt = 1
+    # The regular execution time which is kept while retries are executed before it
+    _regular_fire_time: Union[float, None] = None
 
     def __init__(
             self,
@@ -145,13 +450,86 @@ class BaseSyncJob(BaseJob):
     ):
         super().__init__(*args, logger=logger, use_ansi=use_ansi, **kwargs)
         self._blocker = self._blocker_class()
+        # Process jobs check it in their own processes
+        self._paused = self._blocker_class()
+        # Heap of moments and attempts of planned retries
+        self._retries: List[Tuple[float, int]] = []
+
+    def __plan_retry(self, error: BaseException):
+        """The retry is executed between regular executions, see
+        :meth:`_get_seconds_till_to_execute`.
+        """
+        delay = self._get_retry_delay(error, self._attempt)
+        if delay is not None:
+            heapq.heappush(self._retries, (time.time() + delay, self._attempt + 1))
+
+    def _get_seconds_till_to_execute(self) -> float:
+        """Take the nearest of the planned retries and the regular execution.
+        Sync executions don't overlap, so the next one waits for the current
+        one to finish.
+        """
+        seconds: Union[float, None] = None
+        if self._regular_fire_time is None:
+            seconds = super()._get_seconds_till_to_execute()
+            self._regular_fire_time = self._status[_NEXT_FIRE_TIME]
+        if self._retries and self._retries[0][0] < self._regular_fire_time:
+            fire_time, self._attempt = heapq.heappop(self._retries)
+        else:
+            fire_time, self._regular_fire_time, self._attempt = self._regular_fire_time, None, 1
+            if seconds is not None:
+                return seconds
+        self._next_fire_time = self._status[_NEXT_FIRE_TIME] = fire_time
+        return max(0.0, fire_time - time.time())
+
+    def _on_success(self, result):
+        super()._on_success(result)
+        self._save_state()
+
+    def _on_failure(self, error):
+        super()._on_failure(error)
+        self.__plan_retry(error)
+
+    def _on_timeout(self, action):
+        super()._on_timeout(action)
+        self.__plan_retry(ExecutionTimeout(self.timeout))  # type: ignore[arg-type]
+
+    def _call_func(self):
+        return self.func(*self.args, **self.kwargs)
 
     def execute(self):
+        if self._limiter is None:
+            if not self._should_shed():
+                self.__execute()
+            return
+        waited = self._limiter.acquire(self.tags, priority=self.priority, fire_time=self._next_fire_time)
+        if waited is None:
+            if not self._limiter.closed:
+                self._on_rejected()
+            return
+        try:
+            if not self._should_shed():
+                self._on_admitted(waited)
+                self.__execute()
+        finally:
+            self._limiter.release(self.tags)
+
+    def __execute(self):
+        started_at = self._execution_started()
         try:
-            res = self.func(*self.args, **self.kwargs)
-            self.logger.info(res)
+            res = self._call_func() if self.timeout is None else self._call_func_with_timeout()
+        except ExecutionTimeout:
+            self._execution_finished(started_at, failed=True)
+            self._on_timeout(self._timeout_action)
         except Exception as e:  # pylint: disable=broad-except
-            self.logger.exception(e)
+            self._execution_finished(started_at, failed=True)
+            self._on_failure(e)
+        else:
+            self._execution_finished(started_at)
+            self._on_success(res)
+
+    @abstractmethod
+    def _call_func_with_timeout(self):
+        raise NotImplementedError
 
     def __block(self):
         try:
@@ -162,7 +540,12 @@ class BaseSyncJob(BaseJob):
 
     def run(self):
         while not self.__block():
-            self.execute()
+            if not self.is_paused:
+                self.execute()
+
+    def request_stop(self):
+        """Ask the job to stop after its current execution without waiting for it."""
+        self._blocker.set()
 
     @abstractmethod
     def stop(self):
@@ -177,11 +560,22 @@ class ProcessJob(BaseSyncJob, Process):
     .. autoattribute:: logger
     .. autoattribute:: args
     .. autoattribute:: kwargs
+    .. autoattribute:: anchored
+    .. autoattribute:: misfire_policy
+    .. autoattribute:: misfire_grace_time
+    .. autoattribute:: spread
+    .. autoattribute:: tags
+    .. autoattribute:: priority
+    .. autoattribute:: max_lateness
+    .. autoattribute:: timeout
+    .. autoattribute:: retry
     .. automethod:: execute
     .. automethod:: run
     """
 
     _blocker_class = ProcessEventFabric
+    _timeout_action = "the execution is interrupted"
+    _log_listener: Union[ProcessLogListener, None] = None
 
     def __init__(
             self,
@@ -192,14 +586,64 @@ class ProcessJob(BaseSyncJob, Process):
     ):
         Process.__init__(self)
         super().__init__(*args, logger=logger, use_ansi=use_ansi, **kwargs)
+        # Its own process schedules and executes it
+        self._share_status()
 
-    def stop(self):
-        """Stops and terminates job's process. It will be called by the scheduler
+    def _aggregate_logs(self, listener: ProcessLogListener):
+        """Send records of the job's logger to the listener in the parent
+        process. Must be called before the process is started.
+        """
+        listener.register(self.logger)  # type: ignore[arg-type]
+        self._log_listener = listener
+
+    def _redirect_logs(self):
+        if self._log_listener is not None:
+            self._log_listener.redirect(self.logger)
+
+    def _call_func_with_timeout(self):
+        """Interrupt the function by SIGALRM. Signals are handled only in the
+        main thread, so elsewhere the function is called without a timeout.
+        """
+        if not hasattr(signal, 'setitimer') or current_thread() is not main_thread():
+            return self._call_func()
+
+        def interrupt(sig, frame):  # pylint: disable=unused-argument
+            raise _Interruption
+
+        original_handler = signal.signal(signal.SIGALRM, interrupt)
+        try:
+            # The alarm may go off right after the function is returned
+            try:
+                signal.setitimer(signal.ITIMER_REAL, self.timeout)  # type: ignore[arg-type]
+                return self._call_func()
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, original_handler)
+        except _Interruption:
+            raise ExecutionTimeout(self.timeout) from None  # type: ignore[arg-type]
+
+    def run(self):
+        self._redirect_logs()
+        super().run()
+
+    def stop(self, timeout: Union[float, None] = None):
+        """Stops job's process. It will be called by the scheduler
         when regta gets a stop signal.
+
+        Args:
+            timeout:
+                If the current execution isn't finished in time, the process
+                gets SIGTERM and then SIGKILL after :data:`TERMINATE_TIMEOUT`.
+                Waits endlessly by default.
         """
-        self._blocker.set()
-        self.join()
-        self.terminate()
+        self.request_stop()
+        self.join(timeout)
+        if self.is_alive():
+            self.terminate()
+            self.join(TERMINATE_TIMEOUT)
+        if self.is_alive():
+            self.kill()
+            self.join()
 
 
 class ThreadJob(BaseSyncJob, Thread):
@@ -210,11 +654,21 @@ class ThreadJob(BaseSyncJob, Thread):
     .. autoattribute:: logger
     .. autoattribute:: args
     .. autoattribute:: kwargs
+    .. autoattribute:: anchored
+    .. autoattribute:: misfire_policy
+    .. autoattribute:: misfire_grace_time
+    .. autoattribute:: spread
+    .. autoattribute:: tags
+    .. autoattribute:: priority
+    .. autoattribute:: max_lateness
+    .. autoattribute:: timeout
+    .. autoattribute:: retry
     .. automethod:: execute
     .. automethod:: run
     """
 
     _blocker_class = ThreadEvent
+    _timeout_action = "the execution is abandoned"
 
     def __init__(
             self,
@@ -225,50 +679,251 @@ class ThreadJob(BaseSyncJob, Thread):
     ):
         Thread.__init__(self)
         super().__init__(*args, logger=logger, use_ansi=use_ansi, **kwargs)
+        self._abandoned: List[Thread] = []
+        self._abandoned_lock = Lock()
+
+    def _call_func_with_timeout(self):
+        """Call the function in a helper thread. A thread can't be
+        interrupted, so if it exceeds the timeout it's left running on its
+        own and the job's thread (or the pool's worker) is released.
+
+        Once :data:`MAX_ABANDONED_EXECUTIONS` abandoned executions are still
+        running, the next executions are skipped as failed instead of starting
+        more helper threads.
+        """
+        with self._abandoned_lock:
+            self._abandoned = [thread for thread in self._abandoned if thread.is_alive()]
+            if len(self._abandoned) >= MAX_ABANDONED_EXECUTIONS:
+                raise TooManyAbandonedExecutions(len(self._abandoned))
+
+        future = Future()
+
+        def call():
+            try:
+                future.set_result(self._call_func())
+            except BaseException as e:  # pylint: disable=broad-except
+                future.set_exception(e)
+
+        thread = Thread(target=call, name=f'{self.name}-execution', daemon=True)
+        thread.start()
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            with self._abandoned_lock:
+                self._abandoned.append(thread)
+            raise ExecutionTimeout(self.timeout) from None  # type: ignore[arg-type]
 
     def stop(self):
         """Stops job's thread. It will be called by the scheduler
         when regta gets a stop signal.
         """
-        self._blocker.set()
+        self.request_stop()
         self.join()
 
 
 class AsyncJob(BaseJob):
     """Async job class. Will be executed in an event loop.
 
+    Every execution is started as a separate task, so a slow execution
+    doesn't shift the next ones. If the job is due while
+    :attr:`.max_instances` executions are still running, the
+    :attr:`.overlap_policy` is applied.
+
     .. autoattribute:: interval
     .. autoattribute:: logger
     .. autoattribute:: args
     .. autoattribute:: kwargs
+    .. autoattribute:: anchored
+    .. autoattribute:: misfire_policy
+    .. autoattribute:: misfire_grace_time
+    .. autoattribute:: spread
+    .. autoattribute:: tags
+    .. autoattribute:: priority
+    .. autoattribute:: max_lateness
+    .. autoattribute:: timeout
+    .. autoattribute:: retry
+    .. autoattribute:: max_instances
+    .. autoattribute:: overlap_policy
+    .. autoattribute:: max_queued
     """
 
     func: Callable[..., Awaitable[Union[str, None]]]  # type: ignore
     """The function on which the job will be based. Must be rewritten or passed.
     It'll be called every :attr:`.interval`.
     """
+    max_instances: int = 1
+    """Max amount of simultaneously running executions of the job."""
+    overlap_policy: OverlapPolicies = OverlapPolicies.SKIP
+    """What to do with an execution when :attr:`.max_instances` executions
+    are already running: skip it or queue it until one of them is finished.
+    """
+    max_queued: int = 1
+    """Max amount of queued executions for :attr:`OverlapPolicies.QUEUE`.
+    Executions above the limit are skipped.
+    """
 
-    async def execute(self):
+    def __init__(
+            self,
+            *args,
+            logger: Union[Logger, None] = None,
+            use_ansi: bool = True,
+            **kwargs,
+    ):
+        super().__init__(*args, logger=logger, use_ansi=use_ansi, **kwargs)
+        self._executions: Set[asyncio.Future] = set()
+        # Scheduled moments and attempts of queued executions
+        self._queued: Deque[Tuple[Union[float, None], int]] = deque()
+        # Retries of failed executions which are waiting for their time
+        self._retries: List[asyncio.TimerHandle] = []
+
+    async def _execute(self, fire_time: Union[float, None] = None, attempt: int = 1):
+        if self._limiter is None:
+            if not self._should_shed(fire_time):
+                await self.__execute(fire_time, attempt)
+            return
+        waited = await self._limiter.acquire_async(self.tags, priority=self.priority, fire_time=fire_time)
+        if waited is None:
+            if not self._limiter.closed:
+                self._on_rejected()
+            return
+        try:
+            if not self._should_shed(fire_time):
+                self._on_admitted(waited)
+                await self.__execute(fire_time, attempt)
+        finally:
+            self._limiter.release(self.tags)
+
+    async def __execute(self, fire_time: Union[float, None], attempt: int):
+        started_at = self._execution_started(fire_time)
         try:
-            res = await self.func(*self.args, **self.kwargs)
-            self.logger.info(res)
+            if self.timeout is None:
+                res = await self.func(*self.args, **self.kwargs)
+            else:
+                res = await asyncio.wait_for(self.func(*self.args, **self.kwargs), self.timeout)
+        except asyncio.CancelledError:
+            self._execution_finished(started_at, failed=True)
+            raise
+        except asyncio.TimeoutError:
+            self._execution_finished(started_at, failed=True)
+            self._on_timeout("the execution is cancelled")
+            self.__plan_retry(ExecutionTimeout(self.timeout), attempt)  # type: ignore[arg-type]
         except Exception as e:  # pylint: disable=broad-except
-            self.logger.exception(e)
+            self._execution_finished(started_at, failed=True)
+            self._on_failure(e)
+            self.__plan_retry(e, attempt)
+        else:
+            self._execution_finished(started_at)
+            self._on_success(res)
+            self._save_state(fire_time)
+
+    async def execute(self):
+        await self._execute()
+
+    def __plan_retry(self, error: BaseException, attempt: int):
+        delay = self._get_retry_delay(error, attempt)
+        if delay is not None:
+            loop = asyncio.get_event_loop()
+            self._retries = [retry for retry in self._retries if retry.when() > loop.time()]
+            self._retries.append(loop.call_later(delay, self.__retry, time.time() + delay, attempt + 1))
+
+    def __retry(self, fire_time: float, attempt: int):
+        if not self.is_paused:
+            self.__admit(fire_time, attempt)
+
+    def __start_execution(self, fire_time: Union[float, None], attempt: int = 1):
+        execution = asyncio.ensure_future(self._execute(fire_time, attempt))
+        self._executions.add(execution)
+        execution.add_done_callback(self.__on_execution_done)
+
+    def __on_execution_done(self, execution: asyncio.Future):
+        self._executions.discard(execution)
+        if self._queued and len(self._executions) < self.max_instances:
+            self.__start_execution(*self._queued.popleft())
+
+    def _trigger(self):
+        """Start an extra execution right now regardless of the schedule,
+        :attr:`.max_instances` and pausing. Must be called inside a running
+        event loop.
+        """
+        self.__start_execution(time.time())
+
+    def _dispatch(self):
+        """Start an execution in a separate task according to :attr:`.overlap_policy`.
+        Executions catching up missed ones are always queued, so every one of
+        them is executed. Must be called inside a running event loop. Does
+        nothing while the job is paused.
+        """
+        if self.is_paused:
+            return
+        # The next execution is scheduled before the task is started
+        self.__admit(self._next_fire_time, catching_up=self._catching_up)
+
+    def __admit(self, fire_time: Union[float, None], attempt: int = 1, catching_up: bool = False):
+        if len(self._executions) < self.max_instances:
+            self.__start_execution(fire_time, attempt)
+        elif catching_up or (self.overlap_policy is OverlapPolicies.QUEUE and len(self._queued) < self.max_queued):
+            self._queued.append((fire_time, attempt))
+        else:
+            self.logger.warning(  # type: ignore[union-attr]
+                "Execution is skipped, %s instance(s) are still running", len(self._executions),
+            )
 
     async def run(self):
         while True:
             await asyncio.sleep(self._get_seconds_till_to_execute())
-            await self.execute()
+            self._dispatch()
 
-    async def stop(self): pass
+    async def stop(self):
+        """Cancel running, queued and retried executions."""
+        self._queued.clear()
+        for retry in self._retries:
+            retry.cancel()
+        self._retries.clear()
+        executions = list(self._executions)
+        for execution in executions:
+            execution.cancel()
+        await asyncio.gather(*executions, return_exceptions=True)
 
 
 JobHint = Union[AsyncJob, ThreadJob, ProcessJob]
 
 
-def _make_decorator(_class: Type[JobHint]):
+_common_options = (
+    'anchored',
+    'misfire_policy',
+    'misfire_grace_time',
+    'spread',
+    'timeout',
+    'retry',
+    'tags',
+    'priority',
+    'max_lateness',
+)
+
+
+def _get_arguments_names(func: Callable) -> Set[str]:
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):  # Signatures of some builtins aren't available
+        return set()
+    return {
+        parameter.name
+        for parameter in parameters
+        if parameter.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    }
+
+
+def _make_decorator(_class: Type[JobHint], options: Iterable[str] = ()):
+    options = (*_common_options, *options)
+
     def decorator(interval: Union[timedelta, AbstractPeriod], *args, **kwargs):
+        attributes = {name: kwargs.pop(name) for name in options if name in kwargs}
+
         def wrapper(func: Callable):
+            # An option named like an argument of the function is ambiguous
+            collisions = _get_arguments_names(func).intersection(attributes)
+            if collisions:
+                raise JobOptionCollision(min(collisions), func.__name__)
             return type(
                 func.__name__,
                 (_class,),
@@ -278,20 +933,36 @@ def _make_decorator(_class: Type[JobHint]):
                     "interval": interval,
                     "args": args,
                     "kwargs": kwargs,
+                    **attributes,
                 }
             )
         return wrapper
     return decorator
 
 
-async_job = _make_decorator(AsyncJob)
+async_job = _make_decorator(AsyncJob, options=('max_instances', 'overlap_policy', 'max_queued'))
 async_job.__doc__ = (
     """Make :class:`AsyncJob` from async function.
 
     Args:
         interval: Interval between every call.
         *args: Will be passed into the function.
+        anchored: See :attr:`AsyncJob.anchored`.
+        misfire_policy: See :attr:`AsyncJob.misfire_policy`.
+        misfire_grace_time: See :attr:`AsyncJob.misfire_grace_time`.
+        spread: See :attr:`AsyncJob.spread`.
+        timeout: See :attr:`AsyncJob.timeout`.
+        retry: See :attr:`AsyncJob.retry`.
+        tags: See :attr:`AsyncJob.tags`.
+        priority: See :attr:`AsyncJob.priority`.
+        max_lateness: See :attr:`AsyncJob.max_lateness`.
+        max_instances: See :attr:`AsyncJob.max_instances`.
+        overlap_policy: See :attr:`AsyncJob.overlap_policy`.
+        max_queued: See :attr:`AsyncJob.max_queued`.
         **kwargs: Will be passed into the function.
+
+    Raises:
+        JobOptionCollision: If the function has an argument named like one of the options.
     """
 )
 thread_job = _make_decorator(ThreadJob)
@@ -301,7 +972,19 @@ thread_job.__doc__ = (
     Args:
         interval: Interval between every call.
         *args: Will be passed into the function.
+        anchored: See :attr:`ThreadJob.anchored`.
+        misfire_policy: See :attr:`ThreadJob.misfire_policy`.
+        misfire_grace_time: See :attr:`ThreadJob.misfire_grace_time`.
+        spread: See :attr:`ThreadJob.spread`.
+        timeout: See :attr:`ThreadJob.timeout`.
+        retry: See :attr:`ThreadJob.retry`.
+        tags: See :attr:`ThreadJob.tags`.
+        priority: See :attr:`ThreadJob.priority`.
+        max_lateness: See :attr:`ThreadJob.max_lateness`.
         **kwargs: Will be passed into the function.
+
+    Raises:
+        JobOptionCollision: If the function has an argument named like one of the options.
     """
 )
 process_job = _make_decorator(ProcessJob)
@@ -311,7 +994,19 @@ process_job.__doc__ = (
     Args:
         interval: Interval between every call.
         *args: Will be passed into the function.
+        anchored: See :attr:`ProcessJob.anchored`.
+        misfire_policy: See :attr:`ProcessJob.misfire_policy`.
+        misfire_grace_time: See :attr:`ProcessJob.misfire_grace_time`.
+        spread: See :attr:`ProcessJob.spread`.
+        timeout: See :attr:`ProcessJob.timeout`.
+        retry: See :attr:`ProcessJob.retry`.
+        tags: See :attr:`ProcessJob.tags`.
+        priority: See :attr:`ProcessJob.priority`.
+        max_lateness: See :attr:`ProcessJob.max_lateness`.
         **kwargs: Will be passed into the function.
+
+    Raises:
+        JobOptionCollision: If the function has an argument named like one of the options.
     """
 )
 
@@ -0,0 +1,220 @@
+"""Contains the admission control which limits amounts of simultaneously
+running executions of all jobs and of jobs with certain tags.
+
+An execution over the limits waits in a bounded queue. Waiting doesn't block
+the event loop or a pool's worker: the scheduler is called back when a slot
+is released, only jobs started as their own threads block while waiting.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+import asyncio
+from bisect import insort
+from itertools import count
+from threading import Event, Lock
+import time
+
+_Callback = Callable[[Union[float, None]], Any]
+
+
+class _Waiter:
+    __slots__ = ('tags', 'callback', 'since')
+
+    def __init__(self, tags: Tuple[str, ...], callback: _Callback):
+        self.tags = tags
+        self.callback = callback
+        self.since = time.monotonic()
+
+
+# Waiters are sorted by priority, then by scheduled time, then by arrival
+_Entry = Tuple[Tuple[int, float, int], _Waiter]
+
+
+class ConcurrencyLimiter:  # pylint: disable=too-many-instance-attributes
+    """Limits amounts of simultaneously running executions.
+
+    Slots released by finished executions are given to waiting executions
+    first, so a waiting execution isn't overtaken by new ones which need the
+    same slots. Waiting executions are served by priority and then by their
+    scheduled time, so the latest ones go first.
+
+    Args:
+        max_concurrency: Max amount of simultaneously running executions of all jobs.
+        tag_limits: Max amounts of simultaneously running executions of jobs
+            with the tags, see :attr:`regta.jobs.BaseJob.tags`.
+        max_waiting: Max amount of executions waiting for a slot. Executions
+            over it are skipped.
+    """
+
+    def __init__(
+            self,
+            max_concurrency: Union[int, None] = None,
+            tag_limits: Union[Dict[str, int], None] = None,
+            max_waiting: int = 1000,
+    ):
+        self.max_concurrency = max_concurrency
+        self.tag_limits = dict(tag_limits or {})
+        self.max_waiting = max_waiting
+        self.closed = False
+        self._lock = Lock()
+        self._running = 0
+        self._running_by_tag: Dict[str, int] = dict.fromkeys(self.tag_limits, 0)
+        self._waiters: List[_Entry] = []
+        self._counter = count()
+
+    def __get_limited_tags(self, tags: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(tag for tag in tags if tag in self.tag_limits)
+
+    def __fits(self, tags: Tuple[str, ...]) -> bool:
+        if self.max_concurrency is not None and self._running >= self.max_concurrency:
+            return False
+        return all(self._running_by_tag[tag] < self.tag_limits[tag] for tag in tags)
+
+    def __take(self, tags: Tuple[str, ...]):
+        self._running += 1
+        for tag in tags:
+            self._running_by_tag[tag] += 1
+
+    def try_acquire(self, tags: Iterable[str] = ()) -> bool:
+        """Take a slot if it's free.
+
+        Args:
+            tags: Tags of the job.
+
+        Return:
+            bool: Whether the slot is taken. It must be released by :meth:`release`.
+        """
+        limited_tags = self.__get_limited_tags(tags)
+        with self._lock:
+            if not self.__fits(limited_tags):
+                return False
+            self.__take(limited_tags)
+            return True
+
+    def wait(
+            self,
+            tags: Iterable[str],
+            callback: _Callback,
+            priority: int = 0,
+            fire_time: Union[float, None] = None,
+    ) -> bool:
+        """Queue the execution until a slot is free. Must be called only if
+        :meth:`try_acquire` failed.
+
+        Args:
+            tags: Tags of the job.
+            priority: Priority of the job, see :attr:`regta.jobs.BaseJob.priority`.
+            fire_time: Moment the execution was scheduled to as a UNIX timestamp. Defaults to now.
+            callback:
+                Will be called with the amount of seconds the execution waited
+                once the slot is taken, or with None if the limiter is closed
+                before that. It's called from the thread which releases the
+                slot, so it must be fast.
+
+        Return:
+            bool: False if the queue is full and the execution must be skipped.
+        """
+        limited_tags = self.__get_limited_tags(tags)
+        with self._lock:
+            if self.closed or len(self._waiters) >= self.max_waiting:
+                return False
+            if not self.__fits(limited_tags):
+                key = (-priority, time.time() if fire_time is None else fire_time, next(self._counter))
+                insort(self._waiters, (key, _Waiter(limited_tags, callback)))
+                return True
+            self.__take(limited_tags)
+        callback(0.0)
+        return True
+
+    def __grant(self) -> List[_Waiter]:
+        granted = []
+        remaining = []
+        for index, entry in enumerate(self._waiters):
+            if self.max_concurrency is not None and self._running >= self.max_concurrency:
+                remaining.extend(self._waiters[index:])
+                break
+            if self.__fits(entry[1].tags):
+                self.__take(entry[1].tags)
+                granted.append(entry[1])
+            else:
+                remaining.append(entry)
+        self._waiters = remaining
+        return granted
+
+    def release(self, tags: Iterable[str] = ()):
+        """Release the slot and give it to a waiting execution."""
+        limited_tags = self.__get_limited_tags(tags)
+        with self._lock:
+            self._running -= 1
+            for tag in limited_tags:
+                self._running_by_tag[tag] -= 1
+            granted = self.__grant()
+        now = time.monotonic()
+        for waiter in granted:
+            waiter.callback(now - waiter.since)
+
+    def acquire(
+            self,
+            tags: Iterable[str] = (),
+            priority: int = 0,
+            fire_time: Union[float, None] = None,
+    ) -> Union[float, None]:
+        """Take a slot, blocking the current thread while waiting. Args are
+        the same as for :meth:`wait`.
+
+        Return:
+            Seconds the execution waited or None if it must be skipped.
+        """
+        tags = tuple(tags)
+        if self.try_acquire(tags):
+            return 0.0
+        acquired = Event()
+        result: List[Union[float, None]] = []
+
+        def callback(waited: Union[float, None]):
+            result.append(waited)
+            acquired.set()
+
+        if not self.wait(tags, callback, priority=priority, fire_time=fire_time):
+            return None
+        acquired.wait()
+        return result[0]
+
+    async def acquire_async(
+            self,
+            tags: Iterable[str] = (),
+            priority: int = 0,
+            fire_time: Union[float, None] = None,
+    ) -> Union[float, None]:
+        """Take a slot without blocking the event loop while waiting. Args are
+        the same as for :meth:`wait`.
+
+        Return:
+            Seconds the execution waited or None if it must be skipped.
+        """
+        tags = tuple(tags)
+        if self.try_acquire(tags):
+            return 0.0
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+
+        def resolve(waited: Union[float, None]):
+            if not future.cancelled():
+                future.set_result(waited)
+            elif waited is not None:
+                self.release(tags)
+
+        def callback(waited: Union[float, None]):
+            loop.call_soon_threadsafe(resolve, waited)
+
+        if not self.wait(tags, callback, priority=priority, fire_time=fire_time):
+            return None
+        return await future
+
+    def close(self):
+        """Skip all waiting executions and don't accept new ones."""
+        with self._lock:
+            self.closed = True
+            waiters, self._waiters = self._waiters, []
+        for _, waiter in waiters:
+            waiter.callback(None)
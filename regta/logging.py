@@ -1,15 +1,32 @@
-from typing import Dict, Union
+from typing import Dict, List, TextIO, Tuple, Union
 
-from logging import Formatter, INFO, Logger, LoggerAdapter, StreamHandler
+import atexit
+import copy
+from logging import Formatter, INFO, Logger, LoggerAdapter, LogRecord, StreamHandler
+from logging.handlers import QueueHandler
+from multiprocessing import get_context
+from multiprocessing.util import Finalize, register_after_fork
+import os
+import pickle
+from queue import Empty, SimpleQueue
 import sys
+from threading import Lock, Thread
+import time
 import traceback
 
 from click import style
 from click.utils import auto_wrap_for_ansi, resolve_color_default, should_strip_ansi, strip_ansi, WIN
 
+from .exceptions import RegtaException, RemoteTraceback
+
 prod_log_format = '%(asctime)s [%(job)s] [%(levelname)s] - %(message)s'
 empty_log_format = '%(message)s'
 
+FLUSH_INTERVAL = 0.1
+"""Max seconds between writing a record and flushing the stream in the queue logging mode."""
+BATCH_SIZE = 1000
+"""Max amount of records which are formatted and written at once in the queue logging mode."""
+
 
 class BorgSingletonMeta(type):
     _instances: Dict[type, object] = {}
@@ -19,6 +36,11 @@ class BorgSingletonMeta(type):
             cls._instances[cls] = super().__call__(*args, **kwargs)
         return cls._instances[cls]
 
+    def forget_instance(cls, instance):
+        """Make the next call create a new instance instead of returning the passed one."""
+        if cls._instances.get(cls) is instance:
+            del cls._instances[cls]
+
 
 class ClickFormatter(Formatter):
     def __init__(self, *args, use_ansi: bool = True, **kwargs):
@@ -28,8 +50,13 @@ class ClickFormatter(Formatter):
     def formatException(self, ei) -> str:
         exc_class, exc_info, exc_traceback = ei
 
+        if isinstance(exc_info.__cause__, RemoteTraceback):
+            tb_lines = exc_info.__cause__.lines
+        else:
+            tb_lines = traceback.format_tb(exc_traceback)
+
         chain = []
-        for line in traceback.format_tb(exc_traceback):
+        for line in tb_lines:
             for split_line in line.split('\n'):
                 if not split_line:
                     continue
@@ -49,20 +76,22 @@ class ClickStreamHandler(StreamHandler, metaclass=BorgSingletonMeta):
         super().__init__(stream=sys.stdout)
         self.use_ansi = use_ansi
 
-    def emit(self, record):
-        try:
-            out = self.format(record) + self.terminator
-            stream = self.stream
+    def _prepare_output(self, out: str) -> Tuple[str, TextIO]:
+        stream = self.stream
 
-            color = resolve_color_default(color=self.use_ansi)
-            if should_strip_ansi(stream, color):
+        color = resolve_color_default(color=self.use_ansi)
+        if should_strip_ansi(stream, color):
+            out = strip_ansi(out)
+        elif WIN:
+            if auto_wrap_for_ansi is not None:
+                stream = auto_wrap_for_ansi(stream)  # type: ignore
+            elif not color:
                 out = strip_ansi(out)
-            elif WIN:
-                if auto_wrap_for_ansi is not None:
-                    stream = auto_wrap_for_ansi(stream)  # type: ignore
-                elif not color:
-                    out = strip_ansi(out)
+        return out, stream
 
+    def emit(self, record):
+        try:
+            out, stream = self._prepare_output(self.format(record) + self.terminator)
             stream.write(out)
             self.flush()
         except RecursionError:
@@ -71,18 +100,250 @@ class ClickStreamHandler(StreamHandler, metaclass=BorgSingletonMeta):
             self.handleError(record)
 
 
+class QueueClickStreamHandler(ClickStreamHandler):
+    """Handler which only puts records into a queue. A single writer thread
+    formats them (including exceptions) and writes them in batches, so jobs
+    neither wait for the stream nor contend on the handler lock.
+
+    The writer is restarted in forked processes and stopped with flushing the
+    rest of the records at the exit. Forking waits for the batch being written,
+    so a child never inherits the stream in the middle of a write.
+    """
+
+    def __init__(self, use_ansi: bool, flush_interval: float = FLUSH_INTERVAL, batch_size: int = BATCH_SIZE):
+        super().__init__(use_ansi=use_ansi)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue: SimpleQueue = SimpleQueue()
+        self._writer: Union[Thread, None] = None
+        self._write_lock = Lock()
+        self.__start_writer()
+        atexit.register(self.close)
+        # Processes started by multiprocessing don't run atexit callbacks and drop finalizers of the parent
+        register_after_fork(self, QueueClickStreamHandler.__finalize_on_exit)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(
+                before=self._write_lock.acquire,
+                after_in_parent=self._write_lock.release,
+                after_in_child=self.__restart_writer,
+            )
+
+    def __start_writer(self):
+        self._writer = Thread(target=self.__write, name='regta-log-writer', daemon=True)
+        self._writer.start()
+
+    def __restart_writer(self):
+        self._write_lock.release()
+        if self._writer is None:  # The handler is closed
+            return
+        self._queue = SimpleQueue()
+        self.__start_writer()
+
+    def __finalize_on_exit(self):
+        Finalize(self, self.close, exitpriority=0)
+
+    def handle(self, record: LogRecord) -> bool:
+        # The lock isn't needed since the queue is thread-safe
+        is_passed = self.filter(record)
+        if is_passed:
+            self.emit(record)
+        return bool(is_passed)
+
+    def emit(self, record: LogRecord):
+        try:
+            # Args may be changed before the record is formatted
+            record.msg = record.getMessage()
+            record.args = None
+            self._queue.put(record)
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+
+    def __get_batch(self, timeout: Union[float, None]) -> List[Union[LogRecord, None]]:
+        batch = [self._queue.get(timeout=timeout)]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def __write_batch(self, records: List[LogRecord]):
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:  # pylint: disable=broad-except
+                self.handleError(record)
+        try:
+            out, stream = self._prepare_output(''.join(lines))
+            stream.write(out)
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(records[-1])
+
+    def __write(self):
+        flushed_at = time.monotonic()
+        is_dirty = False
+        while True:
+            try:
+                batch = self.__get_batch(timeout=self.flush_interval if is_dirty else None)
+            except Empty:
+                batch = []
+            is_stopped = None in batch
+            records = [record for record in batch if record is not None]
+
+            with self._write_lock:
+                if records:
+                    self.__write_batch(records)
+                    is_dirty = True
+                if is_dirty and (is_stopped or not batch or time.monotonic() - flushed_at >= self.flush_interval):
+                    self.flush()
+                    flushed_at = time.monotonic()
+                    is_dirty = False
+            if is_stopped:
+                return
+
+    def close(self):
+        """Write the rest of the records and stop the writer thread. The
+        following constructions make a new handler.
+        """
+        writer, self._writer = self._writer, None
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)
+            writer.join()
+        super().close()
+        type(self).forget_instance(self)
+
+
+class ProcessLogHandler(QueueHandler):
+    """Sends records from a child process to :class:`ProcessLogListener`
+    in the parent process.
+
+    Args:
+        queue: Queue of the listener.
+        key: Key of the parent's logger which must handle the records.
+    """
+
+    def __init__(self, queue, key: int):
+        super().__init__(queue)
+        self.key = key
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and record.exc_info[1] is None:
+            # logger.exception() called outside of an except block
+            record.exc_info = None
+        if record.exc_info:
+            _, error, exc_traceback = record.exc_info
+            try:
+                pickle.loads(pickle.dumps(error))
+            except Exception:  # pylint: disable=broad-except
+                error = RegtaException(f"{error.__class__.__name__}: {error}")
+            # Tracebacks can't be pickled, so only their lines are passed
+            record.exc_info = (error.__class__, error, None)  # type: ignore[assignment]
+            record.remote_traceback = traceback.format_tb(exc_traceback)
+        return record
+
+    def enqueue(self, record: LogRecord):
+        self.queue.put_nowait((self.key, record))
+
+
+class ProcessLogListener(Thread):
+    """Receives records from processes and passes them to the original
+    loggers in the parent process, so all records are written by the same
+    handlers one by one.
+
+    Loggers must be registered before processes are forked. Then a child
+    process calls :meth:`redirect` to send records of the logger to the
+    parent instead of handling them.
+    """
+
+    _loggers: List[Logger]
+    _keys: Dict[int, int]
+
+    def __init__(self):
+        super().__init__(name='regta-log-listener', daemon=True)
+        self.queue = get_context('fork').Queue()
+        self._loggers = []
+        self._keys = {}
+
+    @staticmethod
+    def __get_innermost_adapter(adapter: LoggerAdapter) -> LoggerAdapter:
+        while isinstance(adapter.logger, LoggerAdapter):
+            adapter = adapter.logger
+        return adapter
+
+    def register(self, adapter: LoggerAdapter):
+        """Register the logger wrapped by the adapter in the parent process."""
+        logger = self.__get_innermost_adapter(adapter).logger
+        if id(logger) not in self._keys:
+            self._keys[id(logger)] = len(self._loggers)
+            self._loggers.append(logger)
+
+    def redirect(self, adapter: LoggerAdapter):
+        """Replace the logger wrapped by the adapter with one which sends
+        records to the parent process. Must be called in a child process.
+        """
+        adapter = self.__get_innermost_adapter(adapter)
+        key = self._keys.get(id(adapter.logger))
+        if key is None:
+            return
+        logger = Logger(adapter.logger.name, level=adapter.logger.getEffectiveLevel())
+        logger.propagate = False
+        logger.addHandler(ProcessLogHandler(self.queue, key))
+        adapter.logger = logger
+
+    def run(self):
+        while True:
+            try:
+                message = self.queue.get()
+            except Exception:  # pylint: disable=broad-except
+                continue
+            if message is None:
+                return
+            key, record = message
+            try:
+                if record.exc_info and record.exc_info[1] is not None:
+                    record.exc_info[1].__cause__ = RemoteTraceback(record.remote_traceback)
+                self._loggers[key].handle(record)
+            except Exception:  # pylint: disable=broad-except
+                # A broken record mustn't stop records of all processes
+                traceback.print_exc()
+
+    def stop(self):
+        """Handle the rest of the records and stop the thread."""
+        self.queue.put(None)
+        self.join()
+        self.queue.close()
+
+
 class DefaultLogger(Logger, metaclass=BorgSingletonMeta):
     pass
 
 
-def make_default_logger(use_ansi: bool, fmt: str = prod_log_format) -> DefaultLogger:
+def make_default_logger(use_ansi: bool, fmt: str = prod_log_format, use_queue: bool = False) -> DefaultLogger:
+    """Make the logger which writes into standard output.
+
+    Args:
+        use_ansi: Enable / Disable ANSI colors.
+        fmt: Log format.
+        use_queue: Write records from a separate thread, see
+            :class:`QueueClickStreamHandler`. Once enabled, it's used by all
+            following calls.
+    """
+    logger = DefaultLogger(__name__, level=INFO)
+    use_queue = use_queue or any(isinstance(handler, QueueClickStreamHandler) for handler in logger.handlers)
+
     formatter = ClickFormatter(fmt, use_ansi=use_ansi)
 
-    handler = ClickStreamHandler(use_ansi=use_ansi)
+    handler = (QueueClickStreamHandler if use_queue else ClickStreamHandler)(use_ansi=use_ansi)
     handler.setLevel(INFO)
     handler.setFormatter(formatter)
 
-    logger = DefaultLogger(__name__, level=INFO)
+    for old_handler in list(logger.handlers):
+        if isinstance(old_handler, ClickStreamHandler) and old_handler is not handler:
+            logger.removeHandler(old_handler)
     logger.addHandler(handler)
     return logger
 
@@ -103,3 +364,13 @@ class JobLoggerAdapter(LoggerAdapter):
             **extra,
         }
         super().__init__(logger=logger, extra=updated_extra)
+
+
+def make_scheduler_logger(logger: Union[Logger, None] = None, use_ansi: bool = True) -> JobLoggerAdapter:
+    """Wrap the logger to write regta's own messages."""
+    return JobLoggerAdapter(
+        logger or make_default_logger(use_ansi=use_ansi),
+        plain_job_name='regta',
+        styled_job_name=style('regta', fg='magenta'),
+        use_ansi=use_ansi,
+    )
@@ -0,0 +1,213 @@
+"""Contains the metrics registry and the HTTP server which exposes it in the
+Prometheus text format.
+
+Metrics of every job are kept in shared memory which is allocated before
+the job's process is started, so executions of process jobs are counted
+right in their processes.
+"""
+
+from typing import Dict, List, Sequence, Tuple, Union
+
+import multiprocessing
+from threading import Lock, Thread
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Upper bounds of histograms' buckets in seconds."""
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+COUNTERS = ('executions', 'errors', 'in_flight', 'duration_sum', 'lateness_sum', 'waiting_sum')
+"""Names of counters in the order they're returned by :meth:`JobMetrics.get_values`."""
+
+_EXECUTIONS, _ERRORS, _IN_FLIGHT, _DURATION_SUM, _LATENESS_SUM, _WAITING_SUM = range(len(COUNTERS))
+_COUNTERS_AMOUNT = len(COUNTERS)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class JobMetrics:
+    """Counters and histograms of a single job.
+
+    Every job has its own process-shared lock, so executions of different
+    jobs don't contend on updating their metrics.
+
+    Args:
+        buckets: Upper bounds of histograms' buckets.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._lock = multiprocessing.Lock()
+        # Counters, then durations' and latenesses' buckets
+        self._values = multiprocessing.RawArray('d', _COUNTERS_AMOUNT + 2 * len(self.buckets))
+
+    def __observe(self, offset: int, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self._values[offset + i] += 1
+                return
+
+    def execution_started(self, lateness: Union[float, None] = None) -> float:
+        """Count the execution as running.
+
+        Args:
+            lateness: Seconds between the scheduled and the actual start.
+
+        Return:
+            float: Start moment which must be passed into :meth:`execution_finished`.
+        """
+        with self._lock:
+            self._values[_IN_FLIGHT] += 1
+            if lateness is not None:
+                lateness = max(0.0, lateness)
+                self._values[_LATENESS_SUM] += lateness
+                self.__observe(_COUNTERS_AMOUNT + len(self.buckets), lateness)
+        return time.perf_counter()
+
+    def execution_finished(self, started_at: float, failed: bool = False):
+        """Count the finished execution and observe its duration."""
+        duration = time.perf_counter() - started_at
+        with self._lock:
+            self._values[_IN_FLIGHT] -= 1
+            self._values[_EXECUTIONS] += 1
+            if failed:
+                self._values[_ERRORS] += 1
+            self._values[_DURATION_SUM] += duration
+            self.__observe(_COUNTERS_AMOUNT, duration)
+
+    def execution_waited(self, seconds: float):
+        """Count seconds the execution waited for a concurrency slot."""
+        with self._lock:
+            self._values[_WAITING_SUM] += seconds
+
+    def get_values(self) -> Tuple[List[float], List[float], List[float]]:
+        """Get a consistent snapshot of counters (see :data:`COUNTERS`),
+        durations' buckets and latenesses' buckets.
+        """
+        with self._lock:
+            values = list(self._values)
+        buckets_amount = len(self.buckets)
+        return (
+            values[:_COUNTERS_AMOUNT],
+            values[_COUNTERS_AMOUNT:_COUNTERS_AMOUNT + buckets_amount],
+            values[_COUNTERS_AMOUNT + buckets_amount:],
+        )
+
+
+class MetricsRegistry:
+    """Metrics of all jobs by their names.
+
+    Metrics must be got by :meth:`get_job_metrics` before the job's process
+    is started.
+
+    Args:
+        buckets: Upper bounds of histograms' buckets.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._jobs: Dict[str, JobMetrics] = {}
+        self._lock = Lock()
+
+    def get_job_metrics(self, job_name: str) -> JobMetrics:
+        """Get metrics of the job, they're shared by jobs with the same name."""
+        with self._lock:
+            metrics = self._jobs.get(job_name)
+            if metrics is None:
+                metrics = self._jobs[job_name] = JobMetrics(self.buckets)
+            return metrics
+
+    def __render_histogram(self, lines: List[str], name: str, label: str, counts: List[float], total: float):
+        cumulative = 0.0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label},le="{_format_bound(bound)}"}} {cumulative:g}')
+        lines.append(f'{name}_sum{{{label}}} {total!r}')
+        lines.append(f'{name}_count{{{label}}} {cumulative:g}')
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            jobs = sorted(self._jobs.items())
+        snapshots = [(f'job="{_escape(name)}"', metrics.get_values()) for name, metrics in jobs]
+
+        lines = []
+        for name, kind, doc, index in (
+                ('regta_job_executions_total', 'counter', 'Finished executions.', _EXECUTIONS),
+                ('regta_job_errors_total', 'counter', 'Executions finished with an error.', _ERRORS),
+                ('regta_job_in_flight', 'gauge', 'Currently running executions.', _IN_FLIGHT),
+                ('regta_job_waiting_seconds_total', 'counter', 'Time waited for concurrency slots.', _WAITING_SUM),
+        ):
+            lines.append(f'# HELP {name} {doc}')
+            lines.append(f'# TYPE {name} {kind}')
+            for label, (counters, _, _) in snapshots:
+                lines.append(f'{name}{{{label}}} {counters[index]:g}')
+
+        for name, doc, index in (
+                ('regta_job_duration_seconds', 'Duration of executions.', 1),
+                ('regta_job_lateness_seconds', 'Delay between the scheduled and the actual start.', 2),
+        ):
+            lines.append(f'# HELP {name} {doc}')
+            lines.append(f'# TYPE {name} histogram')
+            total_index = _DURATION_SUM if index == 1 else _LATENESS_SUM
+            for label, snapshot in snapshots:
+                self.__render_histogram(lines, name, label, snapshot[index], snapshot[0][total_index])
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """HTTP server which exposes the registry at ``/metrics`` from a
+    daemon thread.
+
+    Args:
+        registry: Metrics to expose.
+        port: Port to listen.
+        host: Host to listen. Only local connections are accepted by default.
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = '127.0.0.1'):
+        # It's imported only when metrics are served since it's heavy for the CLI startup
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # pylint: disable=import-outside-toplevel
+
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # pylint: disable=invalid-name
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Union[Thread, None] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Host and port the server actually listens."""
+        return self._server.server_address[:2]  # type: ignore[return-value]
+
+    def start(self):
+        self._thread = Thread(target=self._server.serve_forever, name='regta-metrics', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
@@ -0,0 +1,341 @@
+"""Contains a pool of warm worker processes for :class:`regta.ProcessJob`.
+
+Workers are forked from a spawner process, which is forked from the
+scheduler's process before it starts any thread. So workers already have
+every registered job and only receive its index for each execution, and
+respawning a worker never forks the multi-threaded scheduler's process.
+Results and exceptions are sent back and logged by the parent via the job's
+logger.
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.reduction import recv_handle, send_handle
+from multiprocessing.util import Finalize
+import os
+from queue import Empty, SimpleQueue
+import signal
+from threading import Lock, Thread
+import time
+import traceback
+
+from .exceptions import RegtaException, RemoteTraceback, WorkerProcessDied
+from .jobs import ProcessJob, TERMINATE_TIMEOUT
+
+_Task = Union[Tuple[ProcessJob, Callable[[], None]], None]
+_POLL_INTERVAL = 0.01
+
+
+def terminate_processes(processes: Sequence[Union[BaseProcess, '_SpawnedProcess']], timeout: float = TERMINATE_TIMEOUT):
+    """Send SIGTERM to all processes at once and SIGKILL to the ones which
+    are still alive after ``timeout``.
+    """
+    for process in processes:
+        process.terminate()
+    deadline = time.monotonic() + timeout
+    for process in processes:
+        process.join(max(0.0, deadline - time.monotonic()))
+    for process in processes:
+        if process.is_alive():
+            process.kill()  # type: ignore[attr-defined]
+            process.join()
+
+
+def _work(conn: Connection, jobs: Sequence[ProcessJob]):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for job in jobs:
+        job._redirect_logs()  # pylint: disable=protected-access
+
+    while True:
+        try:
+            index = conn.recv()
+        except EOFError:
+            break
+        if index is None:
+            break
+
+        job = jobs[index]
+        message: Tuple[bool, Any, Union[List[str], None]]
+        try:
+            message = (True, job.func(*job.args, **job.kwargs), None)
+        except Exception as e:  # pylint: disable=broad-except
+            message = (False, e, traceback.format_tb(e.__traceback__))
+
+        try:
+            conn.send(message)
+        except Exception as e:  # pylint: disable=broad-except
+            error = RegtaException(f"Can't pass {message[1]!r} to the parent process: {e}")
+            conn.send((False, error, message[2] or []))
+
+
+def _serve_spawns(conn: Connection, parent_conn: Connection, jobs: Sequence[ProcessJob]):
+    """Fork worker processes on requests of the parent until it closes the
+    connection. The spawner has no threads, so forking is safe here.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    parent_conn.close()  # Otherwise the spawner and its workers keep the connection open
+    context = get_context('fork')
+    workers: Dict[int, BaseProcess] = {}
+    while True:
+        try:
+            command, pid = conn.recv()
+        except EOFError:
+            break
+        if command == 'spawn':
+            worker_conn, child_conn = context.Pipe()
+            process = context.Process(  # type: ignore[attr-defined]
+                target=_work,
+                args=(child_conn, jobs),
+                name='regta-process-worker',
+            )
+            process.start()
+            child_conn.close()
+            workers[process.pid] = process  # type: ignore[index]
+            conn.send(process.pid)
+            send_handle(conn, worker_conn.fileno(), os.getppid())
+            worker_conn.close()
+        elif command == 'exitcode':
+            conn.send(workers[pid].exitcode)
+
+    for worker in workers.values():
+        if worker.is_alive():
+            worker.kill()  # type: ignore[attr-defined]
+        worker.join()
+
+
+class _SpawnedProcess:
+    """Worker process forked by the spawner. It isn't a child of the
+    scheduler's process, so its exit code is asked from the spawner.
+    """
+
+    def __init__(self, spawner: '_Spawner', pid: int):
+        self.pid = pid
+        self._spawner = spawner
+        self._exitcode: Union[int, None] = None
+
+    @property
+    def exitcode(self) -> Union[int, None]:
+        if self._exitcode is None:
+            self._exitcode = self._spawner.get_exitcode(self.pid)
+        return self._exitcode
+
+    def is_alive(self) -> bool:
+        return self.exitcode is None
+
+    def join(self, timeout: Union[float, None] = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.is_alive() and (deadline is None or time.monotonic() < deadline):
+            time.sleep(_POLL_INTERVAL)
+
+    def terminate(self):
+        # The spawner doesn't reap the process until its exit code is asked, so the pid isn't reused
+        if self.is_alive():
+            os.kill(self.pid, signal.SIGTERM)
+
+    def kill(self):
+        if self.is_alive():
+            os.kill(self.pid, signal.SIGKILL)
+
+
+class _Spawner:
+    """Forks the spawner process. Must be created before the scheduler's
+    process starts any thread.
+    """
+
+    def __init__(self, jobs: Sequence[ProcessJob]):
+        context = get_context('fork')
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(  # type: ignore[attr-defined]
+            target=_serve_spawns,
+            args=(child_conn, self._conn, jobs),
+            name='regta-process-spawner',
+        )
+        self._process.start()
+        child_conn.close()
+        self._lock = Lock()
+        # The spawner waits for the connection to be closed, so don't let the exit hang on joining it
+        Finalize(self, self._conn.close, exitpriority=10)
+
+    def spawn(self) -> Tuple[_SpawnedProcess, Connection]:
+        with self._lock:
+            self._conn.send(('spawn', None))
+            pid = self._conn.recv()
+            conn = Connection(recv_handle(self._conn))
+        return _SpawnedProcess(self, pid), conn
+
+    def get_exitcode(self, pid: int) -> Union[int, None]:
+        with self._lock:
+            self._conn.send(('exitcode', pid))
+            return self._conn.recv()
+
+    def stop(self):
+        """Stop the spawner. Workers which are still alive are killed."""
+        self._conn.close()
+        self._process.join()
+
+
+class ProcessPool:  # pylint: disable=too-many-instance-attributes
+    """Fixed-size pool of warm worker processes.
+
+    Every worker process has a feeder thread in the parent which sends
+    executions to it and handles their results, so a worker executes only
+    one job at a time.
+
+    Args:
+        jobs: Process jobs which may be executed by the pool.
+        size: Amount of worker processes. Defaults to the amount of CPU cores.
+    """
+
+    def __init__(self, jobs: Sequence[ProcessJob], size: Union[int, None] = None):
+        self.size = size or os.cpu_count() or 1
+        self._jobs = list(jobs)
+        self._indexes = {id(job): index for index, job in enumerate(self._jobs)}
+        self._spawner: Union[_Spawner, None] = None
+        self._tasks: SimpleQueue = SimpleQueue()
+        self._feeders: List[Thread] = []
+        self._workers: Dict[int, _SpawnedProcess] = {}
+        self._running: Dict[int, ProcessJob] = {}
+        # Executions which weren't started before the shutdown
+        self._discarded: List[ProcessJob] = []
+        self._closed = False
+        self._lock = Lock()
+
+    def __spawn(self) -> Tuple[_SpawnedProcess, Connection]:
+        return self._spawner.spawn()  # type: ignore[union-attr]
+
+    def start(self):
+        """Fork the spawner and worker processes and start feeder threads.
+        Must be called before the process starts any other thread.
+        """
+        self._spawner = _Spawner(self._jobs)
+        workers = [self.__spawn() for _ in range(self.size)]
+        for number, (process, conn) in enumerate(workers):
+            self._workers[number] = process
+            feeder = Thread(target=self.__feed, args=(number, conn), name='regta-process-feeder', daemon=True)
+            feeder.start()
+            self._feeders.append(feeder)
+
+    def submit(self, job: ProcessJob, on_done: Callable[[], None]):
+        """Execute the job's function in a free worker.
+
+        Args:
+            job: The job will be executed. Must be passed into the pool before.
+            on_done: Will be called in the parent after the result is logged.
+                It's called at once if the pool is shut down.
+        """
+        with self._lock:
+            if not self._closed:
+                self._tasks.put((job, on_done))
+                return
+            self._discarded.append(job)
+        on_done()
+
+    @staticmethod
+    def __receive(process: _SpawnedProcess, conn: Connection) -> Tuple[bool, Any, List[str]]:
+        try:
+            return conn.recv()
+        except EOFError:
+            process.join()
+            return False, WorkerProcessDied(process.exitcode), []
+        except Exception as e:  # pylint: disable=broad-except
+            return False, RegtaException(f"Can't receive the result from the worker process: {e}"), []
+
+    def __feed(self, number: int, conn: Connection):
+        while True:
+            task: _Task = self._tasks.get()
+            process = self._workers[number]
+            if task is None:
+                if process.is_alive():
+                    conn.send(None)
+                process.join()
+                return
+
+            job, on_done = task
+            if not process.is_alive():
+                if self._closed:
+                    # Workers aren't respawned after the shutdown
+                    self._discarded.append(job)
+                    on_done()
+                    continue
+                process, conn = self.__spawn()
+                self._workers[number] = process
+            self._running[number] = job
+            started_at = job._execution_started()  # pylint: disable=protected-access
+            conn.send(self._indexes[id(job)])
+            if job.timeout is not None and not conn.poll(job.timeout):
+                terminate_processes([process])
+                conn.close()
+                if not self._closed:
+                    process, conn = self.__spawn()
+                    self._workers[number] = process
+                del self._running[number]
+                job._execution_finished(started_at, failed=True)  # pylint: disable=protected-access
+                job._on_timeout("the worker process is killed and respawned")  # pylint: disable=protected-access
+                on_done()
+                continue
+            is_success, value, tb_lines = self.__receive(process, conn)
+            del self._running[number]
+            job._execution_finished(started_at, failed=not is_success)  # pylint: disable=protected-access
+            if is_success:
+                job._on_success(value)  # pylint: disable=protected-access
+            else:
+                if tb_lines:
+                    value.__cause__ = RemoteTraceback(tb_lines)
+                job._on_failure(value)  # pylint: disable=protected-access
+            on_done()
+
+    def shutdown(self):
+        """Ask workers to stop after their current executions without waiting
+        for them. Executions which weren't started yet are discarded.
+        """
+        with self._lock:
+            self._closed = True
+            pending = []
+            while True:
+                try:
+                    task = self._tasks.get_nowait()
+                except Empty:
+                    break
+                if task is not None:
+                    pending.append(task)
+            for _ in self._feeders:
+                self._tasks.put(None)
+        for job, on_done in pending:
+            self._discarded.append(job)
+            on_done()
+
+    def join(self, timeout: Union[float, None] = None) -> List[ProcessJob]:
+        """Wait for workers stopped by :meth:`shutdown`.
+
+        Args:
+            timeout:
+                If workers don't finish their executions in time, they get
+                SIGTERM and then SIGKILL.
+
+        Returns:
+            Jobs whose executions were cut off or discarded by :meth:`shutdown`.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for feeder in self._feeders:
+            feeder.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+        running = dict(self._running)
+        terminate_processes([self._workers[number] for number in running])
+        # Feeders only log results of the terminated executions now
+        for feeder in self._feeders:
+            feeder.join(None if deadline is None else TERMINATE_TIMEOUT)
+        self._feeders = []
+        if self._spawner is not None:
+            self._spawner.stop()
+            self._spawner = None
+        discarded, self._discarded = self._discarded, []
+        return [*running.values(), *discarded]
+
+    def stop(self):
+        """Let workers finish their current executions and stop them."""
+        self.shutdown()
+        self.join()
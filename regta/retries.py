@@ -0,0 +1,67 @@
+"""Contains the declarative policy of retries of failed executions.
+
+Retries aren't sleeps inside an execution: a failed execution is finished and
+the retry is scheduled as a one-off entry of the same timer which schedules
+regular executions, so a job waiting for a retry doesn't occupy a thread,
+a worker process or a task.
+"""
+
+from typing import Tuple, Type, Union
+
+import random
+
+
+class RetryPolicy:
+    """Defines how failed executions of a job are retried.
+
+    The delay before the ``n``-th retry is ``backoff * multiplier ** (n - 1)``
+    limited by ``max_backoff``, plus a random jitter.
+
+    Args:
+        attempts: Max amount of attempts including the first execution.
+        backoff: Seconds before the first retry.
+        multiplier: Every next delay is multiplied by it.
+        max_backoff: Max seconds before a retry.
+        jitter:
+            Max random addition to every delay as a fraction of it, so
+            retries of many jobs failed at once are spread.
+        exceptions: Only these exceptions are retried.
+    """
+
+    def __init__(
+            self,
+            attempts: int = 3,
+            backoff: float = 1.0,
+            multiplier: float = 2.0,
+            max_backoff: Union[float, None] = None,
+            jitter: float = 0.1,
+            exceptions: Union[Type[BaseException], Tuple[Type[BaseException], ...]] = Exception,
+    ):
+        if attempts < 1:
+            raise ValueError("Amount of attempts must be at least 1.")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.exceptions = exceptions
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Check if the attempt failed with the error must be retried.
+
+        Args:
+            error: Exception raised by the attempt.
+            attempt: Number of the failed attempt starting from 1.
+        """
+        return attempt < self.attempts and isinstance(error, self.exceptions)
+
+    def get_delay(self, attempt: int) -> float:
+        """Get seconds before the next attempt.
+
+        Args:
+            attempt: Number of the failed attempt starting from 1.
+        """
+        delay = self.backoff * self.multiplier ** (attempt - 1)
+        if self.max_backoff is not None:
+            delay = min(delay, self.max_backoff)
+        return delay + random.uniform(0, delay * self.jitter)
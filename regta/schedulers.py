@@ -1,21 +1,81 @@
+# pylint: disable=too-many-lines
 """Contains family of different schedulers.
 
 Use following schedulers to build your system:
     * :class:`AsyncScheduler` for only :class:`regta.AsyncJob`.
+    * :class:`EmbeddedAsyncScheduler` for only :class:`regta.AsyncJob` in an already running event loop.
+    * :class:`AsyncWorkersScheduler` for only :class:`regta.AsyncJob` spread across several processes.
     * :class:`SyncScheduler` for only sync jobs (:class:`regta.ThreadJob` or :class:`regta.ProcessJob`).
     * :class:`Scheduler` for all types of jobs (**recommended**).
 """
 
-from typing import List, Union
+from typing import Callable, Dict, Iterable, List, Sequence, Set, Tuple, TYPE_CHECKING, Union
 
 from abc import ABC, abstractmethod
 import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from logging import Logger, LoggerAdapter
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+import os
+from pathlib import Path
 import signal
-from threading import Thread
+import sys
+from threading import Event, Lock, Thread
 import time
+import zlib
 
-from .exceptions import IncorrectJobType, StopService
-from .jobs import AbstractJob, AsyncJob, ProcessJob, ThreadJob
+from .enums import EventLoops
+from .exceptions import IncorrectJobType, JobNotRunning, RegtaException, StopService
+from .jobs import AbstractJob, AsyncJob, BaseJob, ProcessJob, ThreadJob
+from .limits import ConcurrencyLimiter
+from .logging import make_scheduler_logger, ProcessLogListener
+from .pools import ProcessPool, terminate_processes
+from .timers import LoopTimer, TimerEntry, TimerThread
+
+if TYPE_CHECKING:  # They're imported on use to keep the CLI startup fast
+    from .control import ControlServer
+    from .metrics import MetricsRegistry, MetricsServer
+    from .state import AbstractStateStore
+
+# Waiting for a lock can't be interrupted by a signal on Windows, so there the blocked thread wakes up every second
+_BLOCK_TIMEOUT = None if os.name == 'posix' else 1.0
+
+
+def make_loop_factory(
+        event_loop: Union[EventLoops, str] = EventLoops.ASYNCIO,
+        logger: Union[Logger, LoggerAdapter, None] = None,
+) -> Callable[[], asyncio.AbstractEventLoop]:
+    """Get a factory of event loops of the type. If uvloop isn't installed,
+    the standard asyncio loop is used with a warning.
+
+    Args:
+        event_loop: Type of event loops. uvloop is installed with ``pip install regta[uvloop]``.
+        logger: Logger for the warning. Standard output is used by default.
+    """
+    if EventLoops(event_loop) is EventLoops.UVLOOP:
+        try:
+            # It's imported only when it's used since it's an optional dependency
+            import uvloop  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            (logger or make_scheduler_logger()).warning("uvloop isn't installed, the asyncio event loop is used")
+        else:
+            return uvloop.new_event_loop
+    return asyncio.new_event_loop
+
+
+def _execute_triggered(job: ProcessJob):
+    # Stop signals are handled by the parent, it terminates the execution if it's cut off
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    job._redirect_logs()  # pylint: disable=protected-access
+    job.execute()
+
+
+def _get_remaining(deadline: Union[float, None]) -> Union[float, None]:
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
 
 
 class AbstractScheduler(ABC):
@@ -33,6 +93,45 @@ class AbstractScheduler(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def remove_job(self, job: AbstractJob):
+        """Remove the job from the scheduler. If the scheduler is running, the
+        job isn't executed anymore, but its running execution isn't
+        interrupted. Does nothing if the job isn't added.
+
+        Args:
+            job: The job will be removed.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_jobs(self) -> List[AbstractJob]:
+        """Get jobs added to the scheduler."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def trigger_job(self, job: AbstractJob):
+        """Execute the job once right now in the running scheduler without
+        waiting for it. The job's schedule isn't changed.
+
+        Args:
+            job: The job will be executed.
+
+        Raises:
+            JobNotRunning: If the scheduler isn't running or the job isn't added.
+        """
+        raise NotImplementedError
+
+    def pause_job(self, job: BaseJob):
+        """Skip executions of the job until :meth:`resume_job` is called, see
+        :meth:`regta.jobs.BaseJob.pause`.
+        """
+        job.pause()
+
+    def resume_job(self, job: BaseJob):
+        """Resume executions of the job paused by :meth:`pause_job`."""
+        job.resume()
+
     @abstractmethod
     def run(self, block: bool = True):
         """Run scheduler's jobs.
@@ -58,122 +157,1144 @@ class AbstractScheduler(ABC):
 class SyncBlocking(AbstractScheduler, ABC):
     """Contains sync blocking code to add :code:`block` bool var to
     :meth:`.AbstractScheduler.run` to block thread.
+
+    The blocked thread sleeps on an event without any periodic wake-ups.
+    SIGTERM or SIGINT interrupts the waiting immediately and the scheduler
+    is stopped right in the blocked thread. Calling :meth:`.stop` from
+    another thread releases the blocked thread too.
     """
 
     __original_sigterm_handler = None
     __original_sigint_handler = None
 
-    def __stop(self, sig, frame):  # pylint: disable=unused-argument
-        self.stop()
-        signal.signal(signal.SIGTERM, self.__original_sigterm_handler)
-        signal.signal(signal.SIGINT, self.__original_sigint_handler)
+    def __init__(self):
+        super().__init__()
+        self.__released = Event()
+        self.__stop_requested = False
+
+    def __handle_signal(self, sig, frame):  # pylint: disable=unused-argument
+        if self.__stop_requested:
+            return
+        self.__stop_requested = True
         raise StopService
 
+    def _reset_main(self):
+        """Prepare :meth:`_block_main` for a new run after the previous stop.
+        Must be called when the scheduler starts, so :meth:`_release_main`
+        called before the blocking isn't lost.
+        """
+        self.__released.clear()
+        self.__stop_requested = False
+
+    def _release_main(self):
+        """Release the thread blocked by :meth:`_block_main`."""
+        self.__released.set()
+
     def _block_main(self):
         self.__original_sigterm_handler = signal.getsignal(signal.SIGTERM)
-        signal.signal(signal.SIGTERM, self.__stop)
         self.__original_sigint_handler = signal.getsignal(signal.SIGINT)
-        signal.signal(signal.SIGINT, self.__stop)
+        try:
+            signal.signal(signal.SIGTERM, self.__handle_signal)
+            signal.signal(signal.SIGINT, self.__handle_signal)
+            while not self.__released.wait(_BLOCK_TIMEOUT):
+                pass
+        # SIGINT which comes before its handler is installed raises KeyboardInterrupt
+        except (StopService, KeyboardInterrupt):
+            self.stop()
+        finally:
+            signal.signal(signal.SIGTERM, self.__original_sigterm_handler)
+            signal.signal(signal.SIGINT, self.__original_sigint_handler)
 
-        while True:
-            try:
-                time.sleep(1)
-            except StopService:
-                break
 
+class SyncScheduler(SyncBlocking, AbstractScheduler):  # pylint: disable=too-many-instance-attributes
+    """Scheduler for :class:`regta.ThreadJob` and :class:`regta.ProcessJob`.
 
-class SyncScheduler(SyncBlocking, AbstractScheduler):
-    _thread_jobs: List[ThreadJob] = []
-    _process_jobs: List[ProcessJob] = []
+    By default, every job is started as its own thread or process. In the pool
+    modes, jobs aren't started at all: one timer thread keeps a min-heap of
+    the next execution times and hands due jobs over to a bounded
+    :class:`concurrent.futures.ThreadPoolExecutor` (thread jobs) or to a
+    :class:`regta.pools.ProcessPool` of warm worker processes (process jobs).
+
+    Args:
+        use_thread_pool: Enable the thread pool mode for thread jobs.
+        thread_pool_size:
+            Max amount of worker threads in the thread pool mode. Defaults to
+            ``min(32, CPU cores + 4)`` like in
+            :class:`concurrent.futures.ThreadPoolExecutor`.
+        use_process_pool: Enable the process pool mode for process jobs.
+        process_pool_size:
+            Amount of worker processes in the process pool mode. Defaults to
+            the amount of CPU cores.
+        shutdown_timeout:
+            Max seconds to wait for running executions on stop, see
+            :meth:`stop`. Waits endlessly by default.
+        aggregate_process_logs:
+            Send log records of process jobs to the main process and write
+            them there, see :class:`regta.logging.ProcessLogListener`.
+        limiter:
+            Limits amounts of simultaneously running executions, see
+            :class:`regta.limits.ConcurrencyLimiter`. In the pool modes,
+            executions wait for slots before they're passed into the pool.
+            Process jobs started as their own processes aren't limited.
+        logger: Logger for scheduler's own messages. Standard output is used by default.
+
+    Jobs may be added and removed while the scheduler is running, except
+    adding process jobs in the process pool mode since workers are forked
+    with the jobs they execute.
+    """
+
+    cut_off_jobs: List[Union[ThreadJob, ProcessJob]]
+    """Jobs whose executions were cut off by the last :meth:`stop`."""
+
+    def __init__(
+            self,
+            use_thread_pool: bool = False,
+            thread_pool_size: Union[int, None] = None,
+            use_process_pool: bool = False,
+            process_pool_size: Union[int, None] = None,
+            shutdown_timeout: Union[float, None] = None,
+            aggregate_process_logs: bool = True,
+            limiter: Union[ConcurrencyLimiter, None] = None,
+            logger: Union[Logger, LoggerAdapter, None] = None,
+    ):
+        super().__init__()
+        self.use_thread_pool = use_thread_pool
+        self.thread_pool_size = thread_pool_size
+        self.use_process_pool = use_process_pool
+        self.process_pool_size = process_pool_size
+        self.shutdown_timeout = shutdown_timeout
+        self.aggregate_process_logs = aggregate_process_logs
+        self.limiter = limiter
+        self.logger = logger or make_scheduler_logger()
+        self.cut_off_jobs = []
+        self._log_listener: Union[ProcessLogListener, None] = None
+        # Jobs are kept by their ids, so they're removed in O(1)
+        self._thread_jobs: Dict[int, ThreadJob] = {}
+        self._process_jobs: Dict[int, ProcessJob] = {}
+        self._removed_jobs: List[Union[ThreadJob, ProcessJob]] = []
+        # Triggered executions of jobs started as their own threads or processes
+        self._triggered: List[Tuple[Union[ThreadJob, ProcessJob], Union[Thread, BaseProcess]]] = []
+        self._entries: Dict[int, TimerEntry] = {}
+        self._lock = Lock()
+        self._started = False
+        self._daemon = False
+        self._timer: Union[TimerThread, None] = None
+        self._thread_pool: Union[ThreadPoolExecutor, None] = None
+        self._thread_pool_futures: Dict[Future, ThreadJob] = {}
+        self._process_pool: Union[ProcessPool, None] = None
+        # Due jobs wait for free workers of the pools here to be served by priority
+        self._thread_pool_limiter: Union[ConcurrencyLimiter, None] = None
+        self._process_pool_limiter: Union[ConcurrencyLimiter, None] = None
 
     def add_job(self, job: Union[ThreadJob, ProcessJob]):  # type: ignore[override]
-        if isinstance(job, ThreadJob):
-            self._thread_jobs.append(job)
-        elif isinstance(job, ProcessJob):
-            self._process_jobs.append(job)
+        with self._lock:
+            if isinstance(job, ThreadJob):
+                self._thread_jobs[id(job)] = job
+            elif isinstance(job, ProcessJob):
+                if self._started and self.use_process_pool:
+                    raise RegtaException("Process jobs can't be added to the running process pool")
+                self._process_jobs[id(job)] = job
+            else:
+                raise IncorrectJobType(job, self)
+            started = self._started
+        if started:
+            self.__start_added_job(job)
+
+    def __start_added_job(self, job: Union[ThreadJob, ProcessJob]):
+        if isinstance(job, ThreadJob) and self.use_thread_pool:
+            self.__schedule(job)
+        elif isinstance(job, ThreadJob):
+            job._limiter = self.limiter  # pylint: disable=protected-access
+            self.__start_jobs([job], self._daemon)
         else:
-            raise IncorrectJobType(job, self)
+            if self.aggregate_process_logs:
+                if self._log_listener is None:
+                    self._log_listener = ProcessLogListener()
+                    self._log_listener.start()
+                job._aggregate_logs(self._log_listener)  # pylint: disable=protected-access
+            self.__start_jobs([job], self._daemon)
+
+    def remove_job(self, job: Union[ThreadJob, ProcessJob]):  # type: ignore[override]
+        with self._lock:
+            jobs = self._thread_jobs if isinstance(job, ThreadJob) else self._process_jobs
+            if jobs.pop(id(job), None) is None:  # type: ignore[call-overload]
+                return
+            entry = self._entries.pop(id(job), None)
+            if entry is not None and self._timer is not None:
+                self._timer.cancel(entry)
+            if job.is_alive():
+                # It's stopped after its current execution and drained on stop
+                job.request_stop()
+                self._removed_jobs = [job, *(job for job in self._removed_jobs if job.is_alive())]
+
+    def get_jobs(self) -> List[Union[ThreadJob, ProcessJob]]:  # type: ignore[override]
+        with self._lock:
+            return [*self._thread_jobs.values(), *self._process_jobs.values()]
+
+    def trigger_job(self, job: Union[ThreadJob, ProcessJob]):  # type: ignore[override]
+        """Execute the job once right now without waiting for it. In the
+        pool modes, the execution takes concurrency slots and is passed into
+        the pool like a scheduled one, but the schedule isn't changed.
+        Otherwise, it's executed in a separate thread or a process forked
+        from the scheduler's one.
+
+        Raises:
+            JobNotRunning: If the scheduler isn't running or the job isn't added.
+        """
+        with self._lock:
+            if not self._started or not self.__is_added(job):
+                raise JobNotRunning(job)
+            pool = self._thread_pool if isinstance(job, ThreadJob) else self._process_pool
+            if pool is None:
+                execution: Union[Thread, BaseProcess]
+                if isinstance(job, ThreadJob):
+                    execution = Thread(target=job.execute, name='regta-triggered')
+                else:
+                    execution = get_context('fork').Process(  # type: ignore[attr-defined]
+                        target=_execute_triggered,
+                        args=(job,),
+                        name='regta-triggered',
+                    )
+                execution.daemon = self._daemon
+                execution.start()
+                self._triggered = [(job, execution), *(item for item in self._triggered if item[1].is_alive())]
+                return
+        self.__admit(job, self.__get_limiters(job), 0, 0.0, reschedule=False)
+
+    def __is_added(self, job: Union[ThreadJob, ProcessJob]) -> bool:
+        return id(job) in self._thread_jobs or id(job) in self._process_jobs
 
     @staticmethod
-    def __start_jobs(jobs: Union[List[ThreadJob], List[ProcessJob]], block: bool):
+    def __start_jobs(jobs: Iterable[Union[ThreadJob, ProcessJob]], daemon: bool):
         for job in jobs:
-            job.daemon = not block
+            job.daemon = daemon
             job.start()
 
-    def run(self, block: bool = True):
-        self.__start_jobs(self._thread_jobs, block)
-        self.__start_jobs(self._process_jobs, block)
+    def __schedule(self, job: Union[ThreadJob, ProcessJob]):
+        with self._lock:
+            if self._timer is not None and self.__is_added(job):
+                delay = job._get_seconds_till_to_execute()  # pylint: disable=protected-access
+                self._entries[id(job)] = self._timer.call_later(delay, partial(self.__dispatch, job))
+
+    def __get_limiters(self, job: Union[ThreadJob, ProcessJob]) -> List[ConcurrencyLimiter]:
+        pool_limiter = self._thread_pool_limiter if isinstance(job, ThreadJob) else self._process_pool_limiter
+        return [limiter for limiter in (self.limiter, pool_limiter) if limiter is not None]
+
+    @staticmethod
+    def __release(job: Union[ThreadJob, ProcessJob], limiters: Sequence[ConcurrencyLimiter]):
+        for limiter in limiters:
+            limiter.release(job.tags)
+
+    def __dispatch(self, job: Union[ThreadJob, ProcessJob]):
+        if job.is_paused:
+            self.__schedule(job)
+            return
+        self.__admit(job, self.__get_limiters(job), 0, 0.0)
+
+    def __admit(  # pylint: disable=too-many-arguments
+            self,
+            job: Union[ThreadJob, ProcessJob],
+            limiters: List[ConcurrencyLimiter],
+            start: int,
+            waited: float,
+            reschedule: bool = True,
+    ):
+        """Take slots of the limiters one by one, waiting for them in the
+        order of jobs' priorities if needed, and submit the job into its pool.
+        The job is scheduled again after the execution if ``reschedule`` is set.
+        """
+        for index in range(start, len(limiters)):
+            limiter = limiters[index]
+            if limiter.try_acquire(job.tags):
+                continue
+            callback = partial(self.__on_admitted, job, limiters, index, waited, reschedule)
+            fire_time = job._next_fire_time  # pylint: disable=protected-access
+            if not limiter.wait(job.tags, callback, priority=job.priority, fire_time=fire_time):
+                self.__release(job, limiters[:index])
+                if not limiter.closed:
+                    job._on_rejected()  # pylint: disable=protected-access
+                    if reschedule:
+                        self.__schedule(job)
+            return
+        self.__submit(job, limiters, waited, reschedule)
+
+    def __on_admitted(  # pylint: disable=too-many-arguments
+            self,
+            job: Union[ThreadJob, ProcessJob],
+            limiters: List[ConcurrencyLimiter],
+            index: int,
+            waited: float,
+            reschedule: bool,
+            waited_for_slot: Union[float, None],
+    ):
+        if waited_for_slot is None:  # The scheduler is stopped
+            self.__release(job, limiters[:index])
+        else:
+            self.__admit(job, limiters, index + 1, waited + waited_for_slot, reschedule)
+
+    def __submit(
+            self,
+            job: Union[ThreadJob, ProcessJob],
+            limiters: List[ConcurrencyLimiter],
+            waited: float,
+            reschedule: bool,
+    ):
+        if job._should_shed():  # pylint: disable=protected-access
+            self.__on_done(job, limiters, reschedule)
+            return
+        job._on_admitted(waited)  # pylint: disable=protected-access
+        if isinstance(job, ThreadJob) and self._thread_pool is not None:
+            future = self._thread_pool.submit(job.execute)
+            self._thread_pool_futures[future] = job
+            future.add_done_callback(partial(self.__on_thread_pool_done, job, limiters, reschedule))
+        elif isinstance(job, ProcessJob) and self._process_pool is not None:
+            self._process_pool.submit(job, on_done=partial(self.__on_done, job, limiters, reschedule))
+        else:  # The scheduler is stopped
+            self.__release(job, limiters)
+
+    def __on_thread_pool_done(
+            self,
+            job: ThreadJob,
+            limiters: List[ConcurrencyLimiter],
+            reschedule: bool,
+            future: Future,
+    ):
+        self.__forget_future(future)
+        self.__on_done(job, limiters, reschedule)
 
+    def __forget_future(self, future: Future):
+        self._thread_pool_futures.pop(future, None)
+
+    def __on_done(self, job: Union[ThreadJob, ProcessJob], limiters: List[ConcurrencyLimiter], reschedule: bool = True):
+        self.__release(job, limiters)
+        if reschedule:
+            self.__schedule(job)
+
+    def start(self, daemon: bool = False):
+        """Start scheduler's jobs without blocking the current thread.
+
+        Args:
+            daemon: Start jobs' threads and processes as daemons.
+        """
+        self._reset_main()
+        self._daemon = daemon
+        if self.aggregate_process_logs and self._process_jobs:
+            self._log_listener = ProcessLogListener()
+            for process_job in self._process_jobs.values():
+                process_job._aggregate_logs(self._log_listener)  # pylint: disable=protected-access
+
+        if self.use_process_pool:
+            # Workers are forked before any other thread is started
+            self._process_pool = ProcessPool(list(self._process_jobs.values()), size=self.process_pool_size)
+            self._process_pool.start()
+            self._process_pool_limiter = ConcurrencyLimiter(
+                max_concurrency=self._process_pool.size,
+                max_waiting=sys.maxsize,
+            )
+        if self.use_thread_pool:
+            thread_pool_size = self.thread_pool_size or min(32, (os.cpu_count() or 1) + 4)
+            self._thread_pool = ThreadPoolExecutor(max_workers=thread_pool_size, thread_name_prefix='regta-worker')
+            self._thread_pool_limiter = ConcurrencyLimiter(max_concurrency=thread_pool_size, max_waiting=sys.maxsize)
+
+        if self._log_listener is not None:
+            self._log_listener.start()
+        if self.use_process_pool or self.use_thread_pool:
+            self._timer = TimerThread(logger=self.logger)
+            self._timer.daemon = daemon
+            self._timer.start()
+
+        self.__start_or_schedule_jobs(daemon)
+
+    def __start_or_schedule_jobs(self, daemon: bool):
+        with self._lock:
+            self._started = True
+            thread_jobs, process_jobs = list(self._thread_jobs.values()), list(self._process_jobs.values())
+        if self.use_thread_pool:
+            for thread_job in thread_jobs:
+                self.__schedule(thread_job)
+        else:
+            for thread_job in thread_jobs:
+                thread_job._limiter = self.limiter  # pylint: disable=protected-access
+            self.__start_jobs(thread_jobs, daemon)
+        if self.use_process_pool:
+            for process_job in process_jobs:
+                self.__schedule(process_job)
+        else:
+            if self.limiter is not None and process_jobs:
+                self.logger.warning("Concurrency limits aren't applied to process jobs outside the process pool mode")
+            self.__start_jobs(process_jobs, daemon)
+
+    def run(self, block: bool = True):
+        self.start(daemon=not block)
         if block:
             self._block_main()
 
+    def __drain_thread_pool(self, thread_pool: ThreadPoolExecutor, timeout: Union[float, None]) -> List[ThreadJob]:
+        thread_pool.shutdown(wait=False)
+        running = dict(self._thread_pool_futures)
+        _, not_done = wait(running, timeout=timeout)
+        return [running[future] for future in not_done]
+
     @staticmethod
-    def __stop_jobs(jobs: List[Union[ThreadJob, ProcessJob]]):
+    def __drain_jobs(jobs: Sequence[Union[ThreadJob, ProcessJob]], deadline: Union[float, None]):
         for job in jobs:
-            job.stop()
+            job.join(_get_remaining(deadline))
+        stragglers = [job for job in jobs if job.is_alive()]
+        terminate_processes([job for job in stragglers if isinstance(job, ProcessJob)])
+        return stragglers
+
+    @staticmethod
+    def __drain_triggered(
+            executions: Sequence[Tuple[Union[ThreadJob, ProcessJob], Union[Thread, BaseProcess]]],
+            deadline: Union[float, None],
+    ) -> List[Union[ThreadJob, ProcessJob]]:
+        for _, execution in executions:
+            execution.join(_get_remaining(deadline))
+        stragglers = [(job, execution) for job, execution in executions if execution.is_alive()]
+        terminate_processes([execution for _, execution in stragglers if isinstance(execution, BaseProcess)])
+        return [job for job, _ in stragglers]
 
     def stop(self):
-        self.__stop_jobs(self._thread_jobs)
-        self.__stop_jobs(self._process_jobs)
+        """Stop scheduler's jobs.
 
+        All jobs are asked to stop at once and their running executions are
+        drained concurrently. If they aren't finished in
+        :attr:`shutdown_timeout`, processes get SIGTERM and then SIGKILL.
+        Threads can't be interrupted, so they're only reported. All cut off
+        jobs are logged and kept in :attr:`cut_off_jobs`.
+        """
+        deadline = None if self.shutdown_timeout is None else time.monotonic() + self.shutdown_timeout
+        with self._lock:
+            self._started = False
+            timer, thread_pool, process_pool = self._timer, self._thread_pool, self._process_pool
+            self._timer, self._thread_pool, self._process_pool = None, None, None
+            self._entries.clear()
+            jobs = [*self._thread_jobs.values(), *self._process_jobs.values(), *self._removed_jobs]
+            triggered, self._removed_jobs, self._triggered = self._triggered, [], []
+        if timer is not None:
+            timer.stop()
+        for pool_limiter in (self._thread_pool_limiter, self._process_pool_limiter):
+            if pool_limiter is not None:
+                pool_limiter.close()
 
-class AsyncScheduler(AbstractScheduler, Thread):
-    _async_jobs: List[AsyncJob] = []
-    _async_tasks: List = []
+        started_jobs = [job for job in jobs if job.is_alive()]
+        for job in started_jobs:
+            job.request_stop()
+        if process_pool is not None:
+            process_pool.shutdown()
 
-    def __init__(self):
+        cut_off_jobs = []
+        if thread_pool is not None:
+            cut_off_jobs.extend(self.__drain_thread_pool(thread_pool, _get_remaining(deadline)))
+        cut_off_jobs.extend(self.__drain_jobs(started_jobs, deadline))
+        cut_off_jobs.extend(self.__drain_triggered(triggered, deadline))
+        if process_pool is not None:
+            cut_off_jobs.extend(process_pool.join(_get_remaining(deadline)))
+
+        log_listener, self._log_listener = self._log_listener, None
+        if log_listener is not None:
+            log_listener.stop()
+
+        self.cut_off_jobs = cut_off_jobs
+        if cut_off_jobs:
+            self.logger.warning(
+                "Shutdown timeout (%ss) is exceeded, executions of %s job(s) were cut off: %s",
+                self.shutdown_timeout,
+                len(cut_off_jobs),
+                ", ".join(job.get_plain_job_name() for job in cut_off_jobs),
+            )
+        self._release_main()
+
+
+class _AsyncJobsRunner:  # pylint: disable=too-many-instance-attributes
+    """Starts and stops async jobs in an event loop. It's shared by
+    :class:`AsyncScheduler` and :class:`EmbeddedAsyncScheduler`, which differ
+    only in the loop they use.
+
+    Jobs added or removed while the loop is running are started or stopped in
+    the loop's thread, so they may be added and removed from any thread.
+    """
+
+    loop: Union[asyncio.AbstractEventLoop, None] = None
+
+    def __init__(self, use_dispatcher: bool = False, limiter: Union[ConcurrencyLimiter, None] = None):
+        self.use_dispatcher = use_dispatcher
+        self.limiter = limiter
+        # Jobs are kept by their ids, so they're removed in O(1)
+        self._async_jobs: Dict[int, AsyncJob] = {}
+        self._async_tasks: Dict[int, asyncio.Task] = {}
+        self._entries: Dict[int, TimerEntry] = {}
+        self._stopping: Set[asyncio.Future] = set()
+        self._timer: Union[LoopTimer, None] = None
+        self._jobs_lock = Lock()
+        self._jobs_started = False
+
+    def add_job(self, job: AsyncJob):
+        if not isinstance(job, AsyncJob):
+            raise IncorrectJobType(job, self)
+        job._limiter = self.limiter  # pylint: disable=protected-access
+        with self._jobs_lock:
+            if not self._jobs_started:
+                self._async_jobs[id(job)] = job
+                return
+        self.loop.call_soon_threadsafe(self.__start_job, job)  # type: ignore[union-attr]
+
+    def remove_job(self, job: AsyncJob):
+        with self._jobs_lock:
+            if not self._jobs_started:
+                self._async_jobs.pop(id(job), None)
+                return
+        self.loop.call_soon_threadsafe(self.__stop_job, job)  # type: ignore[union-attr]
+
+    def get_jobs(self) -> List[AsyncJob]:
+        with self._jobs_lock:
+            return list(self._async_jobs.values())
+
+    def trigger_job(self, job: AsyncJob):
+        with self._jobs_lock:
+            if not self._jobs_started or id(job) not in self._async_jobs:
+                raise JobNotRunning(job)
+        self.loop.call_soon_threadsafe(job._trigger)  # type: ignore[union-attr]  # pylint: disable=protected-access
+
+    def __schedule(self, job: AsyncJob):
+        if self._timer is not None and id(job) in self._async_jobs:
+            delay = job._get_seconds_till_to_execute()  # pylint: disable=protected-access
+            self._entries[id(job)] = self._timer.call_later(delay, partial(self.__fire, job))
+
+    def __fire(self, job: AsyncJob):
+        job._dispatch()  # pylint: disable=protected-access
+        self.__schedule(job)
+
+    def __start_job(self, job: AsyncJob):
+        if not self._jobs_started or id(job) in self._async_jobs:
+            return
+        self._async_jobs[id(job)] = job
+        if self.use_dispatcher:
+            self.__schedule(job)
+        else:
+            self._async_tasks[id(job)] = self.loop.create_task(job.run())  # type: ignore[union-attr]
+
+    def __stop_job(self, job: AsyncJob):
+        if self._async_jobs.pop(id(job), None) is None:
+            return
+        entry = self._entries.pop(id(job), None)
+        if entry is not None and self._timer is not None:
+            self._timer.cancel(entry)
+        task = self._async_tasks.pop(id(job), None)
+        if task is not None:
+            task.cancel()
+        stopping = asyncio.ensure_future(job.stop())
+        self._stopping.add(stopping)
+        stopping.add_done_callback(self._stopping.discard)
+
+    def _start_jobs(self, loop: asyncio.AbstractEventLoop):
+        with self._jobs_lock:
+            self.loop = loop
+            self._jobs_started = True
+        if self.use_dispatcher:
+            self._timer = LoopTimer(loop)
+            for job in self._async_jobs.values():
+                self.__schedule(job)
+        else:
+            self._async_tasks = {key: loop.create_task(job.run()) for key, job in self._async_jobs.items()}
+
+    async def _stop_jobs(self):
+        with self._jobs_lock:
+            self._jobs_started = False
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self._entries.clear()
+        for task in self._async_tasks.values():
+            task.cancel()
+        self._async_tasks = {}
+        await asyncio.gather(
+            *self._stopping,
+            *(job.stop() for job in self._async_jobs.values()),
+            return_exceptions=True,
+        )
+
+
+class AsyncScheduler(_AsyncJobsRunner, AbstractScheduler, Thread):  # type: ignore[misc]
+    """Scheduler for :class:`regta.AsyncJob`. It runs its own event loop in
+    its own thread, use :class:`EmbeddedAsyncScheduler` to run jobs in an
+    already running loop.
+
+    By default, every job is a long-lived task which sleeps between
+    executions. In the dispatcher mode, a single :class:`regta.timers.LoopTimer`
+    keeps the next execution times of all jobs and wakes up only for the
+    earliest one, so a task is created only when a job actually fires.
+
+    Args:
+        use_dispatcher: Enable the dispatcher mode.
+        limiter:
+            Limits amounts of simultaneously running executions, see
+            :class:`regta.limits.ConcurrencyLimiter`. Executions wait for
+            slots without blocking the event loop.
+        loop_factory:
+            Makes the scheduler's event loop, e.g. ``uvloop.new_event_loop``,
+            see :func:`make_loop_factory`.
+    """
+
+    loop: asyncio.AbstractEventLoop
+
+    def __init__(
+            self,
+            use_dispatcher: bool = False,
+            limiter: Union[ConcurrencyLimiter, None] = None,
+            loop_factory: Callable[[], asyncio.AbstractEventLoop] = asyncio.new_event_loop,
+    ):
         Thread.__init__(self)
-        super().__init__()
-        self.loop = asyncio.new_event_loop()
+        _AsyncJobsRunner.__init__(self, use_dispatcher=use_dispatcher, limiter=limiter)
+        # The loop becomes current only in the scheduler's thread, so the constructing thread's loop isn't replaced
+        self.loop = loop_factory()
+
+    def run(self, block: bool = True):
         asyncio.set_event_loop(self.loop)
+        self._start_jobs(self.loop)
+        self.loop.run_forever()
+
+    async def __shutdown(self):
+        await self._stop_jobs()
+        self.loop.stop()
+
+    def stop(self):
+        """Stop scheduler's jobs and cancel their running executions."""
+        asyncio.run_coroutine_threadsafe(self.__shutdown(), self.loop)
+
+
+class EmbeddedAsyncScheduler(_AsyncJobsRunner):
+    """Scheduler for :class:`regta.AsyncJob` which runs jobs in the caller's
+    running event loop, e.g. next to a web server, without any extra thread.
+
+    .. code-block:: python
+
+        scheduler = EmbeddedAsyncScheduler()
+        scheduler.add_job(my_job)
+        await scheduler.start()
+        ...
+        await scheduler.stop()
+
+    Args are the same as for :class:`AsyncScheduler` except ``loop_factory``.
+    """
+
+    async def start(self):
+        """Start scheduler's jobs in the running event loop. Returns at once,
+        jobs are executed while the loop is running.
+        """
+        self._start_jobs(asyncio.get_event_loop())
+
+    async def stop(self):
+        """Stop scheduler's jobs and cancel their running executions. The loop
+        keeps running.
+        """
+        await self._stop_jobs()
+
+
+class _AsyncWorkerJobsRunner(_AsyncJobsRunner):
+    @staticmethod
+    def pause_job(job: AsyncJob):
+        job.pause()
+
+    @staticmethod
+    def resume_job(job: AsyncJob):
+        job.resume()
+
+
+def _serve_async_jobs(
+        conn: Connection,
+        parent_conns: Sequence[Connection],
+        jobs: Sequence[AsyncJob],
+        use_dispatcher: bool,
+        limiter: Union[ConcurrencyLimiter, None],
+        loop_factory: Callable[[], asyncio.AbstractEventLoop],
+        log_listener: Union[ProcessLogListener, None],
+):
+    # Stop signals are handled by the parent, it asks workers to stop via the pipe
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Parent's ends of pipes are inherited, they must be closed to get EOF when the parent dies
+    for parent_conn in parent_conns:
+        parent_conn.close()
+    if log_listener is not None:
+        for job in jobs:
+            log_listener.redirect(job.logger)  # type: ignore[arg-type]
+
+    runner = _AsyncWorkerJobsRunner(use_dispatcher=use_dispatcher, limiter=limiter)
+    for job in jobs:
+        runner.add_job(job)
+    loop = loop_factory()
+    asyncio.set_event_loop(loop)
+    stop_requested = loop.create_future()
+
+    def request_stop():
+        if not stop_requested.done():
+            stop_requested.set_result(None)
+
+    def on_message():
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):  # The parent has died
+            message = None
+        if message is None:
+            loop.remove_reader(conn.fileno())
+            request_stop()
+            return
+        action, index = message
+        getattr(runner, f'{action}_job')(jobs[index])
+
+    loop.add_reader(conn.fileno(), on_message)
+    loop.add_signal_handler(signal.SIGTERM, request_stop)
+    runner._start_jobs(loop)  # pylint: disable=protected-access
+    try:
+        loop.run_until_complete(stop_requested)
+        if limiter is not None:
+            limiter.close()
+        loop.run_until_complete(runner._stop_jobs())  # pylint: disable=protected-access
+    finally:
+        loop.close()
+        conn.close()
+
+
+class AsyncWorkersScheduler(AbstractScheduler):  # pylint: disable=too-many-instance-attributes
+    """Scheduler for :class:`regta.AsyncJob` which spreads jobs across several
+    worker processes, each with its own event loop, so CPU-bound code of
+    async jobs isn't limited by a single core.
+
+    Every job is always assigned to the same worker by a hash of its name,
+    see :meth:`get_worker_number`. Workers are forked on :meth:`run` and
+    ignore SIGINT: the parent process handles stop signals and asks workers
+    to stop, then they cancel running executions like
+    :class:`AsyncScheduler`. A worker stops by itself if the parent dies.
+
+    Jobs may be removed, paused and resumed while workers are running, these
+    commands are passed to the workers. New jobs can't be added to running
+    workers.
+
+    Args:
+        workers: Amount of worker processes.
+        use_dispatcher: Enable the dispatcher mode in every worker, see :class:`AsyncScheduler`.
+        limiter:
+            Limits amounts of simultaneously running executions, see
+            :class:`regta.limits.ConcurrencyLimiter`. Every worker applies
+            the limits to its own jobs separately.
+        loop_factory: Makes workers' event loops, see :class:`AsyncScheduler`.
+        shutdown_timeout:
+            Max seconds to wait for workers on stop. After that, they get
+            SIGTERM and then SIGKILL. Waits endlessly by default.
+        aggregate_logs:
+            Send log records of jobs to the parent process and write them
+            there, see :class:`regta.logging.ProcessLogListener`.
+    """
+
+    def __init__(
+            self,
+            workers: int,
+            use_dispatcher: bool = False,
+            limiter: Union[ConcurrencyLimiter, None] = None,
+            loop_factory: Callable[[], asyncio.AbstractEventLoop] = asyncio.new_event_loop,
+            shutdown_timeout: Union[float, None] = None,
+            aggregate_logs: bool = True,
+    ):
+        if workers < 1:
+            raise ValueError("Amount of workers must be at least 1.")
+        self.workers = workers
+        self.use_dispatcher = use_dispatcher
+        self.limiter = limiter
+        self.loop_factory = loop_factory
+        self.shutdown_timeout = shutdown_timeout
+        self.aggregate_logs = aggregate_logs
+        self._shards: List[Dict[int, AsyncJob]] = [{} for _ in range(workers)]
+        # Indexes of jobs in their workers, workers receive them in commands
+        self._indexes: Dict[int, int] = {}
+        self._processes: Dict[int, Tuple[BaseProcess, Connection]] = {}
+        self._log_listener: Union[ProcessLogListener, None] = None
+        self._lock = Lock()
+
+    def get_worker_number(self, job: AsyncJob) -> int:
+        """Get the number of the worker which the job is assigned to. It
+        depends only on the job's name and the amount of workers, so it's
+        the same across restarts.
+        """
+        return zlib.crc32(job.get_plain_job_name().encode()) % self.workers
 
     def add_job(self, job: AsyncJob):  # type: ignore[override]
-        if isinstance(job, AsyncJob):
-            self._async_jobs.append(job)
-        else:
+        if not isinstance(job, AsyncJob):
             raise IncorrectJobType(job, self)
+        with self._lock:
+            if self._processes:
+                raise RegtaException("Async jobs can't be added to running async workers")
+            self._shards[self.get_worker_number(job)][id(job)] = job
+        # Workers schedule and execute it
+        job._share_status()  # pylint: disable=protected-access
+
+    def get_jobs(self) -> List[AsyncJob]:  # type: ignore[override]
+        with self._lock:
+            return [job for shard in self._shards for job in shard.values()]
+
+    def __send(self, action: str, job: AsyncJob) -> bool:
+        """Pass the command to the job's worker.
+
+        Return:
+            bool: Whether the command is sent.
+        """
+        number = self.get_worker_number(job)
+        with self._lock:
+            if id(job) not in self._shards[number]:
+                return False
+            if action == 'remove':
+                del self._shards[number][id(job)]
+            worker = self._processes.get(number)
+            if worker is None:
+                return False
+            try:
+                worker[1].send((action, self._indexes[id(job)]))
+            except OSError:  # The worker has died
+                return False
+            return True
+
+    def remove_job(self, job: AsyncJob):  # type: ignore[override]
+        self.__send('remove', job)
+
+    def trigger_job(self, job: AsyncJob):  # type: ignore[override]
+        if not self.__send('trigger', job):
+            raise JobNotRunning(job)
+
+    def pause_job(self, job: AsyncJob):  # type: ignore[override]
+        job.pause()
+        self.__send('pause', job)
+
+    def resume_job(self, job: AsyncJob):  # type: ignore[override]
+        job.resume()
+        self.__send('resume', job)
 
     def run(self, block: bool = True):
-        self._async_tasks = [
-            self.loop.create_task(job.run())
-            for job in self._async_jobs
-        ]
-        self.loop.run_forever()
+        """Fork worker processes. Must be called before any other thread is
+        started, since only the forking thread exists in a forked process.
+
+        Args:
+            block: If True, blocks the current thread until all workers are stopped.
+        """
+        context = get_context('fork')
+        if self.aggregate_logs:
+            self._log_listener = ProcessLogListener()
+            for shard in self._shards:
+                for job in shard.values():
+                    self._log_listener.register(job.logger)  # type: ignore[arg-type]
+
+        with self._lock:
+            for number, shard in enumerate(self._shards):
+                if shard:
+                    self.__spawn(context, number, list(shard.values()))
+
+        if self._log_listener is not None:
+            self._log_listener.start()
+        if block:
+            for worker, _ in list(self._processes.values()):
+                worker.join()
+
+    def __spawn(self, context, number: int, jobs: List[AsyncJob]):
+        self._indexes.update((id(job), index) for index, job in enumerate(jobs))
+        parent_conn, child_conn = context.Pipe()
+        parent_conns = [parent_conn, *(conn for _, conn in self._processes.values())]
+        process = context.Process(
+            target=_serve_async_jobs,
+            args=(
+                child_conn,
+                parent_conns,
+                jobs,
+                self.use_dispatcher,
+                self.limiter,
+                self.loop_factory,
+                self._log_listener,
+            ),
+            name='regta-async-worker',
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._processes[number] = (process, parent_conn)
 
     def stop(self):
-        """Stop scheduler's jobs."""
-        for task in self._async_tasks:
-            task.cancel()
-        self.loop.call_soon_threadsafe(self.loop.stop)
+        """Ask workers to stop and wait for them. Workers which aren't stopped
+        in :attr:`shutdown_timeout` get SIGTERM and then SIGKILL.
+        """
+        deadline = None if self.shutdown_timeout is None else time.monotonic() + self.shutdown_timeout
+        with self._lock:
+            processes, self._processes = list(self._processes.values()), {}
+            for _, conn in processes:
+                try:
+                    conn.send(None)
+                except OSError:  # The worker has died
+                    pass
+                conn.close()
+        for process, _ in processes:
+            process.join(_get_remaining(deadline))
+        terminate_processes([process for process, _ in processes if process.is_alive()])
+
+        log_listener, self._log_listener = self._log_listener, None
+        if log_listener is not None:
+            log_listener.stop()
 
 
-class Scheduler(SyncBlocking, AbstractScheduler):
+class Scheduler(SyncBlocking, AbstractScheduler):  # pylint: disable=too-many-instance-attributes
+    """Scheduler for all types of jobs.
+
+    Args:
+        use_thread_pool: Run thread jobs in a shared thread pool, see :class:`SyncScheduler`.
+        thread_pool_size: Max amount of worker threads in the thread pool mode.
+        use_process_pool: Run process jobs in a pool of warm worker processes, see :class:`SyncScheduler`.
+        process_pool_size: Amount of worker processes. Defaults to the amount of CPU cores.
+        use_async_dispatcher: Dispatch async jobs from a single timer, see :class:`AsyncScheduler`.
+        event_loop: Type of the event loop of async jobs, see :func:`make_loop_factory`.
+        async_workers:
+            Amount of processes to spread async jobs across, see
+            :class:`AsyncWorkersScheduler`. Async jobs run in the scheduler's
+            own process by default.
+        shutdown_timeout: Max seconds to wait for running sync executions on stop, see :meth:`SyncScheduler.stop`.
+        aggregate_process_logs: Write log records of process jobs in the main process, see :class:`SyncScheduler`.
+        metrics: Registry which collects metrics of all added jobs, see :mod:`regta.metrics`.
+        metrics_port:
+            Serve the metrics at ``/metrics`` on the port while the scheduler
+            is running, see :class:`regta.metrics.MetricsServer`. A registry
+            is made if it isn't passed.
+        metrics_host: Host to serve the metrics at.
+        max_concurrency: Max amount of simultaneously running executions of all jobs.
+        tag_limits: Max amounts of simultaneously running executions of jobs with the tags.
+        max_waiting: Max amount of executions waiting for a slot, see :class:`regta.limits.ConcurrencyLimiter`.
+        spread:
+            Default window in seconds to shift jobs' execution times within,
+            see :attr:`regta.jobs.BaseJob.spread`.
+        state_store:
+            Store which keeps the last successful fire time of every job, see
+            :mod:`regta.state`. Executions missed while regta was stopped are
+            planned on :meth:`add_job` according to jobs' misfire policies.
+        control_socket:
+            Path to a Unix domain socket to serve commands at while the
+            scheduler is running, see :class:`regta.control.ControlServer`.
+        logger: Logger for scheduler's own messages. Standard output is used by default.
+
+    Jobs may be added, removed, paused and resumed while the scheduler is
+    running from any thread, other jobs keep running. See
+    :class:`SyncScheduler` and :class:`AsyncWorkersScheduler` for exceptions.
+    """
+
     sync_scheduler: Union[SyncScheduler, None] = None
-    async_scheduler: Union[AsyncScheduler, None] = None
+    async_scheduler: Union[AsyncScheduler, AsyncWorkersScheduler, None] = None
+
+    def __init__(  # pylint: disable=too-many-locals
+            self,
+            use_thread_pool: bool = False,
+            thread_pool_size: Union[int, None] = None,
+            use_process_pool: bool = False,
+            process_pool_size: Union[int, None] = None,
+            use_async_dispatcher: bool = False,
+            event_loop: Union[EventLoops, str] = EventLoops.ASYNCIO,
+            async_workers: int = 1,
+            shutdown_timeout: Union[float, None] = None,
+            aggregate_process_logs: bool = True,
+            metrics: Union['MetricsRegistry', None] = None,
+            metrics_port: Union[int, None] = None,
+            metrics_host: str = '127.0.0.1',
+            max_concurrency: Union[int, None] = None,
+            tag_limits: Union[Dict[str, int], None] = None,
+            max_waiting: int = 1000,
+            spread: Union[float, None] = None,
+            state_store: Union['AbstractStateStore', None] = None,
+            control_socket: Union[str, Path, None] = None,
+            logger: Union[Logger, LoggerAdapter, None] = None,
+    ):
+        super().__init__()
+        self.use_thread_pool = use_thread_pool
+        self.thread_pool_size = thread_pool_size
+        self.use_process_pool = use_process_pool
+        self.process_pool_size = process_pool_size
+        if metrics is None and metrics_port is not None:
+            from .metrics import MetricsRegistry  # pylint: disable=import-outside-toplevel,redefined-outer-name
+            metrics = MetricsRegistry()
+        self.metrics = metrics
+        self.metrics_port = metrics_port
+        self.metrics_host = metrics_host
+        self.limiter = (
+            ConcurrencyLimiter(max_concurrency=max_concurrency, tag_limits=tag_limits, max_waiting=max_waiting)
+            if max_concurrency is not None or tag_limits
+            else None
+        )
+        self.spread = spread
+        self.state_store = state_store
+        self._states: Union[Dict[str, float], None] = None
+        self.use_async_dispatcher = use_async_dispatcher
+        self.event_loop = EventLoops(event_loop)
+        self.async_workers = async_workers
+        self.shutdown_timeout = shutdown_timeout
+        self.aggregate_process_logs = aggregate_process_logs
+        self.control_socket = control_socket
+        self.logger = logger or make_scheduler_logger()
+        self._lock = Lock()
+        self._running = False
+        self._daemon = False
+        self._control_server: Union['ControlServer', None] = None
+        self._metrics_server: Union['MetricsServer', None] = None
 
     def add_job(self, job: Union[AsyncJob, ThreadJob, ProcessJob]):  # type: ignore[override]
-        if isinstance(job, AsyncJob):
-            if self.async_scheduler is None:
-                self.async_scheduler = AsyncScheduler()
-            self.async_scheduler.add_job(job)
-        elif isinstance(job, (ThreadJob, ProcessJob)):
-            if self.sync_scheduler is None:
-                self.sync_scheduler = SyncScheduler()
-            self.sync_scheduler.add_job(job)
-        else:
+        if not isinstance(job, (AsyncJob, ThreadJob, ProcessJob)):
             raise IncorrectJobType(job, self)
+        # The job is prepared before it's passed to the scheduler since a running one starts it at once
+        if self.spread is not None and job.spread is None:
+            job.spread = self.spread
+        if self.metrics is not None:
+            job._metrics = self.metrics.get_job_metrics(job.get_plain_job_name())  # pylint: disable=protected-access
+        if self.state_store is not None:
+            self.__restore_state(job)
+        with self._lock:
+            scheduler = self.__get_async_scheduler() if isinstance(job, AsyncJob) else self.__get_sync_scheduler()
+        scheduler.add_job(job)  # type: ignore[arg-type]
+
+    def __get_async_scheduler(self) -> Union[AsyncScheduler, AsyncWorkersScheduler]:
+        if self.async_scheduler is None:
+            if self._running and self.async_workers > 1:
+                raise RegtaException("Async jobs can't be added to running async workers")
+            async_scheduler = self.__make_async_scheduler()
+            if self._running and isinstance(async_scheduler, AsyncScheduler):
+                async_scheduler.daemon = self._daemon  # pylint: disable=attribute-defined-outside-init
+                async_scheduler.start()
+            self.async_scheduler = async_scheduler
+        return self.async_scheduler
+
+    def __get_sync_scheduler(self) -> SyncScheduler:
+        if self.sync_scheduler is None:
+            self.sync_scheduler = SyncScheduler(
+                    use_thread_pool=self.use_thread_pool,
+                    thread_pool_size=self.thread_pool_size,
+                    use_process_pool=self.use_process_pool,
+                    process_pool_size=self.process_pool_size,
+                    shutdown_timeout=self.shutdown_timeout,
+                    aggregate_process_logs=self.aggregate_process_logs,
+                    limiter=self.limiter,
+                    logger=self.logger,
+                )
+            if self._running:
+                self.sync_scheduler.start(daemon=self._daemon)
+        return self.sync_scheduler
+
+    def remove_job(self, job: Union[AsyncJob, ThreadJob, ProcessJob]):  # type: ignore[override]
+        scheduler = self.async_scheduler if isinstance(job, AsyncJob) else self.sync_scheduler
+        if scheduler is not None:
+            scheduler.remove_job(job)  # type: ignore[arg-type]
+
+    def get_jobs(self) -> List[Union[AsyncJob, ThreadJob, ProcessJob]]:  # type: ignore[override]
+        return [
+            job
+            for scheduler in (self.async_scheduler, self.sync_scheduler)
+            if scheduler is not None
+            for job in scheduler.get_jobs()
+        ]
+
+    def trigger_job(self, job: Union[AsyncJob, ThreadJob, ProcessJob]):  # type: ignore[override]
+        scheduler = self.async_scheduler if isinstance(job, AsyncJob) else self.sync_scheduler
+        if scheduler is None:
+            raise JobNotRunning(job)
+        scheduler.trigger_job(job)  # type: ignore[arg-type]
+
+    def pause_job(self, job: Union[AsyncJob, ThreadJob, ProcessJob]):  # type: ignore[override]
+        if isinstance(job, AsyncJob) and self.async_scheduler is not None:
+            self.async_scheduler.pause_job(job)
+        else:
+            job.pause()
+
+    def resume_job(self, job: Union[AsyncJob, ThreadJob, ProcessJob]):  # type: ignore[override]
+        if isinstance(job, AsyncJob) and self.async_scheduler is not None:
+            self.async_scheduler.resume_job(job)
+        else:
+            job.resume()
+
+    def __make_async_scheduler(self) -> Union[AsyncScheduler, AsyncWorkersScheduler]:
+        loop_factory = make_loop_factory(self.event_loop, self.logger)
+        if self.async_workers > 1:
+            if self.limiter is not None:
+                self.logger.warning("Concurrency limits are applied within every async worker process separately")
+            return AsyncWorkersScheduler(
+                workers=self.async_workers,
+                use_dispatcher=self.use_async_dispatcher,
+                limiter=self.limiter,
+                loop_factory=loop_factory,
+                shutdown_timeout=self.shutdown_timeout,
+                aggregate_logs=self.aggregate_process_logs,
+            )
+        return AsyncScheduler(use_dispatcher=self.use_async_dispatcher, limiter=self.limiter, loop_factory=loop_factory)
+
+    def __restore_state(self, job: Union[AsyncJob, ThreadJob, ProcessJob]):
+        if self._states is None:
+            self._states = self.state_store.load()  # type: ignore[union-attr]
+        last_fire_time = self._states.get(job.get_plain_job_name())
+        if last_fire_time is not None:
+            job._restore_state(last_fire_time)  # pylint: disable=protected-access
+        job._state_store = self.state_store  # pylint: disable=protected-access
 
     def run(self, block: bool = True):
-        if self.sync_scheduler is not None:
-            self.sync_scheduler.run(block=(self.async_scheduler is None and block))
-        if self.async_scheduler is not None:
-            self.async_scheduler.daemon = not block
-            self.async_scheduler.start()
-        if block and self.async_scheduler is not None:
+        """Start all jobs. Processes are forked before the scheduler's own
+        threads and the servers' threads are started.
+
+        Args:
+            block: If True, blocks the current thread until the scheduler is stopped.
+        """
+        self._reset_main()
+        with self._lock:
+            self._running, self._daemon = True, not block
+            if isinstance(self.async_scheduler, AsyncWorkersScheduler):
+                # Workers are forked before any other thread is started
+                self.async_scheduler.run(block=False)
+            if self.sync_scheduler is not None:
+                self.sync_scheduler.start(daemon=not block)
+            if isinstance(self.async_scheduler, AsyncScheduler):
+                self.async_scheduler.daemon = not block  # pylint: disable=attribute-defined-outside-init
+                self.async_scheduler.start()
+        if self.control_socket is not None:
+            from .control import ControlServer  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+            try:
+                self._control_server = ControlServer(self, self.control_socket)
+            except (OSError, RegtaException):
+                self.stop()
+                raise
+            self._control_server.start()
+            self.logger.info("Commands are served at %s", self.control_socket)
+        if self.metrics_port is not None:
+            from .metrics import MetricsServer  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+            try:
+                self._metrics_server = MetricsServer(
+                    self.metrics,  # type: ignore[arg-type]
+                    port=self.metrics_port,
+                    host=self.metrics_host,
+                )
+            except OSError:
+                self.stop()
+                raise
+            self._metrics_server.start()
+            self.logger.info("Metrics are served at http://%s:%s/metrics", *self._metrics_server.address)
+        if block:
             self._block_main()
 
+    @property
+    def cut_off_jobs(self) -> List[Union[ThreadJob, ProcessJob]]:
+        """Jobs whose executions were cut off by the last :meth:`stop`."""
+        return self.sync_scheduler.cut_off_jobs if self.sync_scheduler is not None else []
+
     def stop(self):
-        if self.sync_scheduler is not None:
-            self.sync_scheduler.stop()
+        control_server, self._control_server = self._control_server, None
+        if control_server is not None:
+            control_server.stop()
+        metrics_server, self._metrics_server = self._metrics_server, None
+        if metrics_server is not None:
+            metrics_server.stop()
+        with self._lock:
+            self._running = False
+        if self.limiter is not None:
+            self.limiter.close()
         if self.async_scheduler is not None:
             self.async_scheduler.stop()
+        if self.sync_scheduler is not None:
+            self.sync_scheduler.stop()
+        if self.state_store is not None:
+            self.state_store.close()
+        self._release_main()
@@ -0,0 +1,159 @@
+"""Contains stores which keep the last successful fire time of every job
+across restarts.
+
+Fire times are saved by the process which finishes the execution, so every
+store reopens its file after a fork instead of sharing a connection with the
+parent process.
+"""
+
+from typing import Dict, Union
+
+from abc import ABC, abstractmethod
+import json
+import os
+from pathlib import Path
+from threading import Lock
+
+SQLITE_SUFFIXES = frozenset(('.db', '.sqlite', '.sqlite3'))
+
+
+class AbstractStateStore(ABC):
+    """Interface which every state store implement."""
+
+    @abstractmethod
+    def load(self) -> Dict[str, float]:
+        """Get the last successful fire times of all jobs.
+
+        Return:
+            dict: UNIX timestamps by plain job names.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, job_name: str, fire_time: float):
+        """Save the fire time of the job's successful execution.
+
+        Args:
+            job_name: Plain name of the job.
+            fire_time: Moment the execution was scheduled to as a UNIX timestamp.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self):
+        """Release the store's file."""
+        raise NotImplementedError
+
+
+class SQLiteStateStore(AbstractStateStore):
+    """Keeps fire times in a SQLite database.
+
+    Args:
+        path: Path to the database file. It's created if it doesn't exist.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = Lock()
+        self._connection = None
+        self._pid: Union[int, None] = None
+
+    def __get_connection(self):
+        if self._connection is None or self._pid != os.getpid():
+            # It's imported only when the store is used since it's heavy for the CLI startup
+            import sqlite3  # pylint: disable=import-outside-toplevel
+
+            self._connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS regta_jobs_state (job TEXT PRIMARY KEY, fire_time REAL NOT NULL)'
+            )
+            self._connection.commit()
+            self._pid = os.getpid()
+        return self._connection
+
+    def load(self) -> Dict[str, float]:
+        with self._lock:
+            rows = self.__get_connection().execute('SELECT job, fire_time FROM regta_jobs_state').fetchall()
+        return dict(rows)
+
+    def save(self, job_name: str, fire_time: float):
+        with self._lock:
+            connection = self.__get_connection()
+            connection.execute(
+                'INSERT OR REPLACE INTO regta_jobs_state (job, fire_time) VALUES (?, ?)',
+                (job_name, fire_time),
+            )
+            connection.commit()
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+class FileStateStore(AbstractStateStore):
+    """Keeps fire times in an append-only file of JSON lines. Every
+    :meth:`save` appends a single line, so concurrent processes don't corrupt
+    the file. The file is compacted on :meth:`load`.
+
+    Args:
+        path: Path to the file. It's created if it doesn't exist.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = Lock()
+        self._fd: Union[int, None] = None
+        self._pid: Union[int, None] = None
+
+    def __get_fd(self) -> int:
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(str(self.path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    def load(self) -> Dict[str, float]:
+        states: Dict[str, float] = {}
+        with self._lock:
+            try:
+                with self.path.open(encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            states[entry["job"]] = float(entry["fire_time"])
+                        except (ValueError, KeyError, TypeError):
+                            continue  # e.g. a line which wasn't written completely
+            except FileNotFoundError:
+                return states
+
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with tmp_path.open('w', encoding='utf-8') as f:
+                for job_name, fire_time in states.items():
+                    f.write(json.dumps({"job": job_name, "fire_time": fire_time}) + '\n')
+            tmp_path.replace(self.path)
+            if self._fd is not None and self._pid == os.getpid():
+                os.close(self._fd)
+            self._fd = None
+        return states
+
+    def save(self, job_name: str, fire_time: float):
+        line = json.dumps({"job": job_name, "fire_time": fire_time}) + '\n'
+        with self._lock:
+            os.write(self.__get_fd(), line.encode())
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None and self._pid == os.getpid():
+                os.close(self._fd)
+            self._fd = None
+
+
+def make_state_store(path: Union[str, Path]) -> AbstractStateStore:
+    """Make :class:`SQLiteStateStore` for ``.db``, ``.sqlite`` and
+    ``.sqlite3`` files or :class:`FileStateStore` for any other file.
+    """
+    path = Path(path)
+    if path.suffix in SQLITE_SUFFIXES:
+        return SQLiteStateStore(path)
+    return FileStateStore(path)
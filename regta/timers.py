@@ -0,0 +1,208 @@
+"""Contains timer primitives which let one thread wait for many jobs.
+
+Instead of sleeping in every job, schedulers may keep all deadlines in a
+single :class:`TimerHeap` and wake up only for the earliest one: either in a
+separate thread (:class:`TimerThread`) or in an event loop (:class:`LoopTimer`).
+"""
+
+from typing import Any, Callable, List, Union
+
+import asyncio
+import heapq
+from itertools import count
+import logging
+from logging import Logger, LoggerAdapter
+from threading import Condition, Thread
+import time
+
+
+class TimerEntry:
+    """Single scheduled item of :class:`TimerHeap`."""
+
+    __slots__ = ('deadline', 'seq', 'item', 'cancelled', 'popped')
+
+    def __init__(self, deadline: float, seq: int, item: Any):
+        self.deadline = deadline
+        self.seq = seq
+        self.item = item
+        self.cancelled = False
+        self.popped = False
+
+    def __lt__(self, other: "TimerEntry") -> bool:
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+
+class TimerHeap:
+    """Min-heap of deadlines with lazy cancellation.
+
+    Both :meth:`push` and :meth:`cancel` cost O(log n). Cancelled entries
+    stay in the heap until they reach its top or until they make up half of
+    it, then the heap is compacted.
+    """
+
+    _heap: List[TimerEntry]
+
+    def __init__(self):
+        self._heap = []
+        self._counter = count()
+        self._cancelled = 0
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def push(self, deadline: float, item: Any) -> TimerEntry:
+        entry = TimerEntry(deadline, next(self._counter), item)
+        heapq.heappush(self._heap, entry)
+        return entry
+
+    def cancel(self, entry: TimerEntry):
+        """Cancel the entry. Entries which are already popped are ignored."""
+        if entry.cancelled or entry.popped:
+            return
+        entry.cancelled = True
+        self._cancelled += 1
+        if self._cancelled * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if not entry.cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def __drop_cancelled_top(self):
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    def next_deadline(self) -> Union[float, None]:
+        """Return the earliest deadline or None if the heap is empty."""
+        self.__drop_cancelled_top()
+        return self._heap[0].deadline if self._heap else None
+
+    def pop_due(self, now: float) -> List[Any]:
+        """Pop items of all entries whose deadline is not later than ``now``."""
+        due = []
+        self.__drop_cancelled_top()
+        while self._heap and self._heap[0].deadline <= now:
+            entry = heapq.heappop(self._heap)
+            entry.popped = True
+            due.append(entry.item)
+            self.__drop_cancelled_top()
+        return due
+
+
+class TimerThread(Thread):
+    """Thread which calls callbacks when their deadlines come.
+
+    Callbacks are called in the timer thread one by one, so they must be
+    short, e.g. hand the actual work over to an executor. Exceptions of
+    callbacks are logged and don't stop the timer.
+
+    Args:
+        logger: Logger for exceptions of callbacks.
+    """
+
+    def __init__(self, logger: Union[Logger, LoggerAdapter, None] = None):
+        Thread.__init__(self, name='regta-timer')
+        self.logger = logger or logging.getLogger(__name__)
+        self._heap = TimerHeap()
+        self._condition = Condition()
+        self._stopped = False
+
+    def call_later(self, delay: float, callback: Callable[[], Any]) -> TimerEntry:
+        """Schedule ``callback`` to be called in ``delay`` seconds."""
+        with self._condition:
+            entry = self._heap.push(time.monotonic() + delay, callback)
+            if self._heap.next_deadline() == entry.deadline:
+                self._condition.notify()
+        return entry
+
+    def cancel(self, entry: TimerEntry):
+        """Cancel the callback scheduled by :meth:`call_later`."""
+        with self._condition:
+            self._heap.cancel(entry)
+
+    def __wait_due(self) -> List[Callable[[], Any]]:
+        with self._condition:
+            while not self._stopped:
+                deadline = self._heap.next_deadline()
+                now = time.monotonic()
+                if deadline is None:
+                    self._condition.wait()
+                elif deadline > now:
+                    self._condition.wait(deadline - now)
+                else:
+                    return self._heap.pop_due(now)
+        return []
+
+    def run(self):
+        while not self._stopped:
+            for callback in self.__wait_due():
+                try:
+                    callback()
+                except Exception:  # pylint: disable=broad-except
+                    self.logger.exception("Timer callback %r failed", callback)
+
+    def stop(self):
+        """Stop calling callbacks and wait for the timer thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self.is_alive():
+            self.join()
+
+
+class LoopTimer:
+    """Event loop analog of :class:`TimerThread`.
+
+    Only one handle is registered in the event loop at a time, the one for
+    the earliest deadline, so the loop's own timer heap doesn't grow with the
+    amount of scheduled callbacks. Must be used from the loop's thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self._heap = TimerHeap()
+        self._handle: Union[asyncio.TimerHandle, None] = None
+        self._handle_deadline: Union[float, None] = None
+        self._firing = False
+
+    def call_later(self, delay: float, callback: Callable[[], Any]) -> TimerEntry:
+        """Schedule ``callback`` to be called in ``delay`` seconds."""
+        entry = self._heap.push(self.loop.time() + delay, callback)
+        if not self._firing and (self._handle_deadline is None or entry.deadline < self._handle_deadline):
+            self.__rearm()
+        return entry
+
+    def cancel(self, entry: TimerEntry):
+        """Cancel the callback scheduled by :meth:`call_later`."""
+        self._heap.cancel(entry)
+
+    def __rearm(self):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle_deadline = self._heap.next_deadline()
+        if self._handle_deadline is None:
+            self._handle = None
+        else:
+            self._handle = self.loop.call_at(self._handle_deadline, self.__fire)
+
+    def __fire(self):
+        # The loop may call a handle a bit earlier than its deadline because of the clock resolution
+        now = max(self.loop.time(), self._handle_deadline or 0.0)
+        self._handle, self._handle_deadline = None, None
+        self._firing = True
+        try:
+            for callback in self._heap.pop_due(now):
+                try:
+                    callback()
+                except Exception as e:  # pylint: disable=broad-except
+                    # The rest of the due callbacks are popped already, so they must be called anyway
+                    self.loop.call_exception_handler({'message': 'Timer callback failed', 'exception': e})
+        finally:
+            self._firing = False
+            self.__rearm()
+
+    def stop(self):
+        """Cancel all scheduled callbacks."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle, self._handle_deadline = None, None
+        self._heap = TimerHeap()
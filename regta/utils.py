@@ -10,7 +10,9 @@ import string
 
 import click
 
+from .discovery import JobsIndex
 from .jobs import JobHint, jobs_classes
+from .logging import make_scheduler_logger
 from .schedulers import Scheduler
 
 
@@ -60,12 +62,24 @@ def show_jobs_info(
             logger.info(f"* {_class.get_styled_job_name() if use_ansi else _class.get_plain_job_name()}")
 
 
-def load_jobs(path: Path) -> List[Type[JobHint]]:
-    jobs: List[Type[JobHint]] = []
-    for file in path.glob('**/*.py'):
-        if file.parts[0][0] == '.':  # skip hidden
-            continue
+def load_jobs(path: Path, use_index: bool = True) -> List[Type[JobHint]]:
+    """Import modules from the directory and collect job classes from them.
+
+    Args:
+        path: Path to the directory with jobs.
+        use_index: Import only modules which define jobs according to
+            :class:`regta.discovery.JobsIndex`. Otherwise, every module is
+            imported.
+    """
+    files = [file for file in path.glob('**/*.py') if file.parts[0][0] != '.']  # skip hidden
+    if use_index:
+        index = JobsIndex(path)
+        index.load()
+        files = index.find_modules(files)
+        index.save()
 
+    jobs: List[Type[JobHint]] = []
+    for file in files:
         module_name = ".".join(file.with_suffix("").parts)
         spec = spec_from_file_location(module_name, file)
         if spec is None or spec.loader is None:
@@ -94,7 +108,8 @@ def run_jobs(
         classes: Iterable[Type[JobHint]] = (),
         logger: Union[Logger, None] = None,
         use_ansi: bool = True,
-):
+        **scheduler_options,
+) -> Sequence[JobHint]:
     """Initializes :class:`regta.Scheduler` and starts passed jobs.
 
     Args:
@@ -102,6 +117,10 @@ def run_jobs(
         classes: List of job classes. This func will make instances from them.
         logger: If a logger isn`t passed, regta will use std output.
         use_ansi: Enable / Disable ANSI colors.
+        **scheduler_options: Will be passed into :class:`regta.Scheduler`.
+
+    Returns:
+        Jobs whose executions were cut off by the shutdown timeout.
 
     Raises:
         ValueError: If jobs or classes weren't passed.
@@ -109,10 +128,12 @@ def run_jobs(
     if not jobs and not classes:
         raise ValueError("Jobs or jobs classes missed")
 
-    scheduler = Scheduler()
+    scheduler_options.setdefault('logger', make_scheduler_logger(logger, use_ansi=use_ansi))
+    scheduler = Scheduler(**scheduler_options)
     for job in jobs:
         job.logger = logger
         scheduler.add_job(job)
     for job_class in classes:
         scheduler.add_job(job_class(logger=logger, use_ansi=use_ansi))
     scheduler.run(block=True)
+    return scheduler.cut_off_jobs
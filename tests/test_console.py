@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+
+def test_console_does_not_import_templates():
+    code = "import sys, regta.console; print(any(m in sys.modules for m in ('jinja2', 'regta.templates')))"
+    res = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True, universal_newlines=True)
+
+    assert res.stdout.strip() == 'False'
+
+
+def test_console_does_not_import_socketserver():
+    code = "import sys, regta.console; print('socketserver' in sys.modules)"
+    res = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True, universal_newlines=True)
+
+    assert res.stdout.strip() == 'False'
+
+
+def test_console_does_not_import_optional_features():
+    modules = ('regta.control', 'regta.metrics', 'regta.state')
+    code = f"import sys, regta.console; print([m for m in {modules!r} if m in sys.modules])"
+    res = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True, universal_newlines=True)
+
+    assert res.stdout.strip() == '[]'
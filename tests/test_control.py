@@ -0,0 +1,64 @@
+from datetime import timedelta
+import os
+import stat
+import time
+
+import pytest
+
+from regta import async_job, Scheduler, thread_job
+from regta.control import ControlServer, send_command
+from regta.exceptions import RegtaException
+
+
+@pytest.mark.parametrize('pooled', [False, True])
+def test_control_socket_triggers_and_pauses_jobs(tmp_path, pooled):
+    executions = []
+
+    def sync_func():
+        executions.append('sync')
+
+    async def async_func():
+        executions.append('async')
+
+    path = tmp_path / 'regta.sock'
+    scheduler = Scheduler(use_thread_pool=pooled, use_async_dispatcher=pooled, control_socket=path)
+    scheduler.add_job(thread_job(timedelta(hours=1))(sync_func)(use_ansi=False))
+    scheduler.add_job(async_job(timedelta(hours=1))(async_func)(use_ansi=False))
+    scheduler.run(block=False)
+    try:
+        time.sleep(0.1)
+        mode = stat.S_IMODE(path.stat().st_mode)
+        listed = {state['name']: state for state in send_command(path, 'list')}
+        send_command(path, 'trigger', 'sync_func')
+        send_command(path, 'trigger', 'async_func')
+        paused = send_command(path, 'pause', 'tests.test_control:sync_func')
+        time.sleep(0.1)
+        triggered = {state['name']: state for state in send_command(path, 'list')}
+        with pytest.raises(RegtaException, match="isn't found"):
+            send_command(path, 'trigger', 'missing_func')
+    finally:
+        scheduler.stop()
+
+    assert mode == 0o600
+    assert set(listed) == {'tests.test_control:sync_func', 'tests.test_control:async_func'}
+    assert all(state['next_fire_time'] > time.time() and state['last_duration'] is None for state in listed.values())
+    assert [state['paused'] for state in paused] == [True]
+    assert sorted(executions) == ['async', 'sync']
+    assert all(state['last_duration'] is not None for state in triggered.values())
+    assert not path.exists()
+
+
+def test_control_server_creates_private_socket_without_changing_umask(tmp_path, monkeypatch):
+    umask_calls = []
+    monkeypatch.setattr(os, 'umask', umask_calls.append)
+    path = tmp_path / 'regta.sock'
+
+    server = ControlServer(Scheduler(), path)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    finally:
+        server.stop()
+
+    assert mode == 0o600
+    assert not umask_calls
+    assert not list(tmp_path.iterdir())
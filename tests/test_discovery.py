@@ -0,0 +1,48 @@
+from regta.discovery import JobsIndex, scan_source
+
+
+def test_scan_source_finds_jobs():
+    summary = scan_source(
+        "import regta\n"
+        "class Base(regta.ThreadJob): pass\n"
+        "@regta.async_job(interval)\n"
+        "async def job(): pass\n"
+    )
+
+    assert summary == {"classes": {"Base": ["ThreadJob"]}, "decorated": True}
+
+
+def test_scan_source_finds_aliased_and_called_decorators():
+    aliased = scan_source(
+        "from regta import thread_job as tj, ThreadJob as TJ\n"
+        "class Base(TJ): pass\n"
+        "@tj(seconds=1)\n"
+        "def job(): pass\n"
+    )
+    called = scan_source(
+        "from regta import thread_job\n"
+        "def func(): pass\n"
+        "job = thread_job(seconds=1)(func)\n"
+    )
+    called_by_module = scan_source("import regta as r\njob = r.async_job(seconds=1)(func)\n")
+    unrelated = scan_source("from regta import Scheduler as S\nscheduler = S()\n")
+
+    assert aliased == {"classes": {"Base": ["ThreadJob"]}, "decorated": True}
+    assert called["decorated"] and called_by_module["decorated"]
+    assert not unrelated["decorated"]
+
+
+def test_index_finds_modules_with_jobs(tmp_path):
+    (tmp_path / "bases.py").write_text("from regta import ThreadJob\nclass Base(ThreadJob): pass\n")
+    (tmp_path / "jobs.py").write_text("from .bases import Base\nclass MyJob(Base): pass\n")
+    (tmp_path / "helpers.py").write_text("def helper(): pass\n")
+    files = sorted(tmp_path.glob("*.py"))
+
+    index = JobsIndex(tmp_path)
+    assert index.find_modules(files) == [tmp_path / "bases.py", tmp_path / "jobs.py"]
+    index.save()
+
+    (tmp_path / "helpers.py").write_text("from regta import process_job\n@process_job(interval)\ndef job(): pass\n")
+    index = JobsIndex(tmp_path)
+    index.load()
+    assert len(index.find_modules(files)) == 3
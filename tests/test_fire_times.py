@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+import pytest
+
+from regta import Period
+from regta.fire_times import FireTimeEngine
+
+
+def _get_next_directly(period, moment):
+    if period.is_timezone_in_use:
+        return period.get_next(datetime.fromtimestamp(moment, tz=timezone.utc)).timestamp()
+    dt = datetime.fromtimestamp(moment, tz=timezone.utc).replace(tzinfo=None)
+    return period.get_next(dt).replace(tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.parametrize('period', [
+    Period().every(7).minutes,
+    Period().on.weekdays.at("18:00") | Period().on.weekends.at("21:00"),
+    Period().every(1).days.at("02:30").by("Europe/Berlin"),
+])
+def test_engine_matches_direct_computation(period):
+    engine = FireTimeEngine(window=8)
+    moment = datetime(2023, 3, 20, tzinfo=timezone.utc).timestamp()  # a week before DST change in Europe
+    for _ in range(50):
+        expected = _get_next_directly(period, moment)
+        assert engine.get_next(period, moment) == expected
+        moment = expected + 0.5
+
+
+def test_engine_handles_moments_before_its_window():
+    engine = FireTimeEngine(window=8)
+    period = Period().every(1).minutes
+    moment = datetime(2023, 3, 20, 12, 0, 30, tzinfo=timezone.utc).timestamp()
+
+    engine.get_next(period, moment)
+    # Jobs with a spread ask for moments up to the spread earlier
+    for earlier in (moment - 37, moment - 600, moment + 5):
+        assert engine.get_next(period, earlier) == _get_next_directly(period, earlier)
+
+
+def test_engine_deduplicates_equal_periods():
+    engine = FireTimeEngine()
+    engine.get_next(Period().every(5).minutes, 0.0)
+    engine.get_next(Period().every(5).minutes, 0.0)
+    engine.get_next(Period().on.monday.at("10:00") | Period().on.friday.at("12:00"), 0.0)
+    engine.get_next(Period().on.monday.at("10:00") | Period().on.friday.at("12:00"), 0.0)
+
+    assert len(engine._schedules) == 2  # pylint: disable=protected-access
+
+
+def test_engine_drops_least_recently_used_periods():
+    engine = FireTimeEngine(max_periods=2)
+    for minutes in (1, 2, 1, 3):
+        engine.get_next(Period().every(minutes).minutes, 0.0)
+
+    regular_offsets = [key[0] for key in engine._schedules]  # pylint: disable=protected-access
+    assert regular_offsets == [60.0, 180.0]
+
+
+def test_engine_is_usable_in_process_forked_while_its_lock_is_held():
+    engine = FireTimeEngine()
+    period = Period().every(7).minutes
+
+    def child():
+        engine.get_next(period, 0.0)
+
+    with engine._lock:  # pylint: disable=protected-access
+        process = get_context('fork').Process(target=child)
+        process.start()
+    process.join(5)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+    assert process.exitcode == 0
@@ -0,0 +1,174 @@
+import asyncio
+from datetime import timedelta
+import threading
+import time
+
+import pytest
+
+from regta import async_job, MisfirePolicies, Period, process_job, thread_job
+from regta.exceptions import ExecutionTimeout, JobOptionCollision, TooManyAbandonedExecutions
+from regta.jobs import MAX_ABANDONED_EXECUTIONS
+
+
+@pytest.mark.parametrize('policy, expected', [
+    (MisfirePolicies.SKIP, [1.0, 0.5, 1.5]),
+    (MisfirePolicies.COALESCE, [1.0, 0.0, 0.5]),
+    (MisfirePolicies.ALL, [1.0, 0.0, 0.0]),
+])
+def test_anchored_interval_handles_misfires(monkeypatch, policy, expected):
+    job = thread_job(timedelta(seconds=1), anchored=True, misfire_policy=policy)(lambda: None)()
+    moments = iter([100.0, 103.5, 103.5])
+    monkeypatch.setattr(time, 'monotonic', lambda: next(moments))
+
+    assert [job._get_seconds_till_to_execute() for _ in expected] == expected  # pylint: disable=protected-access
+
+
+def test_anchored_async_job_executes_every_missed_execution():
+    executions = []
+
+    async def func():
+        await asyncio.sleep(0.01)
+        executions.append(time.monotonic())
+
+    job = async_job(timedelta(seconds=0.2), anchored=True, misfire_policy=MisfirePolicies.ALL)(func)(use_ansi=False)
+
+    async def run():
+        task = asyncio.ensure_future(job.run())  # pylint: disable=no-member
+        await asyncio.sleep(0.01)
+        time.sleep(1.05)  # executions due in 0.2, 0.4, ..., 1.0 seconds are missed
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await job.stop()  # pylint: disable=no-member
+
+    asyncio.run(run())
+
+    assert len(executions) == 5
+
+
+def test_anchored_interval_does_not_drift(monkeypatch):
+    job = thread_job(timedelta(milliseconds=100), anchored=True)(lambda: None)()
+    moments = iter([10.0, 10.13, 10.25])
+    monkeypatch.setattr(time, 'monotonic', lambda: next(moments))
+
+    delays = [job._get_seconds_till_to_execute() for _ in range(3)]  # pylint: disable=protected-access
+
+    assert delays == pytest.approx([0.1, 0.07, 0.05])
+
+
+def test_thread_job_timeout_abandons_execution():
+    released = threading.Event()
+
+    def hang():
+        released.wait()
+
+    job = thread_job(timedelta(seconds=1), timeout=0.05)(hang)()
+    messages = []
+    job._on_timeout = messages.append  # pylint: disable=protected-access
+
+    started_at = time.monotonic()
+    job.execute()  # pylint: disable=no-member
+    released.set()
+
+    assert time.monotonic() - started_at < 1
+    assert messages == ["the execution is abandoned"]
+
+
+def test_thread_job_skips_executions_while_too_many_are_abandoned():
+    released = threading.Event()
+    calls = []
+
+    def hang():
+        calls.append(True)
+        released.wait()
+
+    job = thread_job(timedelta(seconds=1), timeout=0.01)(hang)()
+    failures = []
+    job._on_timeout = lambda action: None  # pylint: disable=protected-access
+    job._on_failure = failures.append  # pylint: disable=protected-access
+
+    try:
+        for _ in range(MAX_ABANDONED_EXECUTIONS + 2):
+            job.execute()  # pylint: disable=no-member
+    finally:
+        released.set()
+    time.sleep(0.05)
+    job.execute()  # pylint: disable=no-member
+
+    assert len(calls) == MAX_ABANDONED_EXECUTIONS + 1
+    assert [type(error) for error in failures] == [TooManyAbandonedExecutions] * 2
+
+
+def test_async_job_timeout_cancels_execution():
+    cancelled = []
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    job = async_job(timedelta(seconds=1), timeout=0.05)(hang)()
+    messages = []
+    job._on_timeout = messages.append  # pylint: disable=protected-access
+
+    asyncio.new_event_loop().run_until_complete(job.execute())  # pylint: disable=no-member
+
+    assert cancelled == [True]
+    assert messages == ["the execution is cancelled"]
+
+
+def test_process_job_timeout_is_not_swallowed_by_function():
+    def swallow():
+        try:
+            time.sleep(5)
+        except Exception:  # pylint: disable=broad-except
+            return "the timeout is swallowed"
+        return None
+
+    job = process_job(timedelta(seconds=1), timeout=0.05)(swallow)()
+
+    started_at = time.monotonic()
+    with pytest.raises(ExecutionTimeout):
+        job._call_func_with_timeout()  # pylint: disable=protected-access,no-member
+
+    assert time.monotonic() - started_at < 1
+
+
+def test_spread_shifts_period_deterministically(monkeypatch):
+    monkeypatch.setattr(time, 'time', lambda: 1_000_020.0)  # start of a minute
+
+    def make_job():
+        return thread_job(Period().every(1).minutes, spread=30)(lambda: None)()
+
+    offset = make_job()._get_spread_offset()  # pylint: disable=protected-access
+    delays = [make_job()._get_seconds_till_to_execute() for _ in range(2)]  # pylint: disable=protected-access
+
+    assert 0 < offset < 30
+    assert delays == pytest.approx([offset, offset])
+
+
+def test_too_late_execution_is_shed(monkeypatch):
+    calls = []
+    job = thread_job(timedelta(seconds=1), max_lateness=0.5)(lambda: calls.append(True))()
+    monkeypatch.setattr(time, 'time', lambda: 100.0)
+    job._get_seconds_till_to_execute()  # pylint: disable=protected-access
+
+    monkeypatch.setattr(time, 'time', lambda: 101.6)
+    job.execute()  # pylint: disable=no-member
+    monkeypatch.setattr(time, 'time', lambda: 101.4)
+    job.execute()  # pylint: disable=no-member
+
+    assert calls == [True]
+
+
+def test_decorator_options_do_not_steal_function_arguments():
+    def fetch(url, timeout, retries=3):
+        return url, timeout, retries
+
+    with pytest.raises(JobOptionCollision, match="'timeout' is an option of the job"):
+        thread_job(timedelta(seconds=1), timeout=5)(fetch)
+
+    job_class = thread_job(timedelta(seconds=1), timeout=5, retries=1)(lambda url, retries=3: (url, retries))
+    assert job_class.timeout == 5
+    assert job_class.kwargs == {'retries': 1}
@@ -0,0 +1,62 @@
+import asyncio
+
+from regta.limits import ConcurrencyLimiter
+
+
+def test_waiting_executions_take_released_slots_in_order():
+    limiter = ConcurrencyLimiter(max_concurrency=2, tag_limits={'db': 1}, max_waiting=2)
+    granted = []
+
+    assert limiter.try_acquire(['db'])
+    assert limiter.wait(['db'], lambda waited: granted.append('db'))
+    assert limiter.try_acquire(['s3'])
+    assert limiter.wait(['s3'], lambda waited: granted.append('s3'))
+    assert not limiter.wait([], lambda waited: granted.append('full'))
+
+    limiter.release(['s3'])
+    assert granted == ['s3']  # The first waiter still waits for the "db" slot
+    limiter.release(['db'])
+    assert granted == ['s3', 'db']
+
+
+def test_async_executions_wait_without_blocking_loop():
+    limiter = ConcurrencyLimiter(tag_limits={'db': 1})
+    order = []
+
+    async def execute(name):
+        await limiter.acquire_async(['db'])
+        order.append(name)
+        await asyncio.sleep(0.01)
+        limiter.release(['db'])
+
+    async def main():
+        await asyncio.gather(execute('first'), execute('second'), execute('third'))
+
+    asyncio.new_event_loop().run_until_complete(main())
+
+    assert order == ['first', 'second', 'third']
+
+
+def test_close_skips_waiting_executions():
+    limiter = ConcurrencyLimiter(max_concurrency=1)
+    results = []
+    limiter.try_acquire()
+    limiter.wait([], results.append)
+
+    limiter.close()
+
+    assert results == [None]
+    assert not limiter.wait([], results.append)
+
+
+def test_waiting_executions_are_served_by_priority_and_lateness():
+    limiter = ConcurrencyLimiter(max_concurrency=1)
+    granted = []
+    limiter.try_acquire()
+    for name, priority, fire_time in [('low', 0, 10.0), ('late', 5, 10.0), ('high', 5, 20.0), ('later', 0, 5.0)]:
+        limiter.wait([], lambda waited, name=name: granted.append(name), priority=priority, fire_time=fire_time)
+
+    for _ in range(4):
+        limiter.release()
+
+    assert granted == ['late', 'high', 'later', 'low']
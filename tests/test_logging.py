@@ -0,0 +1,116 @@
+from io import StringIO
+import logging
+from multiprocessing import get_context
+import os
+
+from regta.logging import ClickFormatter, make_default_logger, ProcessLogListener, QueueClickStreamHandler
+
+
+def test_queue_handler_writes_all_records_on_close():
+    handler = QueueClickStreamHandler(use_ansi=False)
+    handler.stream = StringIO()
+    handler.setFormatter(ClickFormatter('%(levelname)s %(message)s', use_ansi=False))
+    logger = logging.Logger('test_queue_handler')
+    logger.addHandler(handler)
+
+    for i in range(3):
+        logger.info('record %s', i)
+    try:
+        raise ValueError('boom')
+    except ValueError as e:
+        logger.exception(e)
+    handler.close()
+
+    lines = handler.stream.getvalue().splitlines()
+    assert lines[:4] == ['INFO record 0', 'INFO record 1', 'INFO record 2', 'ERROR boom']
+    assert lines[-1] == 'ValueError: boom'
+
+
+def test_closed_queue_handler_is_replaced_by_new_one(capsys):
+    handler = QueueClickStreamHandler(use_ansi=False)
+    handler.close()
+
+    logger = make_default_logger(use_ansi=False, fmt='%(message)s', use_queue=True)
+    new_handler = next(handler for handler in logger.handlers if isinstance(handler, QueueClickStreamHandler))
+    logger.info('after close')
+    new_handler.close()
+    logger.removeHandler(new_handler)
+
+    assert new_handler is not handler
+    assert capsys.readouterr().out == 'after close\n'
+
+
+def test_queue_handler_writes_records_of_forked_process_on_exit(tmp_path):
+    path = tmp_path / 'log'
+    handler = QueueClickStreamHandler(use_ansi=False, flush_interval=10)
+    handler.setFormatter(ClickFormatter('%(message)s', use_ansi=False))
+    logger = logging.Logger('test_queue_handler_in_process')
+    logger.addHandler(handler)
+
+    def log():
+        handler.stream = path.open('w')
+        for i in range(100):
+            logger.info('record %s', i)
+
+    process = get_context('fork').Process(target=log)
+    process.start()
+    process.join()
+    handler.close()
+
+    assert path.read_text().splitlines() == [f'record {i}' for i in range(100)]
+
+
+def test_process_log_listener_handles_records_in_parent():
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            records.append((os.getpid(), record.getMessage()))
+
+    logger = logging.Logger('test_process_log_listener')
+    logger.addHandler(ListHandler())
+    adapter = logging.LoggerAdapter(logger, {})
+    listener = ProcessLogListener()
+    listener.register(adapter)
+    listener.start()
+
+    def child():
+        listener.redirect(adapter)
+        adapter.warning('from %s', 'child')
+
+    process = get_context('fork').Process(target=child)
+    process.start()
+    process.join()
+    listener.stop()
+
+    assert records == [(os.getpid(), 'from child')]
+
+
+def test_process_log_listener_survives_broken_records():
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            if record.getMessage() == 'explode':
+                raise RuntimeError('handler is broken')
+            records.append((record.getMessage(), record.exc_info))
+
+    logger = logging.Logger('test_process_log_listener_survives_broken_records')
+    logger.addHandler(ListHandler())
+    adapter = logging.LoggerAdapter(logger, {})
+    listener = ProcessLogListener()
+    listener.register(adapter)
+    listener.start()
+
+    def child():
+        listener.redirect(adapter)
+        adapter.exception('outside of except')
+        adapter.warning('explode')
+        adapter.warning('after')
+
+    process = get_context('fork').Process(target=child)
+    process.start()
+    process.join()
+    listener.stop()
+
+    assert records == [('outside of except', None), ('after', None)]
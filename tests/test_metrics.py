@@ -0,0 +1,61 @@
+from datetime import timedelta
+import time
+from urllib.request import urlopen
+
+from regta import process_job, Scheduler, thread_job
+from regta.metrics import MetricsRegistry
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    metrics = registry.get_job_metrics('jobs:my_job')
+    metrics.execution_finished(metrics.execution_started(lateness=0.5), failed=True)
+    metrics.execution_started(lateness=2.0)
+
+    lines = registry.render().splitlines()
+
+    assert registry.get_job_metrics('jobs:my_job') is metrics
+    assert 'regta_job_executions_total{job="jobs:my_job"} 1' in lines
+    assert 'regta_job_errors_total{job="jobs:my_job"} 1' in lines
+    assert 'regta_job_in_flight{job="jobs:my_job"} 1' in lines
+    assert 'regta_job_duration_seconds_bucket{job="jobs:my_job",le="0.1"} 1' in lines
+    assert 'regta_job_lateness_seconds_bucket{job="jobs:my_job",le="1.0"} 1' in lines
+    assert 'regta_job_lateness_seconds_bucket{job="jobs:my_job",le="+Inf"} 2' in lines
+    assert 'regta_job_lateness_seconds_sum{job="jobs:my_job"} 2.5' in lines
+
+
+def scrape(address):
+    host, port = address
+    with urlopen(f'http://{host}:{port}/metrics') as response:
+        lines = response.read().decode().splitlines()
+    return {line.rpartition(' ')[0]: float(line.rpartition(' ')[2]) for line in lines if not line.startswith('#')}
+
+
+def test_scheduler_counts_executions_of_all_jobs_at_endpoint():
+    def succeed():
+        pass
+
+    def fail():
+        raise ValueError('boom')
+
+    def succeed_in_process():
+        pass
+
+    interval = timedelta(milliseconds=20)
+    scheduler = Scheduler(metrics_port=0)
+    scheduler.add_job(thread_job(interval)(succeed)(use_ansi=False))
+    scheduler.add_job(thread_job(interval)(fail)(use_ansi=False))
+    scheduler.add_job(process_job(interval)(succeed_in_process)(use_ansi=False))
+    scheduler.run(block=False)
+    try:
+        time.sleep(0.3)
+        values = scrape(scheduler._metrics_server.address)  # pylint: disable=protected-access
+    finally:
+        scheduler.stop()
+
+    for job in ('succeed', 'fail', 'succeed_in_process'):
+        label = f'{{job="tests.test_metrics:{job}"}}'
+        assert values[f'regta_job_executions_total{label}'] >= 3
+        assert values[f'regta_job_duration_seconds_count{label}'] == values[f'regta_job_executions_total{label}']
+    assert values['regta_job_errors_total{job="tests.test_metrics:fail"}'] >= 3
+    assert values['regta_job_errors_total{job="tests.test_metrics:succeed"}'] == 0
@@ -0,0 +1,142 @@
+from datetime import timedelta
+import logging
+from multiprocessing import get_context
+import os
+import signal
+import threading
+import time
+
+from regta import process_job
+from regta.exceptions import RemoteTraceback, WorkerProcessDied
+from regta.pools import ProcessPool, terminate_processes
+from regta.schedulers import SyncScheduler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_job(func, handler):
+    logger = logging.Logger(f'test_pools.{func.__name__}')
+    logger.addHandler(handler)
+    return process_job(timedelta(hours=1))(func)(logger=logger, use_ansi=False)
+
+
+def execute(pool, job):
+    done = threading.Event()
+    pool.submit(job, on_done=done.set)
+    assert done.wait(10)
+
+
+def test_pool_logs_results_and_remote_tracebacks_with_job_loggers():
+    def succeed():
+        return f'executed in {os.getpid()}'
+
+    def fail():
+        raise ValueError('boom')
+
+    handler = ListHandler()
+    jobs = [make_job(succeed, handler), make_job(fail, handler)]
+    pool = ProcessPool(jobs, size=1)
+    pool.start()
+    try:
+        for job in jobs:
+            execute(pool, job)
+    finally:
+        pool.stop()
+
+    result, error = handler.records  # pylint: disable=unbalanced-tuple-unpacking
+    assert result.job == 'tests.test_pools:succeed'
+    assert result.getMessage().startswith('executed in ')
+    assert result.getMessage() != f'executed in {os.getpid()}'
+    assert error.job == 'tests.test_pools:fail'
+    assert isinstance(error.exc_info[1], ValueError)
+    assert isinstance(error.exc_info[1].__cause__, RemoteTraceback)
+    assert "raise ValueError('boom')" in str(error.exc_info[1].__cause__)
+
+
+def test_pool_respawns_died_worker(tmp_path):
+    def die_once():
+        marker = tmp_path / 'died'
+        if not marker.exists():
+            marker.touch()
+            os._exit(3)  # pylint: disable=protected-access
+        return os.getppid()
+
+    handler = ListHandler()
+    job = make_job(die_once, handler)
+    pool = ProcessPool([job], size=1)
+    pool.start()
+    try:
+        execute(pool, job)
+        execute(pool, job)
+    finally:
+        pool.stop()
+
+    died, survived = handler.records  # pylint: disable=unbalanced-tuple-unpacking
+    assert isinstance(died.exc_info[1], WorkerProcessDied)
+    assert str(died.exc_info[1]) == "Worker process died with exit code 3"
+    # The respawned worker isn't forked from the scheduler's process, which has threads
+    assert survived.getMessage() != str(os.getpid())
+
+
+def test_scheduler_terminates_pool_workers_on_stop():
+    def hang():
+        time.sleep(10)
+
+    job = make_job(hang, ListHandler())
+    scheduler = SyncScheduler(use_process_pool=True, process_pool_size=1, shutdown_timeout=0.2)
+    scheduler.add_job(job)
+    scheduler.start(daemon=True)
+    scheduler.trigger_job(job)
+    time.sleep(0.2)
+    workers = get_context('fork').active_children()
+    started_at = time.monotonic()
+    scheduler.stop()
+
+    assert time.monotonic() - started_at < 5
+    assert scheduler.cut_off_jobs == [job]
+    assert workers and not any(worker.is_alive() for worker in workers)
+
+
+def test_terminate_processes_kills_processes_ignoring_sigterm():
+    ready = get_context('fork').Event()
+
+    def ignore_sigterm():
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        ready.set()
+        time.sleep(10)
+
+    process = get_context('fork').Process(target=ignore_sigterm)
+    process.start()
+    assert ready.wait(5)
+    terminate_processes([process], timeout=0.2)
+
+    assert process.exitcode == -signal.SIGKILL
+
+
+def test_pool_discards_pending_executions_on_shutdown():
+    def hang():
+        time.sleep(10)
+
+    job = make_job(hang, ListHandler())
+    pool = ProcessPool([job], size=1)
+    pool.start()
+    done = []
+    for _ in range(3):
+        pool.submit(job, on_done=lambda: done.append(True))
+    time.sleep(0.2)
+
+    started_at = time.monotonic()
+    pool.shutdown()
+    cut_off_jobs = pool.join(0.3)
+
+    assert time.monotonic() - started_at < 2
+    assert cut_off_jobs == [job, job, job]
+    assert len(done) == 3
+    assert not get_context('fork').active_children()
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import timedelta
+import time
+
+import pytest
+
+from regta import async_job, RetryPolicy, thread_job
+
+
+def test_retry_policy_delays():
+    policy = RetryPolicy(attempts=5, backoff=1, multiplier=3, max_backoff=5, jitter=0)
+
+    assert [policy.get_delay(attempt) for attempt in range(1, 5)] == [1, 3, 5, 5]
+    assert policy.should_retry(ValueError(), 4)
+    assert not policy.should_retry(ValueError(), 5)
+
+
+def test_sync_job_retries_before_next_execution():
+    policy = RetryPolicy(attempts=2, backoff=0.5, jitter=0, exceptions=KeyError)
+    job = thread_job(timedelta(hours=1), retry=policy)(lambda: {}['key'])()
+
+    delays = []
+    for _ in range(3):
+        job.execute()  # pylint: disable=no-member
+        delays.append(job._get_seconds_till_to_execute())  # pylint: disable=protected-access
+
+    assert delays == pytest.approx([0.5, 3600, 0.5], abs=0.01)
+
+
+def test_sync_retries_do_not_take_places_of_regular_executions(monkeypatch):
+    policy = RetryPolicy(attempts=2, backoff=2.5, jitter=0)
+    job = thread_job(timedelta(seconds=1), retry=policy)(lambda: 1 / 0)(use_ansi=False)
+    now = [0.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+
+    delays = []
+    for _ in range(4):
+        job.execute()  # pylint: disable=no-member
+        delays.append(job._get_seconds_till_to_execute())  # pylint: disable=protected-access
+        now[0] += delays[-1]
+
+    # Regular executions in 1 and 2 seconds aren't replaced by the retry planned in 2.5 seconds
+    assert delays == [1.0, 1.0, 0.5, 0.5]
+
+
+def _run_failing_async_job(overlapping: bool = False, paused: bool = False) -> int:
+    calls = []
+
+    async def func():
+        calls.append(time.time())
+        if len(calls) == 1:
+            raise KeyError
+        await asyncio.sleep(0.3)
+
+    policy = RetryPolicy(attempts=2, backoff=0.05, jitter=0)
+    job = async_job(timedelta(hours=1), retry=policy)(func)(use_ansi=False)
+
+    async def run():
+        job._dispatch()  # pylint: disable=protected-access,no-member
+        await asyncio.sleep(0.01)
+        if overlapping:
+            job._dispatch()  # pylint: disable=protected-access,no-member
+        if paused:
+            job.pause()  # pylint: disable=no-member
+        await asyncio.sleep(0.15)
+        await job.stop()  # pylint: disable=no-member
+
+    asyncio.run(run())
+    return len(calls)
+
+
+def test_async_retries_respect_pausing_and_overlap_policy():
+    assert _run_failing_async_job() == 2
+    assert _run_failing_async_job(paused=True) == 1
+    # The retry is due while the second execution is still running, so it's skipped
+    assert _run_failing_async_job(overlapping=True) == 2
+
+
+def test_not_listed_exceptions_are_not_retried():
+    policy = RetryPolicy(exceptions=KeyError)
+    job = thread_job(timedelta(hours=1), retry=policy)(lambda: 1 / 0)()
+
+    job.execute()  # pylint: disable=no-member
+
+    assert job._get_seconds_till_to_execute() == 3600  # pylint: disable=protected-access
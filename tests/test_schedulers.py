@@ -0,0 +1,353 @@
+import asyncio
+from collections import Counter
+from datetime import timedelta
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from urllib.request import urlopen
+
+import pytest
+
+from regta import async_job, OverlapPolicies, process_job, thread_job
+from regta.limits import ConcurrencyLimiter
+from regta.schedulers import AsyncScheduler, AsyncWorkersScheduler, EmbeddedAsyncScheduler, make_loop_factory
+from regta.schedulers import Scheduler, SyncScheduler
+
+
+@pytest.mark.parametrize('use_dispatcher', [False, True])
+def test_embedded_async_scheduler_uses_running_loop(use_dispatcher):
+    executions = []
+
+    @async_job(timedelta(milliseconds=20))
+    async def job():
+        executions.append((asyncio.get_event_loop(), threading.current_thread()))
+
+    async def main():
+        scheduler = EmbeddedAsyncScheduler(use_dispatcher=use_dispatcher)
+        scheduler.add_job(job())
+        await scheduler.start()
+        await asyncio.sleep(0.11)
+        await scheduler.stop()
+        amount = len(executions)
+        await asyncio.sleep(0.05)
+
+        assert len(executions) == amount >= 3
+        assert set(executions) == {(asyncio.get_event_loop(), threading.current_thread())}
+
+    threads = threading.active_count()
+    asyncio.new_event_loop().run_until_complete(main())
+    assert threading.active_count() == threads
+
+
+@pytest.mark.parametrize('threaded, use_dispatcher', [(True, False), (False, True)])
+@pytest.mark.parametrize('options, expected', [
+    ({}, 1),
+    ({'max_instances': 2}, 2),
+    ({'overlap_policy': OverlapPolicies.QUEUE}, 2),
+    ({'overlap_policy': OverlapPolicies.QUEUE, 'max_queued': 3}, 4),
+    ({'overlap_policy': OverlapPolicies.QUEUE, 'max_instances': 2, 'max_queued': 2}, 4),
+])
+def test_overlapping_executions_follow_overlap_policy(threaded, use_dispatcher, options, expected):
+    started = []
+    released = threading.Event()
+
+    async def func():
+        started.append(time.monotonic())
+        while not released.is_set():
+            await asyncio.sleep(0.005)
+
+    job = async_job(timedelta(milliseconds=10), **options)(func)(use_ansi=False)
+
+    def hold_and_release():
+        # About 15 executions are due while the running ones are held
+        time.sleep(0.15)
+        job.pause()  # pylint: disable=no-member
+        released.set()
+        time.sleep(0.05)
+
+    if threaded:
+        scheduler = AsyncScheduler(use_dispatcher=use_dispatcher)
+        scheduler.add_job(job)
+        scheduler.start()
+        hold_and_release()
+        scheduler.stop()
+        scheduler.join()
+    else:
+        async def main():
+            embedded_scheduler = EmbeddedAsyncScheduler(use_dispatcher=use_dispatcher)
+            embedded_scheduler.add_job(job)
+            await embedded_scheduler.start()
+            await asyncio.get_event_loop().run_in_executor(None, hold_and_release)
+            await embedded_scheduler.stop()
+
+        asyncio.run(main())
+
+    # Executions queued while the running ones were held are started after them
+    assert len(started) == expected
+
+
+def test_uvloop_falls_back_to_asyncio_loop(monkeypatch, caplog):
+    monkeypatch.setitem(sys.modules, 'uvloop', None)
+    logger = logging.getLogger('test_uvloop_fallback')
+
+    assert make_loop_factory('uvloop', logger) is asyncio.new_event_loop
+    assert caplog.record_tuples == [
+        ('test_uvloop_fallback', logging.WARNING, "uvloop isn't installed, the asyncio event loop is used"),
+    ]
+
+
+def test_async_workers_run_jobs_in_assigned_processes(tmp_path):
+    def make_job(name):
+        async def func():
+            with (tmp_path / name).open('a', encoding='utf-8') as f:
+                f.write(f'{os.getpid()}\n')
+
+        func.__name__ = func.__qualname__ = name
+        return async_job(timedelta(milliseconds=50))(func)(use_ansi=False)
+
+    scheduler = AsyncWorkersScheduler(workers=3, aggregate_logs=False)
+    jobs = [make_job(f'job_{number}') for number in range(6)]
+    for job in jobs:
+        scheduler.add_job(job)
+    scheduler.run(block=False)
+    time.sleep(0.5)
+    scheduler.stop()
+
+    pids_by_worker = {}
+    for job in jobs:
+        pids = set((tmp_path / job.func.__name__).read_text(encoding='utf-8').split())
+        assert len(pids) == 1
+        pids_by_worker.setdefault(scheduler.get_worker_number(job), set()).update(pids)
+    assert all(len(pids) == 1 for pids in pids_by_worker.values())
+    assert len(set.union(*pids_by_worker.values())) == len(pids_by_worker)
+    assert str(os.getpid()) not in set.union(*pids_by_worker.values())
+    assert not multiprocessing.active_children()
+
+
+@pytest.mark.parametrize('pooled', [False, True])
+def test_jobs_are_changed_while_scheduler_is_running(pooled):
+    executions: Counter = Counter()
+
+    def make_jobs(name):
+        async def async_func():
+            executions[f'async_{name}'] += 1
+
+        def thread_func():
+            executions[f'thread_{name}'] += 1
+
+        interval = timedelta(milliseconds=50)
+        return async_job(interval)(async_func)(use_ansi=False), thread_job(interval)(thread_func)(use_ansi=False)
+
+    scheduler = Scheduler(use_thread_pool=pooled, use_async_dispatcher=pooled)
+    paused_jobs, removed_jobs, added_jobs = make_jobs('paused'), make_jobs('removed'), make_jobs('added')
+    for job in (*paused_jobs, *removed_jobs):
+        scheduler.add_job(job)
+    scheduler.run(block=False)
+    time.sleep(0.12)
+
+    for job in paused_jobs:
+        scheduler.pause_job(job)
+    for job in removed_jobs:
+        scheduler.remove_job(job)
+    for job in added_jobs:
+        scheduler.add_job(job)
+    time.sleep(0.05)
+    before = executions.copy()
+    time.sleep(0.2)
+    changed = executions - before
+    for job in paused_jobs:
+        scheduler.resume_job(job)
+    time.sleep(0.12)
+    scheduler.stop()
+
+    assert set(changed) == {'async_added', 'thread_added'}
+    assert executions['async_paused'] > before['async_paused']
+    assert executions['thread_paused'] > before['thread_paused']
+
+
+def test_sync_scheduler_runs_jobs_in_pools(tmp_path):
+    thread_names = []
+    pids_path = tmp_path / 'pids'
+
+    def thread_func():
+        thread_names.append(threading.current_thread().name)
+
+    def process_func():
+        with pids_path.open('a') as file:
+            file.write(f'{os.getpid()}\n')
+
+    interval = timedelta(milliseconds=30)
+    pooled_thread_job = thread_job(interval)(thread_func)(use_ansi=False)
+    pooled_process_job = process_job(interval)(process_func)(use_ansi=False)
+    scheduler = SyncScheduler(use_thread_pool=True, thread_pool_size=2, use_process_pool=True, process_pool_size=1)
+    scheduler.add_job(pooled_thread_job)
+    scheduler.add_job(pooled_process_job)
+    scheduler.start(daemon=True)
+    try:
+        time.sleep(0.2)
+        scheduler.remove_job(pooled_thread_job)
+        time.sleep(0.05)
+        executions_after_removal = len(thread_names)
+        time.sleep(0.1)
+    finally:
+        scheduler.stop()
+    pids = pids_path.read_text().split()
+
+    assert len(thread_names) == executions_after_removal >= 3
+    assert all(name.startswith('regta-worker') for name in thread_names)
+    assert len(pids) >= 3 and len(set(pids)) == 1 and str(os.getpid()) not in pids
+    assert not scheduler.cut_off_jobs
+
+
+def test_triggered_pooled_executions_take_concurrency_slots():
+    running = []
+    executions = []
+    released = threading.Event()
+
+    def func():
+        running.append(True)
+        executions.append(len(running))
+        released.wait(5)
+        running.pop()
+
+    job = thread_job(timedelta(hours=1))(func)(use_ansi=False)
+    scheduler = SyncScheduler(use_thread_pool=True, thread_pool_size=2, limiter=ConcurrencyLimiter(max_concurrency=1))
+    scheduler.add_job(job)
+    scheduler.start(daemon=True)
+    next_fire_time = job.next_fire_time  # pylint: disable=no-member
+    try:
+        scheduler.trigger_job(job)
+        scheduler.trigger_job(job)
+        time.sleep(0.1)
+        running_while_blocked = len(running)
+        released.set()
+        time.sleep(0.1)
+    finally:
+        released.set()
+        scheduler.stop()
+
+    assert running_while_blocked == 1
+    assert executions == [1, 1]
+    assert job.next_fire_time == next_fire_time  # pylint: disable=no-member
+
+
+def test_executions_overrunning_shutdown_timeout_are_cut_off():
+    released = threading.Event()
+    interval = timedelta(milliseconds=10)
+    hanging_thread_job = thread_job(interval)(lambda: released.wait(10))(use_ansi=False)
+    hanging_process_job = process_job(interval)(lambda: time.sleep(10))(use_ansi=False)
+
+    scheduler = SyncScheduler(shutdown_timeout=0.3, aggregate_process_logs=False)
+    scheduler.add_job(hanging_thread_job)
+    scheduler.add_job(hanging_process_job)
+    scheduler.start(daemon=True)
+    time.sleep(0.1)
+    started_at = time.monotonic()
+    try:
+        scheduler.stop()
+        stopped_in = time.monotonic() - started_at
+    finally:
+        released.set()
+
+    assert 0.3 <= stopped_in < 1
+    assert set(scheduler.cut_off_jobs) == {hanging_thread_job, hanging_process_job}
+    assert not hanging_process_job.is_alive()  # pylint: disable=no-member
+
+
+@pytest.mark.parametrize('sig', [signal.SIGTERM, signal.SIGINT])
+def test_stop_signal_releases_blocked_thread_and_stops_schedulers(sig):
+    executions: Counter = Counter()
+
+    async def async_func():
+        executions['async'] += 1
+
+    def thread_func():
+        executions['thread'] += 1
+
+    interval = timedelta(milliseconds=20)
+    jobs = [async_job(interval)(async_func)(use_ansi=False), thread_job(interval)(thread_func)(use_ansi=False)]
+    scheduler = Scheduler()
+    for job in jobs:
+        scheduler.add_job(job)
+    original_handler = signal.getsignal(sig)
+    threading.Timer(0.2, os.kill, args=(os.getpid(), sig)).start()
+
+    started_at = time.monotonic()
+    scheduler.run()
+    amount = sum(executions.values())
+    time.sleep(0.1)
+
+    assert time.monotonic() - started_at < 1
+    assert executions['async'] and executions['thread']
+    assert sum(executions.values()) == amount
+    assert signal.getsignal(sig) is original_handler
+    assert not jobs[1].is_alive()  # pylint: disable=no-member
+
+
+def test_scheduler_blocks_and_stops_again_after_stop_signal():
+    executions = []
+    job = thread_job(timedelta(milliseconds=20))(lambda: executions.append(True))(use_ansi=False)
+    # Jobs' own threads can't be started twice, so thread jobs are executed by the pool
+    scheduler = SyncScheduler(use_thread_pool=True)
+    scheduler.add_job(job)
+
+    for _ in range(2):
+        threading.Timer(0.2, os.kill, args=(os.getpid(), signal.SIGTERM)).start()
+        started_at = time.monotonic()
+        scheduler.run()
+        blocked_for = time.monotonic() - started_at
+        assert 0.2 <= blocked_for < 1
+    assert executions
+
+
+def test_interrupt_while_signal_handlers_are_installed_stops_scheduler(monkeypatch):
+    install_signal_handler = signal.signal
+    original_handlers = signal.getsignal(signal.SIGTERM), signal.getsignal(signal.SIGINT)
+    calls = []
+
+    def interrupt_first_installation(sig, handler):
+        calls.append(sig)
+        if len(calls) == 1:
+            raise KeyboardInterrupt
+        return install_signal_handler(sig, handler)
+
+    scheduler = Scheduler()
+    scheduler.add_job(thread_job(timedelta(hours=1))(lambda: None)(use_ansi=False))
+    monkeypatch.setattr(signal, 'signal', interrupt_first_installation)
+    scheduler.run()
+    monkeypatch.undo()
+
+    assert (signal.getsignal(signal.SIGTERM), signal.getsignal(signal.SIGINT)) == original_handlers
+    assert not scheduler.get_jobs()[0].is_alive()  # pylint: disable=no-member
+
+
+def test_scheduler_serves_metrics_after_forking_async_workers(monkeypatch):
+    thread_names = []
+    run_workers = AsyncWorkersScheduler.run
+
+    def record_threads_and_run(self, block=True):
+        thread_names.extend(thread.name for thread in threading.enumerate())
+        run_workers(self, block)
+
+    monkeypatch.setattr(AsyncWorkersScheduler, 'run', record_threads_and_run)
+
+    async def job():
+        pass
+
+    scheduler = Scheduler(async_workers=2, metrics_port=0)
+    scheduler.add_job(async_job(timedelta(hours=1))(job)(use_ansi=False))
+    scheduler.run(block=False)
+    try:
+        host, port = scheduler._metrics_server.address  # pylint: disable=protected-access
+        with urlopen(f'http://{host}:{port}/metrics') as response:
+            lines = response.read().decode().splitlines()
+    finally:
+        scheduler.stop()
+
+    assert thread_names and 'regta-metrics' not in thread_names
+    assert 'regta_job_executions_total{job="tests.test_schedulers:job"} 0' in lines
+    assert scheduler._metrics_server is None  # pylint: disable=protected-access
@@ -0,0 +1,107 @@
+import asyncio
+from datetime import timedelta
+import time
+
+import pytest
+
+from regta import async_job, fire_times, MisfirePolicies, Period, thread_job
+from regta.state import AbstractStateStore, FileStateStore, SQLiteStateStore
+
+
+@pytest.mark.parametrize('store_class, file_name', [
+    (SQLiteStateStore, 'state.db'),
+    (FileStateStore, 'state.jsonl'),
+])
+def test_store_keeps_last_fire_times(tmp_path, store_class, file_name):
+    store = store_class(tmp_path / file_name)
+    store.save('jobs:a', 1.0)
+    store.save('jobs:b', 2.0)
+    store.save('jobs:a', 3.0)
+    store.close()
+
+    assert store_class(tmp_path / file_name).load() == {'jobs:a': 3.0, 'jobs:b': 2.0}
+
+
+@pytest.mark.parametrize('policy, grace_time, expected', [
+    (MisfirePolicies.COALESCE, None, [0.0, 10.0]),
+    (MisfirePolicies.ALL, None, [0.0, 0.0, 0.0, 10.0]),
+    (MisfirePolicies.ALL, 20, [0.0, 0.0, 10.0]),
+    (MisfirePolicies.SKIP, None, [5.0, 10.0]),
+])
+def test_restored_job_catches_up_missed_executions(monkeypatch, policy, grace_time, expected):
+    job = thread_job(timedelta(seconds=10), misfire_policy=policy, misfire_grace_time=grace_time)(lambda: None)()
+    monkeypatch.setattr(time, 'time', lambda: 1035.0)
+
+    job._restore_state(1000.0)  # pylint: disable=protected-access
+
+    assert [job._get_seconds_till_to_execute() for _ in expected] == expected  # pylint: disable=protected-access
+
+
+def test_restored_job_continues_interval(monkeypatch):
+    job = thread_job(timedelta(seconds=10))(lambda: None)()
+    monkeypatch.setattr(time, 'time', lambda: 1004.0)
+
+    job._restore_state(1000.0)  # pylint: disable=protected-access
+
+    assert job._get_seconds_till_to_execute() == 6.0  # pylint: disable=protected-access
+
+
+def test_async_job_executes_every_missed_execution():
+    executions = []
+
+    async def func():
+        await asyncio.sleep(0.01)
+        executions.append(time.time())
+
+    job = async_job(timedelta(hours=1), misfire_policy=MisfirePolicies.ALL)(func)(use_ansi=False)
+    job._restore_state(time.time() - 5.5 * 3600)  # pylint: disable=protected-access,no-member
+
+    async def run():
+        task = asyncio.ensure_future(job.run())  # pylint: disable=no-member
+        await asyncio.sleep(0.3)
+        task.cancel()
+        await job.stop()  # pylint: disable=no-member
+
+    asyncio.run(run())
+
+    assert len(executions) == 5
+
+
+@pytest.mark.parametrize('missed', [20, 120])
+def test_restored_period_job_counts_missed_executions_across_cache_windows(monkeypatch, missed):
+    now = 1_000_000_050.0  # 30 seconds after the start of a minute
+    monkeypatch.setattr(time, 'time', lambda: now)
+    # Another job with the same period has already moved the shared window to the current moment
+    fire_times.engine.get_next(Period().every(1).minutes, now)
+    job = thread_job(Period().every(1).minutes, misfire_policy=MisfirePolicies.ALL)(lambda: None)(use_ansi=False)
+
+    job._restore_state(now - 30 - missed * 60)  # pylint: disable=protected-access,no-member
+
+    assert job._missed_runs == missed  # pylint: disable=protected-access,no-member
+
+
+def test_failed_state_store_does_not_stop_job():
+    class BrokenStore(AbstractStateStore):
+        def load(self):
+            return {}
+
+        def save(self, job_name, fire_time):
+            raise OSError('disk full')
+
+        def close(self):
+            pass
+
+    executions = []
+    errors = []
+    job = thread_job(timedelta(milliseconds=20))(lambda: executions.append(time.time()))(use_ansi=False)
+    job._state_store = BrokenStore()  # pylint: disable=protected-access
+    job.logger.error = lambda message, *args: errors.append(message % args)  # pylint: disable=no-member
+
+    job.start()  # pylint: disable=no-member
+    time.sleep(0.2)
+    alive = job.is_alive()  # pylint: disable=no-member
+    job.stop()  # pylint: disable=no-member
+
+    assert alive
+    assert len(executions) >= 3
+    assert errors[0] == "Can't save the last fire time: OSError('disk full')"
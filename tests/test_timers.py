@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import threading
+
+from regta.timers import LoopTimer, TimerHeap, TimerThread
+
+
+def test_timer_heap_pops_due_items_in_order():
+    heap = TimerHeap()
+    heap.push(3.0, 'c')
+    heap.push(1.0, 'a')
+    heap.push(2.0, 'b')
+
+    assert heap.next_deadline() == 1.0
+    assert heap.pop_due(2.0) == ['a', 'b']
+    assert len(heap) == 1
+
+
+def test_timer_heap_skips_cancelled_entries():
+    heap = TimerHeap()
+    first = heap.push(1.0, 'a')
+    heap.push(2.0, 'b')
+    heap.cancel(first)
+
+    assert len(heap) == 1
+    assert heap.next_deadline() == 2.0
+    assert heap.pop_due(10.0) == ['b']
+
+
+def test_timer_heap_ignores_cancelling_popped_entries():
+    heap = TimerHeap()
+    first = heap.push(1.0, 'a')
+    for deadline, item in ((2.0, 'b'), (3.0, 'c'), (4.0, 'd')):
+        heap.push(deadline, item)
+    heap.pop_due(1.0)
+    heap.cancel(first)
+
+    assert len(heap) == 3
+    assert heap.pop_due(10.0) == ['b', 'c', 'd']
+    assert len(heap) == 0
+
+
+def test_timer_thread_calls_callbacks_in_order_and_survives_their_errors(caplog):
+    calls = []
+    done = threading.Event()
+
+    def fail():
+        raise ValueError('boom')
+
+    timer = TimerThread(logger=logging.getLogger('test_timer_thread'))
+    timer.start()
+    try:
+        timer.call_later(0.06, lambda: calls.append('c') or done.set())
+        timer.call_later(0.02, lambda: calls.append('a'))
+        timer.call_later(0.03, fail)
+        cancelled = timer.call_later(0.01, lambda: calls.append('cancelled'))
+        timer.call_later(0.04, lambda: calls.append('b'))
+        timer.cancel(cancelled)
+        assert done.wait(5)
+    finally:
+        timer.stop()
+
+    assert calls == ['a', 'b', 'c']
+    assert not timer.is_alive()
+    assert [record.exc_info[0] for record in caplog.records] == [ValueError]
+
+
+def test_loop_timer_calls_rest_of_due_callbacks_after_error():
+    calls = []
+    errors = []
+
+    async def main():
+        loop = asyncio.get_event_loop()
+        loop.set_exception_handler(lambda loop, context: errors.append(context['exception']))
+        timer = LoopTimer(loop)
+        timer.call_later(0.01, lambda: 1 / 0)
+        timer.call_later(0.01, lambda: calls.append('called'))
+        await asyncio.sleep(0.05)
+        timer.stop()
+
+    asyncio.new_event_loop().run_until_complete(main())
+
+    assert calls == ['called']
+    assert [type(error) for error in errors] == [ZeroDivisionError]